@@ -11,6 +11,14 @@ This package contains the modular components of the markdown parser:
 - ir: Document intermediate representation
 - exceptions: Error hierarchy
 - config: Security profiles and patterns
+- engines: Process-wide cache of configured MarkdownIt engines
+- url_cache: Process-wide LRU cache of URL security verdicts
+- structure: Lazy, on-demand structure view (parser.structure)
+- batch: Parallel batch parsing (parse_many)
+- parse_cache: Persistent content-hash keyed parse result cache (SQLite, LRU)
+- streaming: Window-by-window section streaming for very large documents (iter_sections)
+- aio: Asyncio facade over a bounded process pool (aparse, ParseService)
+- isolation: Pre-forked worker pool with deadlines and memory caps (parse_isolated)
 - normalize: Text normalization
 - serialize: Output serialization
 
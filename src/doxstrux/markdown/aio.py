@@ -0,0 +1,297 @@
+"""Asyncio facade for parsing on a managed process pool.
+
+Parsing is CPU-bound, so running it on the event loop (or a thread) stalls
+every other coroutine. ``ParseService`` runs ``parse()`` / ``to_ir()`` in a
+``ProcessPoolExecutor`` and awaits the result:
+
+- At most ``max_pending`` requests are queued or running. Further callers
+  wait for a slot (backpressure), or get ``ParseQueueFull`` with
+  ``wait=False``.
+- ``timeout`` bounds how long a caller waits. A request that has not
+  started is dropped; one already running finishes in its worker and keeps
+  its slot until then, so the queue depth stays honest.
+- Cancelling the awaiting task cancels the request the same way.
+- If a worker dies, the pool is replaced and the affected requests raise
+  ``BrokenProcessPool``.
+
+Size and security failures raise the same ``MarkdownSecurityError``
+subclasses as a local parse.
+
+Functions:
+    aparse: Parse with the default service of the running event loop
+    default_service: The running loop's default ParseService
+
+Classes:
+    ParseService: Process pool with bounded queue depth and per-request timeouts
+    ParseQueueFull: Raised when the queue is full and the caller does not wait
+"""
+
+import asyncio
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Literal
+
+from doxstrux.markdown import engines
+from doxstrux.markdown.ir import DocumentIR
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DEFAULT_QUEUE_FACTOR = 4
+
+Output = Literal["dict", "ir"]
+
+
+class ParseQueueFull(RuntimeError):
+    """Raised by ParseService.parse(wait=False) when max_pending requests are in flight."""
+
+
+def _parse_in_worker(
+    content: str,
+    profile: str | None,
+    config: dict[str, Any] | None,
+    include: frozenset[str] | None,
+    output: Output,
+    source_id: str,
+) -> dict[str, Any] | DocumentIR:
+    """Worker entry point: parse one document."""
+    parser = MarkdownParserCore(content, config=config, security_profile=profile)
+    if output == "ir":
+        return parser.to_ir(source_id=source_id)
+    return parser.parse(include=include)
+
+
+def _worker_init(profiles: tuple[str, ...]) -> None:
+    """Pool initializer: pre-build the engines for the service profiles."""
+    engines.warm_engines(profiles)
+
+
+class ParseService:
+    """Parse documents on a process pool from asyncio code.
+
+    Create one per process (e.g. at application startup) and close it at
+    shutdown, or use it as an async context manager. The pool starts on
+    first use. A service belongs to the event loop it is first used on.
+
+    Example:
+        >>> async with ParseService(workers=4, profile="strict") as service:
+        ...     result = await service.parse(content, timeout=5.0)
+        ...     ir = await service.parse(content, output="ir", source_id="doc.md")
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        profile: str | None = None,
+        *,
+        config: dict[str, Any] | None = None,
+        max_pending: int | None = None,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            workers: Worker processes (default: os.cpu_count())
+            profile: Default security profile (default: moderate)
+            config: Default parser config
+            max_pending: Requests queued or running at once (default:
+                DEFAULT_QUEUE_FACTOR * workers)
+            mp_context: Optional multiprocessing context for the pool
+
+        Raises:
+            ValueError: If workers or max_pending is < 1
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or DEFAULT_QUEUE_FACTOR * self.workers
+        if self.workers < 1 or self.max_pending < 1:
+            raise ValueError(
+                f"workers and max_pending must be >= 1, got {self.workers} and {self.max_pending}"
+            )
+        self.profile = profile
+        self.config = config
+        self._mp_context = mp_context
+        self._pool: ProcessPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._in_flight = 0
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Requests currently queued or running."""
+        return self._in_flight
+
+    async def __aenter__(self) -> "ParseService":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def parse(
+        self,
+        content: str,
+        profile: str | None = None,
+        *,
+        config: dict[str, Any] | None = None,
+        include: set[str] | frozenset[str] | None = None,
+        output: Output = "dict",
+        source_id: str = "",
+        timeout: float | None = None,
+        wait: bool = True,
+    ) -> dict[str, Any] | DocumentIR:
+        """Parse content in a worker process.
+
+        Args:
+            content: Markdown content
+            profile: Security profile (default: the service profile)
+            config: Parser config (default: the service config)
+            include: Optional parse(include=...) subset (output="dict" only)
+            output: "dict" for the parse() result, "ir" for to_ir()
+            source_id: Source identifier for output="ir"
+            timeout: Seconds to wait for the result, including queueing
+            wait: Wait for a free slot when max_pending requests are in
+                flight (False: raise ParseQueueFull)
+
+        Returns:
+            parse() result dict, or DocumentIR for output="ir"
+
+        Raises:
+            TimeoutError: If the result is not ready within timeout
+            ParseQueueFull: If wait=False and the queue is full
+            MarkdownSecurityError: If the content fails validation (incl.
+                MarkdownSizeError)
+            BrokenProcessPool: If the worker died; the pool is replaced
+            ValueError: If output is not "dict" or "ir"
+            RuntimeError: If the service is closed
+        """
+        if output not in ("dict", "ir"):
+            raise ValueError(f"output must be 'dict' or 'ir', got {output!r}")
+        loop = self._bind_loop()
+        args = (
+            content,
+            profile if profile is not None else self.profile,
+            config if config is not None else self.config,
+            frozenset(include) if include is not None else None,
+            output,
+            source_id,
+        )
+        async with asyncio.timeout(timeout):
+            if not wait and self._slots.locked():
+                raise ParseQueueFull(f"{self.max_pending} parse requests already pending")
+            await self._slots.acquire()
+            try:
+                future = self._submit(args)
+                pool = self._pool
+            except BaseException:
+                self._slots.release()
+                raise
+            self._in_flight += 1
+            # The slot is freed when the worker is done, not when the caller stops waiting
+            future.add_done_callback(lambda _: self._release_from_any_thread(loop))
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                if self._pool is pool:  # Not yet replaced by another request
+                    self._drop_pool()
+                raise
+
+    async def close(self) -> None:
+        """Shut the pool down, cancelling queued requests.
+
+        Running requests finish first; close() returns once they have.
+        """
+        self._closed = True
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: pool.shutdown(wait=True, cancel_futures=True)
+            )
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, creating the slot semaphore on first use."""
+        if self._closed:
+            raise RuntimeError("ParseService is closed")
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        elif self._loop is not loop:
+            raise RuntimeError("ParseService is bound to a different event loop")
+        return loop
+
+    def _submit(self, args: tuple) -> Future:
+        """Submit a parse to the pool, starting it if needed."""
+        if self._pool is None:
+            profiles = {args[1] or "moderate", self.profile or "moderate"}
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._mp_context,
+                initializer=_worker_init,
+                initargs=(tuple(sorted(profiles)),),
+            )
+        try:
+            return self._pool.submit(_parse_in_worker, *args)
+        except BrokenProcessPool:
+            self._drop_pool()
+            return self._submit(args)
+
+    def _drop_pool(self) -> None:
+        """Shut the pool down without waiting; the next request starts a new one."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        """Free the slot of a finished request (on the loop thread)."""
+        self._in_flight -= 1
+        self._slots.release()
+
+    def _release_from_any_thread(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Free a slot; pool futures complete on the executor's manager thread."""
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release)
+
+
+_default_services: dict[asyncio.AbstractEventLoop, ParseService] = {}
+
+
+def default_service() -> ParseService:
+    """Return the default ParseService of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    service = _default_services.get(loop)
+    if service is None:
+        # Services of closed loops (e.g. earlier asyncio.run() calls) are dropped
+        for closed in [other for other in _default_services if other.is_closed()]:
+            _default_services.pop(closed)._drop_pool()
+        service = _default_services[loop] = ParseService()
+    return service
+
+
+async def aparse(
+    content: str,
+    profile: str | None = None,
+    *,
+    config: dict[str, Any] | None = None,
+    include: set[str] | frozenset[str] | None = None,
+    output: Output = "dict",
+    source_id: str = "",
+    timeout: float | None = None,
+    service: ParseService | None = None,
+) -> dict[str, Any] | DocumentIR:
+    """Parse content without blocking the event loop.
+
+    Uses ``service`` or the default service of the running loop (one
+    worker per CPU). See ParseService.parse() for arguments and errors.
+
+    Example:
+        >>> result = await aparse(content, profile="strict", timeout=10)
+        >>> ir = await aparse(content, output="ir", source_id="doc.md")
+    """
+    service = service or default_service()
+    return await service.parse(
+        content,
+        profile,
+        config=config,
+        include=include,
+        output=output,
+        source_id=source_id,
+        timeout=timeout,
+    )
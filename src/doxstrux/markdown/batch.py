@@ -0,0 +1,267 @@
+"""Batch parsing of many documents across a process pool.
+
+``parse_many`` fans documents out to a ``ProcessPoolExecutor`` in chunks and
+streams results back as they finish. A failing document (size limit,
+security error, unreadable file) yields a failed ``BatchResult`` instead of
+aborting the batch. So does a document whose worker dies (OOM kill,
+segfault): the pool is rebuilt, and the documents of the chunks that were in
+flight are retried one at a time until the culprit is found.
+
+Inputs are either paths (``os.PathLike``, read inside the worker) or markdown
+strings. Plain ``str`` values are always treated as content, never as paths.
+
+Functions:
+    parse_many: Parse documents in parallel, yielding BatchResult objects
+
+Classes:
+    BatchResult: Outcome of parsing one document
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from doxstrux.markdown import engines
+from doxstrux.markdown.exceptions import MarkdownSecurityError
+from doxstrux.markdown.parse_cache import ParseCache
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DEFAULT_CHUNK_SIZE = 16
+
+# (index, source label, path or None, content or None)
+_Task = tuple[int, str | None, str | None, str | None]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of parsing one document.
+
+    Attributes:
+        index: Position of the document in the input iterable
+        source: File path for path inputs, None for string inputs
+        result: parse() output, or None on failure
+        error: Failure description ({type, message, security_profile,
+            content_info}), or None on success
+    """
+
+    index: int
+    source: str | None
+    result: dict[str, Any] | None = None
+    error: dict[str, Any] | None = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the document parsed successfully."""
+        return self.error is None
+
+
+def _error_info(exc: Exception) -> dict[str, Any]:
+    """Describe a per-document failure as a plain (picklable) dict."""
+    info = {"type": type(exc).__name__, "message": str(exc)}
+    if isinstance(exc, MarkdownSecurityError):
+        info["security_profile"] = exc.security_profile
+        info["content_info"] = exc.content_info
+    return info
+
+
+def _parse_one(
+    task: _Task,
+    profile: str | None,
+    config: dict[str, Any] | None,
+    include: frozenset[str] | None,
+    cache: ParseCache | None,
+) -> BatchResult:
+    """Parse one task, converting any failure into a failed BatchResult."""
+    index, source, path, content = task
+    try:
+        if path is not None:
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+        if cache is not None:
+            return BatchResult(index, source, result=cache.parse(content, profile, config, include))
+        parser = MarkdownParserCore(content, config=config, security_profile=profile)
+        return BatchResult(index, source, result=parser.parse(include=include))
+    except Exception as e:
+        return BatchResult(index, source, error=_error_info(e))
+
+
+def _parse_chunk(
+    chunk: list[_Task],
+    profile: str | None,
+    config: dict[str, Any] | None,
+    include: frozenset[str] | None,
+    cache: ParseCache | None,
+) -> list[BatchResult]:
+    """Worker entry point: parse a chunk of tasks."""
+    return [_parse_one(task, profile, config, include, cache) for task in chunk]
+
+
+def _worker_init(profile: str | None) -> None:
+    """Pool initializer: pre-build the engine for the batch profile."""
+    engines.warm_engines([profile or "moderate"])
+
+
+def _tasks(items: Iterable[str | os.PathLike]) -> Iterator[_Task]:
+    """Normalize inputs into (index, source, path, content) tasks."""
+    for index, item in enumerate(items):
+        if isinstance(item, os.PathLike):
+            path = os.fspath(item)
+            yield (index, path, path, None)
+        elif isinstance(item, str):
+            yield (index, None, None, item)
+        else:
+            raise TypeError(
+                f"parse_many() items must be str content or os.PathLike, got {type(item).__name__}"
+            )
+
+
+def _chunks(tasks: Iterator[_Task], size: int) -> Iterator[list[_Task]]:
+    """Group tasks into lists of at most ``size``."""
+    while chunk := list(islice(tasks, size)):
+        yield chunk
+
+
+def parse_many(
+    paths_or_strings: Iterable[str | os.PathLike],
+    profile: str | None = None,
+    workers: int | None = None,
+    *,
+    config: dict[str, Any] | None = None,
+    include: Iterable[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+    mp_context: Any = None,
+    cache: ParseCache | None = None,
+) -> Iterator[BatchResult]:
+    """Parse many documents in parallel, streaming results.
+
+    Inputs are consumed lazily, and at most ``2 * workers`` chunks are in
+    flight or buffered at a time, so arbitrarily large corpora can be
+    streamed from a generator.
+
+    Args:
+        paths_or_strings: Paths (os.PathLike, read by the worker) or markdown strings
+        profile: Security profile for every document (default: moderate)
+        workers: Worker processes (default: os.cpu_count()); 0 or 1 parses
+            serially in the calling process
+        config: Parser config passed to every MarkdownParserCore
+        include: Optional parse(include=...) subset
+        chunk_size: Documents per submitted task
+        ordered: Yield in input order (True) or completion order (False)
+        mp_context: Optional multiprocessing context for the pool
+        cache: Optional ParseCache; unchanged documents skip parsing
+
+    Yields:
+        BatchResult per document; failures are reported, not raised. A
+        document that kills its worker process fails with
+        error["type"] == "BrokenProcessPool".
+
+    Raises:
+        TypeError: If an input is neither str nor os.PathLike
+        ValueError: If chunk_size < 1
+
+    Example:
+        >>> for res in parse_many(Path("docs").rglob("*.md"), profile="strict", workers=8):
+        ...     if res.ok:
+        ...         index(res.source, res.result)
+        ...     else:
+        ...         log.warning("%s: %s", res.source, res.error["message"])
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+    include_set = frozenset(include) if include is not None else None
+    chunks = _chunks(_tasks(paths_or_strings), chunk_size)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk, profile, config, include_set, cache)
+        return
+
+    max_in_flight = workers * 2
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_worker_init,
+            initargs=(profile,),
+        )
+
+    pool = new_pool()
+    generation = 0  # Bumped when a broken pool is replaced
+    try:
+        # future -> (chunk id, chunk, True if a single-document retry, pool generation)
+        pending: dict[Future, tuple[int, list[_Task], bool, int]] = {}
+        done_chunks: dict[int, list[BatchResult]] = {}
+        # Chunks split into single-document retries: chunk id -> (results, count left)
+        partial: dict[int, tuple[list[BatchResult], int]] = {}
+        suspects: deque[tuple[int, _Task]] = deque()
+        next_chunk = 0  # Next chunk id to submit
+        next_yield = 0  # Next chunk id to yield (ordered mode)
+        exhausted = False
+
+        while True:
+            if suspects:
+                # Retry alone, so a worker death pins down its document
+                if not pending:
+                    chunk_id, task = suspects.popleft()
+                    future = pool.submit(_parse_chunk, [task], profile, config, include_set, cache)
+                    pending[future] = (chunk_id, [task], True, generation)
+            else:
+                # Buffered out-of-order chunks count against the in-flight budget
+                while not exhausted and len(pending) + len(done_chunks) + len(partial) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    future = pool.submit(_parse_chunk, chunk, profile, config, include_set, cache)
+                    pending[future] = (next_chunk, chunk, False, generation)
+                    next_chunk += 1
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_id, chunk, retry, submitted_to = pending.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (OOM kill, crash); every in-flight chunk fails with it
+                    if submitted_to == generation:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = new_pool()
+                        generation += 1
+                    if not retry:
+                        partial[chunk_id] = ([], len(chunk))
+                        suspects.extend((chunk_id, task) for task in chunk)
+                        continue
+                    results = [BatchResult(chunk[0][0], chunk[0][1], error=_error_info(e))]
+
+                if chunk_id in partial:
+                    collected, left = partial.pop(chunk_id)
+                    collected.extend(results)
+                    if left > 1:
+                        partial[chunk_id] = (collected, left - 1)
+                        continue
+                    results = sorted(collected, key=lambda r: r.index)
+                if ordered:
+                    done_chunks[chunk_id] = results
+                else:
+                    yield from results
+
+            if ordered:
+                while next_yield in done_chunks:
+                    yield from done_chunks.pop(next_yield)
+                    next_yield += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -6,8 +6,11 @@ security policies and resource limits.
 
 Constants:
     SECURITY_PROFILES: Security profile configurations (strict/moderate/permissive)
-    SECURITY_LIMITS: Content size and recursion limits by profile
+    SECURITY_LIMITS: Content size, line and token limits by profile
+    KNOWN_PLUGINS: Builtin and external plugins the parser can enable
     ALLOWED_PLUGINS: Allowed markdown-it plugins by profile
+    ALLOWED_LINK_SCHEMES_*: Allowed link schemes by profile
+    MAX_INJECTION_HITS_REPORTED: Cap on prompt injection hits listed in metadata
 
 Security Patterns (regex, retained for §6 Security):
     _STYLE_JS_PAT: CSS injection pattern (javascript: in style)
@@ -17,7 +20,6 @@ Security Patterns (regex, retained for §6 Security):
 """
 
 import re
-from doxstrux.markdown.security import validators as security_validators
 
 
 # ============================================================================
@@ -60,6 +62,20 @@ _BIDI_CONTROLS = [
 ]
 
 
+# ============================================================================
+# Allowed Link Schemes
+# ============================================================================
+
+ALLOWED_LINK_SCHEMES_STRICT = {"https"}
+ALLOWED_LINK_SCHEMES_MODERATE = {"http", "https", "mailto", "tel"}
+ALLOWED_LINK_SCHEMES_PERMISSIVE = {"http", "https", "mailto", "tel", "ftp"}
+
+
+# Maximum prompt injection hits listed in security metadata (all are still counted
+# towards the per-structure flags)
+MAX_INJECTION_HITS_REPORTED = 100
+
+
 # ============================================================================
 # Security Limits
 # ============================================================================
@@ -70,19 +86,34 @@ SECURITY_LIMITS = {
         "max_content_size": 100 * 1024,  # 100KB
         "max_line_count": 2000,  # 2K lines
         "max_token_count": 50000,  # 50K tokens
-        "max_recursion_depth": 50,  # Reduced recursion
     },
     "moderate": {
         "max_content_size": 1024 * 1024,  # 1MB
         "max_line_count": 10000,  # 10K lines
         "max_token_count": 200000,  # 200K tokens
-        "max_recursion_depth": 100,  # Standard recursion
     },
     "permissive": {
         "max_content_size": 10 * 1024 * 1024,  # 10MB
         "max_line_count": 50000,  # 50K lines
         "max_token_count": 1000000,  # 1M tokens
-        "max_recursion_depth": 150,  # Higher recursion
+    },
+}
+
+
+# Isolated parse budgets by security profile (markdown/isolation.py): wall-clock
+# deadline per parse, and address space a worker may grow by while parsing
+ISOLATION_LIMITS = {
+    "strict": {
+        "timeout_seconds": 5.0,
+        "max_memory_mb": 256,
+    },
+    "moderate": {
+        "timeout_seconds": 15.0,
+        "max_memory_mb": 1024,
+    },
+    "permissive": {
+        "timeout_seconds": 60.0,
+        "max_memory_mb": 4096,
     },
 }
 
@@ -91,6 +122,12 @@ SECURITY_LIMITS = {
 # Allowed Plugins by Profile
 # ============================================================================
 
+# Plugins the parser can enable; anything else is rejected as unknown
+KNOWN_PLUGINS = {
+    "builtin": ("table", "strikethrough", "linkify"),
+    "external": ("footnote", "tasklists", "front_matter", "texmath"),
+}
+
 ALLOWED_PLUGINS = {
     "strict": {
         "builtin": ["table"],  # Only basic table support
@@ -118,7 +155,7 @@ SECURITY_PROFILES = {
         "allows_scripts": False,
         "allows_data_uri": False,
         "max_data_uri_size": 0,
-        "allowed_schemes": security_validators.ALLOWED_LINK_SCHEMES_STRICT,
+        "allowed_schemes": ALLOWED_LINK_SCHEMES_STRICT,
         "max_link_count": 50,
         "max_image_count": 20,
         "max_footnote_size": 256,
@@ -131,7 +168,7 @@ SECURITY_PROFILES = {
         "allows_scripts": False,
         "allows_data_uri": True,
         "max_data_uri_size": 10240,  # 10KB
-        "allowed_schemes": security_validators.ALLOWED_LINK_SCHEMES_MODERATE,
+        "allowed_schemes": ALLOWED_LINK_SCHEMES_MODERATE,
         "max_link_count": 200,
         "max_image_count": 100,
         "max_footnote_size": 512,
@@ -144,7 +181,7 @@ SECURITY_PROFILES = {
         "allows_scripts": False,  # Never allow scripts in RAG
         "allows_data_uri": True,
         "max_data_uri_size": 102400,  # 100KB
-        "allowed_schemes": security_validators.ALLOWED_LINK_SCHEMES_PERMISSIVE,
+        "allowed_schemes": ALLOWED_LINK_SCHEMES_PERMISSIVE,
         "max_link_count": 1000,
         "max_image_count": 500,
         "max_footnote_size": 2048,
@@ -153,12 +190,3 @@ SECURITY_PROFILES = {
         "strip_all_html": False,
     },
 }
-
-
-# ============================================================================
-# Safety Constants
-# ============================================================================
-
-# Maximum recursion depth to prevent stack overflow
-# This is a global safety limit; per-profile limits are in SECURITY_LIMITS
-MAX_RECURSION_DEPTH = 100
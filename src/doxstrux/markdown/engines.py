@@ -0,0 +1,170 @@
+"""Process-wide cache of configured MarkdownIt engines.
+
+Building a MarkdownIt instance (preset, builtin rules, plugins) costs more
+than parsing a small document. Engines are therefore built once per
+configuration and shared by every MarkdownParserCore in the process.
+
+Sharing is safe because ``MarkdownIt.parse(src, env)`` keeps all per-parse
+state in its own state objects and the caller's ``env`` dict. The only lazy
+mutation, the rule-chain compilation in ``Ruler.getRules``, is forced at build
+time by a priming parse. Engines must not be reconfigured
+(``enable``/``use``/``set``) after they are handed out.
+
+Engines with ``linkify`` enabled are never cached: linkify-it keeps match state
+on its instance between ``test()`` and ``match()``.
+
+Functions:
+    engine_key: Cache key for a configuration
+    build_engine: Build and prime a new engine
+    get_engine: Return the shared engine for a configuration
+    warm_engines: Pre-build the default engines for security profiles
+    clear_engine_cache: Drop all cached engines
+    engine_cache_info: Cache statistics
+"""
+
+import threading
+from collections.abc import Iterable
+
+from markdown_it import MarkdownIt
+from mdit_py_plugins.footnote import footnote_plugin
+from mdit_py_plugins.front_matter import front_matter_plugin
+from mdit_py_plugins.tasklists import tasklists_plugin
+from mdit_py_plugins.texmath import texmath_plugin
+
+from doxstrux.markdown import config
+
+EngineKey = tuple[str, tuple[str, ...], tuple[str, ...]]
+
+_engines: dict[EngineKey, MarkdownIt] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def engine_key(preset: str, builtin: Iterable[str], external: Iterable[str]) -> EngineKey:
+    """Return the cache key for an engine configuration.
+
+    Plugin order is kept: external plugins register rules relative to each
+    other, so a different order can yield a different engine.
+
+    Args:
+        preset: markdown-it preset name
+        builtin: Builtin rules to enable (already validated)
+        external: External plugins to apply (already validated)
+
+    Returns:
+        Hashable (preset, builtin, external) tuple
+    """
+    return (preset, tuple(builtin), tuple(external))
+
+
+def build_engine(preset: str, builtin: Iterable[str], external: Iterable[str]) -> MarkdownIt:
+    """Build a configured engine and prime its rule caches.
+
+    HTML parsing is always on so html tokens are produced; policy is enforced
+    on the extracted structure, not by the tokenizer.
+
+    Args:
+        preset: markdown-it preset name
+        builtin: Builtin rules to enable
+        external: External plugins to apply (footnote, tasklists, front_matter, texmath)
+
+    Returns:
+        Ready-to-use MarkdownIt instance
+    """
+    md = MarkdownIt(preset, options_update={"html": True})
+
+    builtin = list(builtin)
+    if builtin:
+        md.enable(builtin)
+
+    for plugin in external:
+        if plugin == "footnote":
+            md.use(footnote_plugin)
+        elif plugin == "tasklists":
+            md.use(tasklists_plugin)
+        elif plugin == "front_matter":
+            md.use(front_matter_plugin)
+        elif plugin == "texmath":
+            md.use(texmath_plugin, inline_delimiter="$", block_delimiter="dollars")
+
+    # Compile every rule chain now, so shared use never mutates the engine
+    md.parse("x", {})
+    return md
+
+
+def get_engine(preset: str, builtin: Iterable[str], external: Iterable[str]) -> MarkdownIt:
+    """Return the shared engine for a configuration, building it on first use.
+
+    Thread-safe. Callers must treat the engine as read-only and pass their own
+    ``env`` dict to ``parse()``.
+
+    Args:
+        preset: markdown-it preset name
+        builtin: Builtin rules to enable (already validated)
+        external: External plugins to apply (already validated)
+
+    Returns:
+        Configured MarkdownIt instance
+    """
+    key = engine_key(preset, builtin, external)
+    if "linkify" in key[1]:
+        return build_engine(*key)
+
+    md = _engines.get(key)
+    if md is not None:
+        _stats["hits"] += 1
+        return md
+
+    with _lock:
+        md = _engines.get(key)
+        if md is None:
+            _stats["misses"] += 1
+            md = build_engine(*key)
+            _engines[key] = md
+        else:
+            _stats["hits"] += 1
+    return md
+
+
+def warm_engines(
+    profiles: Iterable[str] | None = None,
+    preset: str = "commonmark",
+) -> int:
+    """Pre-build the default engines for security profiles.
+
+    Call at process start (or in pool worker initializers) so the first parse
+    does not pay for engine construction.
+
+    Args:
+        profiles: Profile names (default: all profiles)
+        preset: markdown-it preset name
+
+    Returns:
+        Number of engines now cached
+    """
+    for profile in profiles or config.ALLOWED_PLUGINS:
+        allowed = config.ALLOWED_PLUGINS[profile]
+        # Same filtering as MarkdownParserCore._validate_plugins
+        builtin = [p for p in allowed["builtin"] if p in config.KNOWN_PLUGINS["builtin"]]
+        external = [p for p in allowed["external"] if p in config.KNOWN_PLUGINS["external"]]
+        get_engine(preset, builtin, external)
+    return len(_engines)
+
+
+def clear_engine_cache() -> None:
+    """Drop all cached engines and reset statistics."""
+    with _lock:
+        _engines.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+def engine_cache_info() -> dict[str, int]:
+    """Return cache statistics.
+
+    Hit/miss counts are best-effort under concurrent use.
+
+    Returns:
+        Dict with size, hits and misses
+    """
+    return {"size": len(_engines), "hits": _stats["hits"], "misses": _stats["misses"]}
@@ -6,6 +6,10 @@ class MarkdownSecurityError(Exception):
         self.security_profile = security_profile
         self.content_info = content_info or {}
 
+    def __reduce__(self):
+        # Keep profile and content info when raised across process boundaries
+        return (type(self), (str(self), self.security_profile, self.content_info))
+
 
 class MarkdownSizeError(MarkdownSecurityError):
     """Raised when content exceeds size limits."""
@@ -14,6 +14,7 @@ Each extractor focuses on a single markdown feature:
 - footnotes: Footnote references
 - blockquotes: Blockquote extraction
 - html: HTML block and inline detection
+- records: Slotted record types for structure items (result_format="records")
 
 All extractors follow the pattern:
     extract(token, context) -> dict
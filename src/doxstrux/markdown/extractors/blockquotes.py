@@ -7,10 +7,13 @@ This module extracts blockquote elements from the markdown AST, including:
 
 Functions:
     extract_blockquotes: Extract all blockquotes with metadata
+    blockquote_collector: Build a dispatch collector for blockquotes
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
 
 def extract_blockquotes(
     tree: Any,
@@ -32,7 +35,24 @@ def extract_blockquotes(
     Note: For richer nested data extraction, existing extractors can be reused
     with line-range filters on the children_blocks ranges.
     """
-    blockquotes = []
+    collector = blockquote_collector(find_section_id_func, get_text_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def blockquote_collector(
+    find_section_id_func: Any,
+    get_text_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts blockquotes.
+
+    Args:
+        find_section_id_func: Function to find section ID for a line number
+        get_text_func: Function to extract text from a node
+
+    Returns:
+        NodeCollector routed to blockquote nodes
+    """
 
     def blockquote_processor(node, ctx, level):
         if node.type == "blockquote":
@@ -79,5 +99,4 @@ def extract_blockquotes(
 
         return True  # Continue traversing for other nodes
 
-    process_tree_func(tree, blockquote_processor, blockquotes)
-    return blockquotes
+    return NodeCollector("blockquotes", {"blockquote"}, blockquote_processor, [])
@@ -8,10 +8,13 @@ This module extracts code blocks from the markdown AST, including:
 
 Functions:
     extract_code_blocks: Extract all code blocks with caching
+    code_block_collector: Build a dispatch collector for code blocks
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
 
 def extract_code_blocks(
     tree: Any,
@@ -42,7 +45,33 @@ def extract_code_blocks(
     if cache["code_blocks"] is not None:
         return cache["code_blocks"]
 
-    blocks = []
+    collector = code_block_collector(
+        lines, find_section_id_func, slice_lines_inclusive_func, cache
+    )
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def code_block_collector(
+    lines: list[str],
+    find_section_id_func: Any,
+    slice_lines_inclusive_func: Any,
+    cache: dict[str, Any]
+) -> NodeCollector:
+    """Build a dispatch collector that extracts code blocks.
+
+    The finalizer runs the indented-code line scan and stores the result
+    in ``cache["code_blocks"]``.
+
+    Args:
+        lines: List of source lines
+        find_section_id_func: Function to find section ID for a line number
+        slice_lines_inclusive_func: Function to slice lines inclusively
+        cache: Cache dict for storing results
+
+    Returns:
+        NodeCollector routed to fence/code_block nodes
+    """
 
     def code_processor(node, ctx, level):
         # Skip fence/code nodes that are inside table cells (defensive)
@@ -80,45 +109,46 @@ def extract_code_blocks(
 
         return True
 
-    process_tree_func(tree, code_processor, blocks)
-
-    # Also extract indented code blocks that markdown-it might miss
-    covered = set()
-    for b in blocks:
-        if b.get("start_line") is not None and b.get("end_line") is not None:
-            covered.update(range(b["start_line"], b["end_line"] + 1))
-
-    i, N = 0, len(lines)
-    while i < N:
-        line = lines[i]
-        if (line.startswith("    ") or line.startswith("\t")) and i not in covered:
-            start = i
-            i += 1
-            while i < N:
-                nxt = lines[i]
-                if not nxt.strip() or nxt.startswith("    ") or nxt.startswith("\t"):
-                    i += 1
-                else:
-                    break
-            end = i - 1
-            # Extract and process indented content using centralized slicing
-            raw_lines = slice_lines_inclusive_func(start, end + 1)
-            content = "\n".join(l[4:] if l.startswith("    ") else l[1:] for l in raw_lines)
-            blocks.append(
-                {
-                    "id": f"code_{len(blocks)}",
-                    "type": "indented",
-                    "language": "",
-                    "content": content,
-                    "start_line": start,
-                    "end_line": end,
-                    "section_id": find_section_id_func(start),
-                }
-            )
-            covered.update(range(start, end + 1))
-        else:
-            i += 1
-
-    # Cache the result
-    cache["code_blocks"] = blocks
-    return blocks
+    def finalize(blocks):
+        # Also extract indented code blocks that markdown-it might miss
+        covered = set()
+        for b in blocks:
+            if b.get("start_line") is not None and b.get("end_line") is not None:
+                covered.update(range(b["start_line"], b["end_line"] + 1))
+
+        i, N = 0, len(lines)
+        while i < N:
+            line = lines[i]
+            if (line.startswith("    ") or line.startswith("\t")) and i not in covered:
+                start = i
+                i += 1
+                while i < N:
+                    nxt = lines[i]
+                    if not nxt.strip() or nxt.startswith("    ") or nxt.startswith("\t"):
+                        i += 1
+                    else:
+                        break
+                end = i - 1
+                # Extract and process indented content using centralized slicing
+                raw_lines = slice_lines_inclusive_func(start, end + 1)
+                content = "\n".join(l[4:] if l.startswith("    ") else l[1:] for l in raw_lines)
+                blocks.append(
+                    {
+                        "id": f"code_{len(blocks)}",
+                        "type": "indented",
+                        "language": "",
+                        "content": content,
+                        "start_line": start,
+                        "end_line": end,
+                        "section_id": find_section_id_func(start),
+                    }
+                )
+                covered.update(range(start, end + 1))
+            else:
+                i += 1
+
+        # Cache the result
+        cache["code_blocks"] = blocks
+        return blocks
+
+    return NodeCollector("code_blocks", {"fence", "code_block"}, code_processor, [], finalize)
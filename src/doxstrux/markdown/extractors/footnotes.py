@@ -7,10 +7,13 @@ This module extracts footnote elements from the markdown AST, including:
 
 Functions:
     extract_footnotes: Extract all footnote definitions and references
+    footnote_collector: Build a dispatch collector for footnotes
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
 
 def extract_footnotes(
     tree: Any,
@@ -31,6 +34,24 @@ def extract_footnotes(
         Definitions are deduplicated by label (last-writer-wins).
         Both label and numeric ID are extracted for stability.
     """
+    collector = footnote_collector(find_section_id_func, get_text_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def footnote_collector(
+    find_section_id_func: Any,
+    get_text_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts footnote definitions and references.
+
+    Args:
+        find_section_id_func: Function to find section ID for a line number
+        get_text_func: Function to extract text from a node
+
+    Returns:
+        NodeCollector routed to footnote/footnote_ref nodes
+    """
     # Use dict for deduplication of definitions
     definitions_dict = {}
     references = []
@@ -121,12 +142,14 @@ def extract_footnotes(
 
         return True  # Continue traversing
 
-    context = {"definitions_dict": definitions_dict, "references": references}
-
-    process_tree_func(tree, footnote_processor, context)
+    def finalize(context):
+        # Convert definitions dict to list
+        return {
+            "definitions": list(context["definitions_dict"].values()),
+            "references": context["references"],
+        }
 
-    # Convert definitions dict to list
-    return {
-        "definitions": list(context["definitions_dict"].values()),
-        "references": context["references"],
-    }
+    context = {"definitions_dict": definitions_dict, "references": references}
+    return NodeCollector(
+        "footnotes", {"footnote", "footnote_ref"}, footnote_processor, context, finalize
+    )
@@ -8,15 +8,19 @@ This module extracts HTML elements from markdown, including:
 Functions:
     extract_html: Extract all HTML with security metadata
     extract_html_tag_hints: Extract tag names from HTML content
+    html_collector: Build a dispatch collector for HTML
 """
 
 import re
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+
 
 def extract_html(
     tree: Any,
-    tokens: list[Any],
+    warehouse: TokenWarehouse,
     config: dict[str, Any],
     process_tree_func: Any,
     find_section_id_func: Any,
@@ -28,7 +32,7 @@ def extract_html(
 
     Args:
         tree: The markdown AST tree
-        tokens: List of markdown-it Token objects
+        warehouse: Token index for the parsed document
         config: Parser configuration dict
         process_tree_func: Function to process tree nodes
         find_section_id_func: Function to find section ID for a line number
@@ -38,6 +42,31 @@ def extract_html(
         Dictionary with 'blocks' and 'inline' lists.
         Inline HTML includes <span>, <em>, <strong>, etc. that appear in paragraphs.
     """
+    collector = html_collector(warehouse, config, find_section_id_func, slice_lines_raw_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def html_collector(
+    warehouse: TokenWarehouse,
+    config: dict[str, Any],
+    find_section_id_func: Any,
+    slice_lines_raw_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts HTML blocks and inline HTML.
+
+    HTML blocks are collected from the tree walk; inline HTML is read from
+    the token stream in the finalizer.
+
+    Args:
+        warehouse: Token index for the parsed document
+        config: Parser configuration dict
+        find_section_id_func: Function to find section ID for a line number
+        slice_lines_raw_func: Function to extract raw lines from source
+
+    Returns:
+        NodeCollector routed to html_block nodes
+    """
     html_blocks = []
     html_inline_dict = {}  # Use dict for deduplication
 
@@ -81,35 +110,36 @@ def extract_html(
         "html_allowed": html_allowed,  # Pass allowed flag to processor
     }
 
-    process_tree_func(tree, html_processor, context)
-
-    # Process inline tokens which contain html_inline with proper line info
-    for token in tokens:
-        if token.type == "inline" and token.children:
-            line_num = token.map[0] if token.map else None
-
-            for child in token.children:
-                if child.type == "html_inline":
-                    content = getattr(child, "content", "") or ""
-                    if content.strip():
-                        # Create unique key for deduplication
-                        key = (content, line_num)
-                        html_inline_dict[key] = {
-                            "content": content,
-                            "line": line_num,
-                            "inline": True,
-                            "allowed": html_allowed,  # RAG Safety: flag if HTML is allowed
-                            "section_id": find_section_id_func(line_num)
-                            if line_num is not None
-                            else None,
-                            "tag_hints": extract_html_tag_hints(content),
-                        }
-
-    # Convert dict to list for final output
-    html_inline = list(html_inline_dict.values())
-
-    # Return both blocks and inline HTML
-    return {"blocks": html_blocks, "inline": html_inline}
+    def finalize(context):
+        # Process inline tokens which contain html_inline with proper line info
+        for token in warehouse.tokens_of_type("inline"):
+            if token.children:
+                line_num = token.map[0] if token.map else None
+
+                for child in token.children:
+                    if child.type == "html_inline":
+                        content = getattr(child, "content", "") or ""
+                        if content.strip():
+                            # Create unique key for deduplication
+                            key = (content, line_num)
+                            html_inline_dict[key] = {
+                                "content": content,
+                                "line": line_num,
+                                "inline": True,
+                                "allowed": html_allowed,  # RAG Safety: flag if HTML is allowed
+                                "section_id": find_section_id_func(line_num)
+                                if line_num is not None
+                                else None,
+                                "tag_hints": extract_html_tag_hints(content),
+                            }
+
+        # Convert dict to list for final output
+        html_inline = list(html_inline_dict.values())
+
+        # Return both blocks and inline HTML
+        return {"blocks": html_blocks, "inline": html_inline}
+
+    return NodeCollector("html", {"html_block"}, html_processor, context, finalize)
 
 
 def extract_html_tag_hints(html_content: str) -> list[str]:
@@ -13,17 +13,22 @@ Functions:
     process_inline_tokens: Process inline tokens to extract links and images
 """
 
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
+from doxstrux.markdown import url_cache
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+
 
 def extract_links(
-    tokens: list[Any],
+    warehouse: TokenWarehouse,
     process_inline_tokens_func: Any
 ) -> list[dict]:
     """Extract links robustly using token parsing.
 
     Args:
-        tokens: List of markdown-it Token objects
+        warehouse: Token index for the parsed document
         process_inline_tokens_func: Function to process inline tokens
 
     Returns:
@@ -31,9 +36,9 @@ def extract_links(
     """
     links = []
 
-    # Process all tokens to find links
-    for token in tokens:
-        if token.type == "inline" and token.children:
+    # Links live in inline token children
+    for token in warehouse.tokens_of_type("inline"):
+        if token.children:
             # Process inline tokens which contain links
             process_inline_tokens_func(token.children, links, token.map)
 
@@ -46,7 +51,8 @@ def process_inline_tokens(
     line_map: Any,
     effective_allowed_schemes: set[str],
     security_validators: Any,
-    media_module: Any
+    media_module: Any,
+    url_verdict: Callable[[str], url_cache.UrlVerdict] | None = None
 ) -> None:
     """Process inline tokens to extract links with improved line attribution.
 
@@ -56,8 +62,13 @@ def process_inline_tokens(
         line_map: Line map from parent token
         effective_allowed_schemes: Set of allowed URL schemes
         security_validators: Security validators module
-        media_module: Media extractor module for image metadata
+        media_module: Media extractor module for image IDs
+        url_verdict: Optional URL analysis function (e.g. backed by
+            url_cache.get_verdict); defaults to uncached analysis
     """
+    if url_verdict is None:
+        url_verdict = partial(url_cache.analyze_url, allowed_schemes=effective_allowed_schemes)
+
     i = 0
     softbreak_count = 0  # Track softbreaks for line offset
 
@@ -72,7 +83,8 @@ def process_inline_tokens(
             href = token.attrGet("href") or ""
 
             # Validate link scheme for security (Phase 6 Task 6.1)
-            scheme, is_allowed = security_validators.validate_link_scheme(href, effective_allowed_schemes)
+            verdict = url_verdict(href)
+            scheme, is_allowed = verdict.scheme, verdict.allowed
 
             # Collect text until link_close and watch for embedded images
             text_parts = []
@@ -107,7 +119,7 @@ def process_inline_tokens(
             line_num = (line_map[0] + link_line_offset) if line_map else None
 
             # Determine link type with enhanced scheme detection (Phase 6 Task 6.1)
-            link_type = security_validators.classify_link_type(href)
+            link_type = verdict.link_type
 
             # Add the main link record with security metadata
             links.append(
@@ -124,7 +136,7 @@ def process_inline_tokens(
             # If there was an embedded image, add a second record for joinability
             if saw_img:
                 # Get unified image metadata for consistency with first-class images
-                img_metadata = media_module._determine_image_metadata(saw_img["src"])
+                img_verdict = url_verdict(saw_img["src"])
                 links.append(
                     {
                         "type": "image",
@@ -135,8 +147,8 @@ def process_inline_tokens(
                         "text": saw_img["alt"],  # Keep for backward compatibility
                         "line": line_num,
                         "image_id": saw_img["image_id"],
-                        "image_kind": img_metadata["image_kind"],  # Unified metadata
-                        "format": img_metadata["format"],  # Unified metadata
+                        "image_kind": img_verdict.image_kind,  # Unified metadata
+                        "format": img_verdict.image_format,  # Unified metadata
                     }
                 )
 
@@ -156,7 +168,7 @@ def process_inline_tokens(
             image_id = media_module._generate_image_id(src, line_num)
 
             # Add standardized image reference to links with unified metadata
-            img_metadata = media_module._determine_image_metadata(src)
+            img_verdict = url_verdict(src)
             links.append(
                 {
                     "image_id": image_id,  # For joining with images table
@@ -167,8 +179,8 @@ def process_inline_tokens(
                     "title": title,
                     "line": line_num,
                     "type": "image",
-                    "image_kind": img_metadata["image_kind"],  # Unified metadata
-                    "format": img_metadata["format"],  # Unified metadata
+                    "image_kind": img_verdict.image_kind,  # Unified metadata
+                    "format": img_verdict.image_format,  # Unified metadata
                 }
             )
 
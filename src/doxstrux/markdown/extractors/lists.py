@@ -11,10 +11,16 @@ Functions:
     detect_task_checkbox: Detect checkbox state from plugin HTML
     extract_list_items: Recursively extract regular list items
     extract_tasklist_items: Recursively extract task list items
+    list_collector: Build a dispatch collector for regular lists
+    tasklist_collector: Build a dispatch collector for task lists
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
+LIST_NODE_TYPES = ("bullet_list", "ordered_list")
+
 
 def extract_lists(
     tree: Any,
@@ -33,7 +39,24 @@ def extract_lists(
     Returns:
         List of regular list dicts with items and metadata
     """
-    lists = []
+    collector = list_collector(extract_list_items_func, find_section_id_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def list_collector(
+    extract_list_items_func: Any,
+    find_section_id_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts regular (non-task) lists.
+
+    Args:
+        extract_list_items_func: Function to recursively extract list items
+        find_section_id_func: Function to find section ID for a line number
+
+    Returns:
+        NodeCollector routed to bullet_list/ordered_list nodes
+    """
 
     def list_processor(node, ctx, level):
         if node.type in ["bullet_list", "ordered_list"]:
@@ -64,8 +87,7 @@ def extract_lists(
 
         return True
 
-    process_tree_func(tree, list_processor, lists)
-    return lists
+    return NodeCollector("lists", LIST_NODE_TYPES, list_processor, [])
 
 
 def extract_tasklists(
@@ -88,7 +110,24 @@ def extract_tasklists(
     Returns:
         List of task list dicts with checkbox states
     """
-    tasklists = []
+    collector = tasklist_collector(extract_tasklist_items_func, find_section_id_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def tasklist_collector(
+    extract_tasklist_items_func: Any,
+    find_section_id_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts GFM task lists.
+
+    Args:
+        extract_tasklist_items_func: Function to recursively extract task items
+        find_section_id_func: Function to find section ID for a line number
+
+    Returns:
+        NodeCollector routed to bullet_list/ordered_list nodes
+    """
 
     def tasklist_processor(node, ctx, level):
         if node.type in ["bullet_list", "ordered_list"]:
@@ -128,8 +167,7 @@ def extract_tasklists(
 
         return True
 
-    process_tree_func(tree, tasklist_processor, tasklists)
-    return tasklists
+    return NodeCollector("tasklists", LIST_NODE_TYPES, tasklist_processor, [])
 
 
 def detect_task_checkbox(
@@ -11,18 +11,18 @@ Functions:
     extract_math: Extract all math expressions with metadata
 """
 
-from typing import Any
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
 
 
 def extract_math(
-    tokens: list[Any],
+    warehouse: TokenWarehouse,
 ) -> dict[str, list[dict]]:
     """Extract all math expressions from tokens.
 
     Returns both block-level and inline math expressions with line attribution.
 
     Args:
-        tokens: Token list from markdown-it parser (must have texmath plugin enabled)
+        warehouse: Token index for the parsed document (texmath plugin enabled)
 
     Returns:
         Dictionary with 'blocks' and 'inline' lists:
@@ -46,15 +46,14 @@ def extract_math(
         }
 
     Examples:
-        >>> tokens = parser.tokens  # Parser with texmath_plugin enabled
-        >>> math_data = extract_math(tokens)
+        >>> math_data = extract_math(parser.warehouse)  # texmath_plugin enabled
         >>> math_data['blocks'][0]['content']
         '\\int_0^1 x^2\\,dx = \\tfrac{1}{3}'
     """
     blocks = []
     inline = []
 
-    for tok in tokens:
+    for tok in warehouse.tokens_of_types("math_block", "fence"):
         # Block-level display math: $$...$$
         if tok.type == "math_block":
             start_line, end_line = tok.map if tok.map else (None, None)
@@ -77,8 +76,9 @@ def extract_math(
                 "end_line": end_line
             })
 
-        # Inline math: $...$
-        # Look inside inline token children (texmath plugin injects math_inline tokens)
+    # Inline math: $...$
+    # Look inside inline token children (texmath plugin injects math_inline tokens)
+    for tok in warehouse.tokens_of_type("inline"):
         if tok.children:
             for child in tok.children:
                 if child.type == "math_inline":
@@ -10,28 +10,34 @@ Functions:
 """
 
 import hashlib
-import os
+from collections.abc import Callable
+from functools import partial
 from typing import Any
+from doxstrux.markdown import url_cache
 from doxstrux.markdown.security import validators as security_validators
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
 
 
 def extract_images(
-    tokens: list[Any],
+    warehouse: TokenWarehouse,
     effective_allowed_schemes: set[str],
-    cache: dict[str, Any] | None = None
+    cache: dict[str, Any] | None = None,
+    url_verdict: Callable[[str], url_cache.UrlVerdict] | None = None
 ) -> list[dict]:
     """Extract all images as first-class elements with enhanced metadata.
 
     Args:
-        tokens: List of markdown-it Token objects
+        warehouse: Token index for the parsed document
         effective_allowed_schemes: Set of allowed URL schemes for validation
         cache: Optional cache dict to store results
+        url_verdict: Optional URL analysis function (e.g. backed by
+            url_cache.get_verdict); defaults to uncached analysis
 
     Returns:
         List of image records with stable IDs, metadata, and security info
 
     Example:
-        >>> images = extract_images(tokens, {"http", "https"})
+        >>> images = extract_images(warehouse, {"http", "https"})
         >>> images[0]['image_id']
         'a1b2c3d4e5f6g7h8'
     """
@@ -39,18 +45,21 @@ def extract_images(
     if cache and cache.get("images") is not None:
         return cache["images"]
 
+    if url_verdict is None:
+        url_verdict = partial(url_cache.analyze_url, allowed_schemes=effective_allowed_schemes)
+
     images = []
     seen_ids = set()  # Track to avoid duplicates
 
-    # Process all tokens to find images
-    for token in tokens:
-        if token.type == "inline" and token.children:
+    # Images live in inline token children
+    for token in warehouse.tokens_of_type("inline"):
+        if token.children:
             _process_inline_tokens_for_images(
                 token.children,
                 images,
                 token.map,
                 seen_ids,
-                effective_allowed_schemes
+                url_verdict
             )
 
     # Cache the result
@@ -65,7 +74,7 @@ def _process_inline_tokens_for_images(
     images: list[dict],
     line_map: tuple[int, int] | None,
     seen_ids: set[str],
-    effective_allowed_schemes: set[str]
+    url_verdict: Callable[[str], url_cache.UrlVerdict]
 ) -> None:
     """Process inline tokens to extract images with enhanced metadata.
 
@@ -74,7 +83,7 @@ def _process_inline_tokens_for_images(
         images: List to append image records to (modified in place)
         line_map: Line range tuple (start, end) from parent token
         seen_ids: Set of seen image IDs to avoid duplicates
-        effective_allowed_schemes: Set of allowed URL schemes
+        url_verdict: URL analysis function (scheme, image kind/format)
     """
     softbreak_count = 0  # Track softbreaks for line offset
 
@@ -99,15 +108,11 @@ def _process_inline_tokens_for_images(
                 continue
             seen_ids.add(image_id)
 
-            # Validate image URL scheme for security
-            scheme, is_allowed = security_validators.validate_link_scheme(
-                src, effective_allowed_schemes
-            )
-
-            # Use centralized metadata determination for consistency
-            img_metadata = _determine_image_metadata(src)
-            image_kind = img_metadata["image_kind"]
-            format_type = img_metadata["format"]
+            # Validate image URL scheme and determine kind/format (shared verdict)
+            verdict = url_verdict(src)
+            scheme, is_allowed = verdict.scheme, verdict.allowed
+            image_kind = verdict.image_kind
+            format_type = verdict.image_format
 
             # Parse data URIs for additional metadata
             if image_kind == "data":
@@ -172,22 +177,5 @@ def _determine_image_metadata(src: str) -> dict[str, str]:
     Returns:
         Dictionary with 'image_kind' and 'format' keys
     """
-    # Determine image kind and parse data URIs
-    if src.startswith("data:"):
-        image_kind = "data"
-        data_info = security_validators.parse_data_uri(src)
-        # Extract format from mediatype (e.g., "image/png" → "png")
-        mediatype = data_info.get("mediatype", "")
-        format_type = mediatype.split("/")[1] if "/" in mediatype else "unknown"
-    elif src.startswith(("http://", "https://")):
-        image_kind = "external"
-        # Extract format from extension for external URIs
-        _, ext = os.path.splitext(src.lower())
-        format_type = ext.lstrip(".") if ext else "unknown"
-    else:
-        image_kind = "local"
-        # Extract format from extension for local paths
-        _, ext = os.path.splitext(src.lower())
-        format_type = ext.lstrip(".") if ext else "unknown"
-
-    return {"image_kind": image_kind, "format": format_type}
+    # Single implementation shared with the URL verdict cache
+    return url_cache.image_metadata(src)
@@ -8,56 +8,78 @@ This module extracts paragraph elements from the markdown AST, including:
 
 Functions:
     extract_paragraphs: Extract all paragraphs with metadata
+    paragraph_collector: Build a dispatch collector for paragraphs
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
 
 def extract_paragraphs(
     tree: Any,
     process_tree_func: Any,
-    get_text_func: Any,
-    find_section_id_func: Any,
-    has_child_type_func: Any
+    features_func: Any,
+    find_section_id_func: Any
 ) -> list[dict]:
     """Extract all paragraphs with metadata.
 
     Args:
         tree: The markdown AST tree
         process_tree_func: Function to process tree nodes
-        get_text_func: Function to extract text from node
+        features_func: Function(node) -> (text, word_count, has_links,
+            has_emphasis, has_code), e.g. text_utils.paragraph_features
         find_section_id_func: Function to find section ID for a line number
-        has_child_type_func: Function to check if node has child of type
 
     Returns:
         List of paragraph dicts with metadata
     """
-    paragraphs = []
+    collector = paragraph_collector(features_func, find_section_id_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
 
-    def paragraph_processor(node, ctx, level):
-        if node.type == "paragraph":
-            # Skip if inside a list or blockquote (they handle their own paragraphs)
-            parent = getattr(node, "parent", None)
-            while parent:
-                if parent.type in ["list_item", "blockquote"]:
-                    return False
-                parent = getattr(parent, "parent", None)
 
+def paragraph_collector(
+    features_func: Any,
+    find_section_id_func: Any
+) -> NodeCollector:
+    """Build a dispatch collector that extracts paragraphs.
+
+    Lists and blockquotes report their own paragraphs, so the collector
+    prunes list_item and blockquote subtrees: a paragraph reaching the
+    processor therefore has no such ancestor, without walking parent links.
+
+    Args:
+        features_func: Function(node) -> (text, word_count, has_links,
+            has_emphasis, has_code)
+        find_section_id_func: Function to find section ID for a line number
+
+    Returns:
+        NodeCollector routed to paragraph, list_item and blockquote nodes
+    """
+
+    def paragraph_processor(node, ctx, level):
+        node_type = node.type
+        if node_type == "paragraph":
+            text, word_count, has_links, has_emphasis, has_code = features_func(node)
+            node_map = node.map
             para = {
                 "id": f"para_{len(ctx)}",
-                "text": get_text_func(node),
-                "start_line": node.map[0] if node.map else None,
-                "end_line": node.map[1] if node.map else None,
-                "section_id": find_section_id_func(node.map[0] if node.map else 0),
-                "word_count": len(get_text_func(node).split()),
-                "has_links": has_child_type_func(node, "link"),
-                "has_emphasis": has_child_type_func(node, ["em", "strong"]),
-                "has_code": has_child_type_func(node, "code_inline"),
+                "text": text,
+                "start_line": node_map[0] if node_map else None,
+                "end_line": node_map[1] if node_map else None,
+                "section_id": find_section_id_func(node_map[0] if node_map else 0),
+                "word_count": word_count,
+                "has_links": has_links,
+                "has_emphasis": has_emphasis,
+                "has_code": has_code,
             }
             ctx.append(para)
             return False  # Don't recurse, we extracted everything
 
-        return True
+        # Skip list items and blockquotes (they handle their own paragraphs)
+        return node_type != "list_item" and node_type != "blockquote"
 
-    process_tree_func(tree, paragraph_processor, paragraphs)
-    return paragraphs
+    return NodeCollector(
+        "paragraphs", {"paragraph", "list_item", "blockquote"}, paragraph_processor, []
+    )
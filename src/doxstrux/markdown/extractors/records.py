@@ -0,0 +1,333 @@
+"""Records - Compact slotted record types for extracted structures.
+
+Extractors build plain dicts. With ``config={"result_format": "records"}``
+the parser converts the structure lists of its result into the slotted
+dataclasses below once security policy has been applied. A slotted record
+stores its fields in a fixed-size instance instead of a per-item hash
+table, which makes large results (100k links) much smaller.
+
+Every record has ``to_dict()`` returning exactly the dict the extractor
+built, so code written against the dict format keeps working via
+``to_dicts()``.
+
+Optional keys (present only on some items, e.g. data URI fields of images)
+default to ``ABSENT`` and are left out of ``to_dict()``.
+
+Functions:
+    to_records: Convert a parse() structure dict to records
+    to_dicts: Convert a records structure back to plain dicts
+
+Classes:
+    Record: Base class with to_dict() / from_dict()
+    SectionRecord, HeadingRecord, ParagraphRecord, LinkRecord,
+    ImageRefRecord, ImageRecord, TableRecord, CodeBlockRecord,
+    ListRecord, TaskListRecord, ListItemRecord, BlockRecord,
+    BlockquoteRecord: One record type per structure item
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar
+
+
+class _Absent:
+    """Marker for optional keys missing from the source dict."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "ABSENT"
+
+    def __reduce__(self) -> str:
+        return "ABSENT"  # Pickle as the module-level singleton
+
+
+ABSENT: Any = _Absent()
+
+# Record type -> field names in declaration (dict key) order
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _dump(value: Any) -> Any:
+    """Convert nested records (and lists of them) back to dicts."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list) and value and isinstance(value[0], Record):
+        return [_dump(v) for v in value]
+    return value
+
+
+@dataclass(slots=True, kw_only=True)
+class Record:
+    """Base class for structure records.
+
+    Subclasses list their fields in the key order of the extractor's dict.
+    ``_nested`` maps field names holding lists of dicts to their record type.
+    """
+
+    _nested: ClassVar[dict[str, str]] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the item as the dict the extractor built."""
+        names = _FIELD_NAMES.get(type(self))
+        if names is None:
+            names = _FIELD_NAMES[type(self)] = tuple(f.name for f in fields(self))
+        out = {}
+        for name in names:
+            value = getattr(self, name)
+            if value is not ABSENT:
+                out[name] = _dump(value)
+        return out
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Record":
+        """Build a record from an extractor dict.
+
+        Raises:
+            TypeError: If the dict has keys the record type does not define
+        """
+        if not cls._nested:
+            return cls(**data)
+        kwargs = dict(data)
+        for name, type_name in cls._nested.items():
+            items = kwargs.get(name)
+            if items:
+                record_type = RECORD_TYPES_BY_NAME[type_name]
+                kwargs[name] = [record_type.from_dict(item) for item in items]
+        return cls(**kwargs)
+
+
+@dataclass(slots=True, kw_only=True)
+class SectionRecord(Record):
+    id: str
+    level: int
+    title: str
+    slug: str
+    start_line: int | None
+    end_line: int | None
+    start_char: int | None
+    end_char: int | None
+    parent_id: str | None
+    child_ids: list[str]
+    raw_content: str
+    text_content: str
+
+
+@dataclass(slots=True, kw_only=True)
+class HeadingRecord(Record):
+    id: str
+    level: int
+    text: str
+    line: int | None
+    slug: str
+    parent_heading_id: str | None
+    start_char: int | None
+    end_char: int | None
+
+
+@dataclass(slots=True, kw_only=True)
+class ParagraphRecord(Record):
+    id: str
+    text: str
+    start_line: int | None
+    end_line: int | None
+    section_id: str | None
+    word_count: int
+    has_links: bool
+    has_emphasis: bool
+    has_code: bool
+
+
+@dataclass(slots=True, kw_only=True)
+class LinkRecord(Record):
+    text: str
+    url: str
+    line: int | None
+    type: str
+    scheme: str | None
+    allowed: bool
+
+
+@dataclass(slots=True, kw_only=True)
+class ImageRefRecord(Record):
+    """Image reference in the links list (standalone or inside a link)."""
+
+    image_id: str
+    text: str
+    url: str
+    src: str
+    alt: str
+    title: str
+    line: int | None
+    type: str
+    image_kind: str
+    format: str
+
+
+@dataclass(slots=True, kw_only=True)
+class ImageRecord(Record):
+    image_id: str
+    src: str
+    alt: str
+    title: str
+    line: int | None
+    image_kind: str
+    format: str
+    has_alt: bool
+    has_title: bool
+    scheme: str | None
+    allowed: bool
+    media_type: str | None = ABSENT
+    encoding: str | None = ABSENT
+    bytes_approx: int | None = ABSENT
+
+
+@dataclass(slots=True, kw_only=True)
+class TableRecord(Record):
+    id: str
+    raw_content: str
+    headers: list[str]
+    rows: list[list[str]]
+    align: list[str | None]
+    start_line: int | None
+    end_line: int | None
+    section_id: str | None
+    is_ragged: bool
+    align_mismatch: bool
+    table_valid_md: bool
+    column_count: int
+    row_count: int
+    align_meta: dict[str, Any]
+    is_ragged_meta: dict[str, Any] = ABSENT
+
+
+@dataclass(slots=True, kw_only=True)
+class CodeBlockRecord(Record):
+    id: str
+    type: str
+    language: str
+    content: str
+    start_line: int | None
+    end_line: int | None
+    section_id: str | None
+
+
+@dataclass(slots=True, kw_only=True)
+class BlockRecord(Record):
+    """Child block summary of a list item or blockquote."""
+
+    type: str
+    start_line: int | None
+    end_line: int | None
+
+
+@dataclass(slots=True, kw_only=True)
+class ListItemRecord(Record):
+    text: str
+    checked: bool | None = ABSENT
+    children: list["ListItemRecord"] = field(default_factory=list)
+    blocks: list[BlockRecord] = field(default_factory=list)
+
+    _nested: ClassVar[dict[str, str]] = {"children": "ListItemRecord", "blocks": "BlockRecord"}
+
+
+@dataclass(slots=True, kw_only=True)
+class ListRecord(Record):
+    id: str
+    type: str
+    start_line: int | None
+    end_line: int | None
+    section_id: str | None
+    items: list[ListItemRecord]
+    items_count: int
+
+    _nested: ClassVar[dict[str, str]] = {"items": "ListItemRecord"}
+
+
+@dataclass(slots=True, kw_only=True)
+class TaskListRecord(ListRecord):
+    checked_count: int
+    unchecked_count: int
+    has_mixed_task_items: bool
+
+
+@dataclass(slots=True, kw_only=True)
+class BlockquoteRecord(Record):
+    content: str
+    start_line: int | None
+    end_line: int | None
+    section_id: str | None
+    children_summary: dict[str, int]
+    children_blocks: list[BlockRecord]
+
+    _nested: ClassVar[dict[str, str]] = {"children_blocks": "BlockRecord"}
+
+
+RECORD_TYPES_BY_NAME: dict[str, type[Record]] = {
+    cls.__name__: cls
+    for cls in (
+        SectionRecord,
+        HeadingRecord,
+        ParagraphRecord,
+        LinkRecord,
+        ImageRefRecord,
+        ImageRecord,
+        TableRecord,
+        CodeBlockRecord,
+        BlockRecord,
+        ListItemRecord,
+        ListRecord,
+        TaskListRecord,
+        BlockquoteRecord,
+    )
+}
+
+# Structure field -> record type of its items ("links" is special-cased)
+STRUCTURE_RECORD_TYPES: dict[str, type[Record]] = {
+    "sections": SectionRecord,
+    "headings": HeadingRecord,
+    "paragraphs": ParagraphRecord,
+    "images": ImageRecord,
+    "tables": TableRecord,
+    "code_blocks": CodeBlockRecord,
+    "lists": ListRecord,
+    "tasklists": TaskListRecord,
+    "blockquotes": BlockquoteRecord,
+}
+
+
+def _link_record(link: dict[str, Any]) -> Record:
+    if link.get("type") == "image":
+        return ImageRefRecord.from_dict(link)
+    return LinkRecord.from_dict(link)
+
+
+def to_records(structure: dict[str, Any]) -> dict[str, Any]:
+    """Convert the item lists of a parse() structure dict to records.
+
+    Fields without a record type (frontmatter, math, footnotes, HTML) are
+    kept as they are.
+
+    Args:
+        structure: result["structure"] from parse()
+
+    Returns:
+        New structure dict with record lists
+    """
+    out = dict(structure)
+    for name, items in structure.items():
+        if name == "links":
+            out[name] = [_link_record(link) for link in items]
+        elif name in STRUCTURE_RECORD_TYPES:
+            from_dict = STRUCTURE_RECORD_TYPES[name].from_dict
+            out[name] = [from_dict(item) for item in items]
+    return out
+
+
+def to_dicts(structure: dict[str, Any]) -> dict[str, Any]:
+    """Convert a records structure (see to_records) back to plain dicts."""
+    return {
+        name: [item.to_dict() for item in value]
+        if isinstance(value, list) and value and isinstance(value[0], Record)
+        else value
+        for name, value in structure.items()
+    }
@@ -5,7 +5,15 @@ This module extracts sections and headings from the markdown AST, including:
 - Heading hierarchy with parent relationships
 - Stable slug-based IDs for linking
 
+Both extractors read one shared heading index built from the token
+warehouse in a single O(H) pass: heading level, text and both slug
+sequences are computed once per heading.
+
+Classes:
+    HeadingEntry: One heading of the shared heading index
+
 Functions:
+    build_heading_index: Index all headings (levels, text, slugs) in one pass
     extract_sections: Extract document sections with preserved content
     extract_headings: Extract all headings with hierarchy
     slugify_base: Convert text to base slug format
@@ -13,15 +21,99 @@ Functions:
 
 import re
 import unicodedata
-from typing import Any
+from typing import Any, NamedTuple
+
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+
+_SLUG_SEPARATORS_RE = re.compile(r"[\s/]+")
+_SLUG_STRIP_RE = re.compile(r"[^\w-]")
+_SLUG_HYPHENS_RE = re.compile(r"-+")
+
+
+class HeadingEntry(NamedTuple):
+    """One heading of the shared heading index (document order).
+
+    Attributes:
+        line: Start line of the heading (None if unmapped)
+        level: Heading level
+        text: Heading text
+        section_slug: Stable slug among all headings (section IDs)
+        heading_slug: Stable slug among document-level headings (heading
+            IDs), or None for headings nested in lists/blockquotes
+    """
+
+    line: int | None
+    level: int
+    text: str
+    section_slug: str
+    heading_slug: str | None
+
+
+def _stable_slug(base_slug: str, slug_counts: dict[str, int]) -> str:
+    """Return base_slug, suffixed with its running count after the first use."""
+    count = slug_counts.get(base_slug)
+    if count is None:
+        slug_counts[base_slug] = 1
+        return base_slug
+    slug_counts[base_slug] = count + 1
+    return f"{base_slug}-{count + 1}"
+
+
+def build_heading_index(
+    warehouse: TokenWarehouse,
+    heading_level_func: Any,
+    inline_text_func: Any
+) -> list[HeadingEntry]:
+    """Index every heading of the document in one pass over heading tokens.
+
+    SECURITY: A heading is document-level only if a level-0 heading token
+    starts on its line; nested headings (list continuations, blockquotes)
+    get no heading slug, preventing heading creepage.
+
+    Args:
+        warehouse: Token index for the parsed document
+        heading_level_func: Function to get heading level from a heading_open token
+        inline_text_func: Function to get the text of an inline token
+
+    Returns:
+        List of HeadingEntry in document order
+    """
+    tokens = warehouse.tokens
+    heading_opens = warehouse.iter_by_type("heading_open")
+
+    # Start lines of document-level (level=0) headings
+    document_lines = {
+        tokens[idx].map[0] for idx in heading_opens if tokens[idx].level == 0 and tokens[idx].map
+    }
+
+    entries = []
+    section_slug_counts: dict[str, int] = {}
+    heading_slug_counts: dict[str, int] = {}
+    for idx in heading_opens:
+        token = tokens[idx]
+        close_idx = warehouse.range_for(idx)
+        if close_idx is None:
+            close_idx = idx + 2
+        text = "".join(
+            inline_text_func(tokens[i]) for i in range(idx + 1, close_idx) if tokens[i].type == "inline"
+        )
+        base_slug = slugify_base(text)
+        line = token.map[0] if token.map else None
+        entries.append(HeadingEntry(
+            line=line,
+            level=heading_level_func(token),
+            text=text,
+            section_slug=_stable_slug(base_slug, section_slug_counts),
+            heading_slug=(
+                _stable_slug(base_slug, heading_slug_counts) if line in document_lines else None
+            ),
+        ))
+    return entries
 
 
 def extract_sections(
-    tree: Any,
+    heading_index: list[HeadingEntry],
     lines: list[str],
-    process_tree_func: Any,
-    heading_level_func: Any,
-    get_text_func: Any,
     slice_lines_raw_func: Any,
     plain_text_in_range_func: Any,
     span_from_lines_func: Any,
@@ -33,11 +125,8 @@ def extract_sections(
     until the next heading of equal or higher level.
 
     Args:
-        tree: The markdown AST tree
+        heading_index: Result of build_heading_index
         lines: List of source lines
-        process_tree_func: Function to process tree nodes
-        heading_level_func: Function to get heading level from node
-        get_text_func: Function to extract text from node
         slice_lines_raw_func: Function to slice raw lines
         plain_text_in_range_func: Function to get plain text in range
         span_from_lines_func: Function to get character spans
@@ -50,76 +139,54 @@ def extract_sections(
     if cache and cache.get("sections") is not None:
         return cache["sections"]
 
-    sections = []
-    section_stack = []  # Track hierarchy
-    slug_counts = {}  # Track slug usage for stable IDs
-
-    def section_processor(node, ctx, level):
-        if node.type == "heading":
-            # Extract heading info
-            heading_level = heading_level_func(node)
-            heading_text = get_text_func(node)
-            base_slug = slugify_base(heading_text)
-
-            # Generate stable ID with running count
-            if base_slug in slug_counts:
-                slug_counts[base_slug] += 1
-                stable_slug = f"{base_slug}-{slug_counts[base_slug]}"
-            else:
-                slug_counts[base_slug] = 1
-                stable_slug = base_slug
-
-            stable_id = f"section_{stable_slug}"
-
-            # Create new section
-            start_line = node.map[0] if node.map else None
-            start_char, _ = (
-                span_from_lines_func(start_line, start_line)
-                if start_line is not None
-                else (None, None)
-            )
-
-            section = {
-                "id": stable_id,
-                "level": heading_level,
-                "title": heading_text,
-                "slug": stable_slug,
-                "start_line": start_line,
-                "end_line": None,  # Set when next section starts
-                "start_char": start_char,
-                "end_char": None,  # Set when section content is finalized
-                "parent_id": None,
-                "child_ids": [],
-            }
-
-            # Set end line of previous section at same or higher level
-            while ctx["stack"] and ctx["stack"][-1]["level"] >= heading_level:
-                prev = ctx["stack"].pop()
-                if prev["end_line"] is None:
-                    prev["end_line"] = section["start_line"] - 1
-
-            # Set parent relationship
-            if ctx["stack"]:
-                parent = ctx["stack"][-1]
-                section["parent_id"] = parent["id"]
-                parent["child_ids"].append(section["id"])
-
-            # Add to stack and results
-            ctx["stack"].append(section)
-            ctx["sections"].append(section)
-
-        return True  # Always continue traversing
-
-    context = {"sections": [], "stack": []}
-    process_tree_func(tree, section_processor, context)
+    result = []
+    stack = []  # Track hierarchy
+
+    for entry in heading_index:
+        heading_level = entry.level
+        stable_slug = entry.section_slug
+        start_line = entry.line
+        start_char, _ = (
+            span_from_lines_func(start_line, start_line)
+            if start_line is not None
+            else (None, None)
+        )
+
+        section = {
+            "id": f"section_{stable_slug}",
+            "level": heading_level,
+            "title": entry.text,
+            "slug": stable_slug,
+            "start_line": start_line,
+            "end_line": None,  # Set when next section starts
+            "start_char": start_char,
+            "end_char": None,  # Set when section content is finalized
+            "parent_id": None,
+            "child_ids": [],
+        }
+
+        # Set end line of previous section at same or higher level
+        while stack and stack[-1]["level"] >= heading_level:
+            prev = stack.pop()
+            if prev["end_line"] is None:
+                prev["end_line"] = section["start_line"] - 1
+
+        # Set parent relationship
+        if stack:
+            parent = stack[-1]
+            section["parent_id"] = parent["id"]
+            parent["child_ids"].append(section["id"])
+
+        stack.append(section)
+        result.append(section)
 
     # Set end lines for remaining sections
-    for section in context["stack"]:
+    for section in stack:
         if section["end_line"] is None:
             section["end_line"] = len(lines) - 1
 
     # Fill in section content from original lines
-    for section in context["sections"]:
+    for section in result:
         if section["start_line"] is not None and section["end_line"] is not None:
             start = section["start_line"]
             end = section["end_line"] + 1
@@ -136,17 +203,13 @@ def extract_sections(
 
     # Cache the result
     if cache is not None:
-        cache["sections"] = context["sections"]
+        cache["sections"] = result
 
-    return context["sections"]
+    return result
 
 
 def extract_headings(
-    tree: Any,
-    tokens: list[Any],
-    process_tree_func: Any,
-    heading_level_func: Any,
-    get_text_func: Any,
+    heading_index: list[HeadingEntry],
     span_from_lines_func: Any
 ) -> list[dict]:
     """Extract all headings with hierarchy using stable slug-based IDs.
@@ -155,11 +218,7 @@ def extract_headings(
     to prevent heading creepage vulnerabilities.
 
     Args:
-        tree: The markdown AST tree
-        tokens: List of markdown-it Token objects
-        process_tree_func: Function to process tree nodes
-        heading_level_func: Function to get heading level from node
-        get_text_func: Function to extract text from node
+        heading_index: Result of build_heading_index
         span_from_lines_func: Function to get character spans
 
     Returns:
@@ -167,77 +226,44 @@ def extract_headings(
     """
     headings = []
     heading_stack = []
-    slug_counts = {}  # Track slug usage for stable IDs
-
-    # First pass: collect heading tokens at document level (level=0)
-    # This prevents heading creepage from list continuations
-    heading_tokens = []
-    for token in tokens:
-        if token.type == "heading_open" and token.level == 0:
-            # This is a document-level heading, not nested
-            heading_tokens.append(token)
-
-    def heading_processor(node, ctx, level):
-        if node.type == "heading":
-            # SECURITY: Check if this heading corresponds to a document-level token
-            # by verifying its line mapping matches a level=0 heading token
-            is_document_level = False
-            if node.map:
-                for h_token in heading_tokens:
-                    if h_token.map and h_token.map[0] == node.map[0]:
-                        is_document_level = True
-                        break
-
-            if not is_document_level:
-                # Skip nested headings (security: prevent creepage)
-                return False
-
-            heading_level = heading_level_func(node)
-            heading_text = get_text_func(node)
-            base_slug = slugify_base(heading_text)
-
-            # Generate stable ID with running count
-            if base_slug in slug_counts:
-                slug_counts[base_slug] += 1
-                stable_slug = f"{base_slug}-{slug_counts[base_slug]}"
-            else:
-                slug_counts[base_slug] = 1
-                stable_slug = base_slug
-
-            stable_id = f"heading_{stable_slug}"
-
-            # Find parent heading
-            parent_id = None
-            while heading_stack and heading_stack[-1]["level"] >= heading_level:
-                heading_stack.pop()
-            if heading_stack:
-                parent_id = heading_stack[-1]["id"]
-
-            # Add character offsets for RAG chunking
-            line_num = node.map[0] if node.map else None
-            start_char, end_char = (
-                span_from_lines_func(line_num, line_num)
-                if line_num is not None
-                else (None, None)
-            )
-
-            heading = {
-                "id": stable_id,
-                "level": heading_level,
-                "text": heading_text,
-                "line": line_num,
-                "slug": stable_slug,
-                "parent_heading_id": parent_id,
-                "start_char": start_char,
-                "end_char": end_char,
-            }
-
-            ctx.append(heading)
-            heading_stack.append(heading)
 
-        return True
+    for entry in heading_index:
+        stable_slug = entry.heading_slug
+        if stable_slug is None:
+            # Skip nested headings (security: prevent creepage)
+            continue
+
+        heading_level = entry.level
+
+        # Find parent heading
+        parent_id = None
+        while heading_stack and heading_stack[-1]["level"] >= heading_level:
+            heading_stack.pop()
+        if heading_stack:
+            parent_id = heading_stack[-1]["id"]
+
+        # Add character offsets for RAG chunking
+        line_num = entry.line
+        start_char, end_char = (
+            span_from_lines_func(line_num, line_num)
+            if line_num is not None
+            else (None, None)
+        )
+
+        heading = {
+            "id": f"heading_{stable_slug}",
+            "level": heading_level,
+            "text": entry.text,
+            "line": line_num,
+            "slug": stable_slug,
+            "parent_heading_id": parent_id,
+            "start_char": start_char,
+            "end_char": end_char,
+        }
+
+        headings.append(heading)
+        heading_stack.append(heading)
 
-    process_tree_func(tree, heading_processor, headings)
     return headings
 
 
@@ -252,11 +278,11 @@ def slugify_base(text: str) -> str:
     """
     s = unicodedata.normalize("NFKD", text).lower()
     # First replace slashes and spaces with hyphens
-    s = re.sub(r"[\s/]+", "-", s)
+    s = _SLUG_SEPARATORS_RE.sub("-", s)
     # Then remove other non-word characters (but keep hyphens)
-    s = re.sub(r"[^\w-]", "", s).strip()
+    s = _SLUG_STRIP_RE.sub("", s).strip()
     # Clean up multiple hyphens
-    s = re.sub(r"-+", "-", s)
+    s = _SLUG_HYPHENS_RE.sub("-", s)
     # Remove leading/trailing hyphens
     s = s.strip("-")
     return s or "untitled"  # Fallback for empty slugs
@@ -9,16 +9,20 @@ This module extracts table structures from the markdown AST, including:
 
 Functions:
     extract_tables: Extract all tables with validation metadata
+    table_collector: Build a dispatch collector for tables
 """
 
 from typing import Any
 
+from doxstrux.markdown.utils.dispatch import NodeCollector
+
 
 def extract_tables(
     tree: Any,
     lines: list[str],
     process_tree_func: Any,
-    find_section_id_func: Any
+    find_section_id_func: Any,
+    slice_lines_raw_func: Any = None
 ) -> list[dict]:
     """Extract all tables with structure preserved and security validation.
 
@@ -27,11 +31,33 @@ def extract_tables(
         lines: List of source lines
         process_tree_func: Function to process tree nodes
         find_section_id_func: Function to find section ID for a line number
+        slice_lines_raw_func: Optional function returning the raw text of a
+            line range (default: join of lines)
 
     Returns:
         List of table dicts with headers, rows, alignment, and validation metadata
     """
-    tables = []
+    collector = table_collector(lines, find_section_id_func, slice_lines_raw_func)
+    process_tree_func(tree, collector.processor, collector.context)
+    return collector.finalize()
+
+
+def table_collector(
+    lines: list[str],
+    find_section_id_func: Any,
+    slice_lines_raw_func: Any = None
+) -> NodeCollector:
+    """Build a dispatch collector that extracts tables.
+
+    Args:
+        lines: List of source lines
+        find_section_id_func: Function to find section ID for a line number
+        slice_lines_raw_func: Optional function returning the raw text of a
+            line range (default: join of lines)
+
+    Returns:
+        NodeCollector routed to table nodes
+    """
 
     def table_processor(node, ctx, level):
         if node.type == "table":
@@ -41,7 +67,10 @@ def extract_tables(
             # Extract raw table content (preserve original markdown)
             raw_content = ""
             if start_line is not None and end_line is not None:
-                raw_content = "\n".join(lines[start_line:end_line])
+                if slice_lines_raw_func is not None:
+                    raw_content = slice_lines_raw_func(start_line, end_line)
+                else:
+                    raw_content = "\n".join(lines[start_line:end_line])
 
             table = {
                 "id": f"table_{len(ctx)}",
@@ -155,5 +184,4 @@ def extract_tables(
 
         return True
 
-    process_tree_func(tree, table_processor, tables)
-    return tables
+    return NodeCollector("tables", {"table"}, table_processor, [])
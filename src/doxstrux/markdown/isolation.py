@@ -0,0 +1,433 @@
+"""Isolated parsing in pre-forked worker processes with hard resource limits.
+
+The parser's own limits (content size, line and token counts) bound the
+input, not the work: a pathological document can still pin a CPU or grow
+memory for a long time. ``IsolatedParsePool`` runs ``parse()`` in
+long-lived worker processes and enforces budgets from outside the parse:
+
+- Wall-clock deadline: the caller waits on the worker's pipe with a
+  timeout and kills the worker when it expires. Works in any thread, unlike
+  SIGALRM-based timeouts.
+- Memory cap (Unix, via ``resource``): ``RLIMIT_AS`` is set per parse to
+  the worker's current address space plus the parse's budget. A parse
+  hitting it fails with MemoryError and the worker exits.
+- CPU backstop (Unix): ``RLIMIT_CPU`` is raised per parse to the CPU time
+  used so far plus the deadline, so a worker dies even if its caller does.
+
+A killed, crashed or exhausted worker is replaced by a fresh one, and the
+call raises ``MarkdownSecurityError`` whose ``content_info["isolation"]``
+is one of "timeout", "memory_limit", "cpu_limit" or "worker_crashed".
+Budgets come from ``config.ISOLATION_LIMITS`` for each parse's profile,
+unless the pool sets them explicitly.
+
+The pool is thread-safe: each call takes an idle worker, blocking while
+all are busy.
+
+Functions:
+    parse_isolated: Parse with the process-wide default pool
+
+Classes:
+    IsolatedParsePool: Pre-forked worker pool with deadlines and memory caps
+"""
+
+import atexit
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import Any, Literal
+
+try:
+    import resource
+except ImportError:  # Windows: deadlines only
+    resource = None
+
+from doxstrux.markdown import config as md_config
+from doxstrux.markdown import engines
+from doxstrux.markdown.exceptions import MarkdownSecurityError
+from doxstrux.markdown.ir import DocumentIR
+
+Output = Literal["dict", "ir"]
+
+# Seconds a new worker may take to start (import, warm engines, set limits)
+WORKER_START_TIMEOUT = 30.0
+
+_MB = 1024 * 1024
+
+
+def _address_space_bytes() -> int | None:
+    """Current virtual address space size of this process (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _set_soft_limit(kind: int, soft: int) -> None:
+    """Set a soft rlimit, clamped to the hard limit."""
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def _set_memory_budget(megabytes: int | None) -> None:
+    """Let this process's address space grow by megabytes more (None: no limit)."""
+    if resource is None:
+        return
+    if megabytes is None:
+        _set_soft_limit(resource.RLIMIT_AS, resource.RLIM_INFINITY)
+        return
+    current = _address_space_bytes()
+    if current is not None:
+        _set_soft_limit(resource.RLIMIT_AS, current + megabytes * _MB)
+
+
+def _set_cpu_budget(seconds: float | None) -> None:
+    """Let this process use seconds more CPU time (None: no limit)."""
+    if resource is None:
+        return
+    if seconds is None:
+        _set_soft_limit(resource.RLIMIT_CPU, resource.RLIM_INFINITY)
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _set_soft_limit(resource.RLIMIT_CPU, math.ceil(usage.ru_utime + usage.ru_stime + seconds))
+
+
+def _worker_main(conn: Any, profiles: tuple[str, ...]) -> None:
+    """Worker process loop: receive parse tasks, reply with results.
+
+    Replies are ("ok", result), ("error", exception) or ("memory_limit",
+    None); after a MemoryError the worker exits, as its heap may be unusable.
+    """
+    from doxstrux.markdown_parser_core import MarkdownParserCore
+
+    engines.warm_engines(profiles)
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        (content, profile, parser_config, include, output, source_id), cpu_seconds, memory_mb = task
+        _set_cpu_budget(cpu_seconds)
+        _set_memory_budget(memory_mb)
+        try:
+            parser = MarkdownParserCore(content, config=parser_config, security_profile=profile)
+            if output == "ir":
+                reply = ("ok", parser.to_ir(source_id=source_id))
+            else:
+                reply = ("ok", parser.parse(include=include))
+        except MemoryError:
+            reply = ("memory_limit", None)
+        except Exception as e:
+            reply = ("error", e)
+        parser = None
+        _set_memory_budget(None)
+        _set_cpu_budget(None)
+        try:
+            conn.send(reply)
+        except MemoryError:
+            os._exit(1)
+        except Exception as e:  # Unpicklable exception or result
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+        if reply[0] == "memory_limit":
+            return
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    __slots__ = ("process", "conn", "ready")
+
+    def __init__(self, ctx: Any, profiles: tuple[str, ...]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, profiles), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self) -> bool:
+        """Wait for the start-up message; False if the worker failed to start."""
+        if not self.ready:
+            try:
+                self.ready = self.conn.poll(WORKER_START_TIMEOUT) and self.conn.recv()[0] == "ready"
+            except (EOFError, OSError):
+                self.ready = False
+        return self.ready
+
+    def kill(self) -> None:
+        """Kill the process and release the pipe."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the process to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class IsolatedParsePool:
+    """Parse documents in pre-forked worker processes with hard budgets.
+
+    All workers start in the constructor. Each parse() takes an idle worker,
+    so up to ``workers`` parses run at once across threads.
+
+    Example:
+        >>> with IsolatedParsePool(workers=4, profile="strict") as pool:
+        ...     try:
+        ...         result = pool.parse(untrusted)
+        ...     except MarkdownSecurityError as e:
+        ...         log.warning("rejected: %s %s", e, e.content_info)
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        profile: str | None = None,
+        *,
+        config: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        max_memory_mb: int | None = None,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            workers: Worker processes (default: os.cpu_count())
+            profile: Default security profile (default: moderate)
+            config: Default parser config
+            timeout: Wall-clock deadline per parse in seconds (default:
+                config.ISOLATION_LIMITS of each parse's profile)
+            max_memory_mb: Address space a parse may grow a worker by, 0 for
+                no cap (default: config.ISOLATION_LIMITS of each parse's
+                profile)
+            mp_context: Optional multiprocessing context for the workers
+
+        Raises:
+            ValueError: If the profile is unknown or workers < 1
+        """
+        self.profile = profile or "moderate"
+        if self.profile not in md_config.ISOLATION_LIMITS:
+            raise ValueError(
+                f"Unknown security profile: {profile}. Available: {sorted(md_config.ISOLATION_LIMITS)}"
+            )
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError(f"workers must be >= 1, got {self.workers}")
+        self.config = config
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        # Parses completed, and parses stopped per isolation reason
+        self.stats = {"parses": 0, "timeout": 0, "memory_limit": 0, "cpu_limit": 0, "worker_crashed": 0}
+        self._ctx = mp_context or multiprocessing.get_context()
+        self._profiles = tuple(md_config.ISOLATION_LIMITS)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._all: set[_Worker] = set()
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+
+    def __enter__(self) -> "IsolatedParsePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def parse(
+        self,
+        content: str,
+        profile: str | None = None,
+        *,
+        config: dict[str, Any] | None = None,
+        include: set[str] | frozenset[str] | None = None,
+        output: Output = "dict",
+        source_id: str = "",
+        timeout: float | None = None,
+    ) -> dict[str, Any] | DocumentIR:
+        """Parse content in a worker, within the deadline and memory cap.
+
+        Args:
+            content: Markdown content
+            profile: Security profile (default: the pool profile)
+            config: Parser config (default: the pool config)
+            include: Optional parse(include=...) subset (output="dict" only)
+            output: "dict" for the parse() result, "ir" for to_ir()
+            source_id: Source identifier for output="ir"
+            timeout: Wall-clock deadline in seconds (default: the pool
+                timeout, else the profile's); waiting for an idle worker
+                does not count
+
+        Returns:
+            parse() result dict, or DocumentIR for output="ir"
+
+        Raises:
+            MarkdownSecurityError: If the content fails validation, or the
+                parse exceeded a budget or crashed its worker
+                (content_info["isolation"] says which)
+            ValueError: If output is not "dict" or "ir"
+            RuntimeError: If the pool is closed or a worker cannot start
+        """
+        if output not in ("dict", "ir"):
+            raise ValueError(f"output must be 'dict' or 'ir', got {output!r}")
+        if self._closed:
+            raise RuntimeError("IsolatedParsePool is closed")
+        profile = profile or self.profile
+        limits = md_config.ISOLATION_LIMITS.get(profile, md_config.ISOLATION_LIMITS[self.profile])
+        if timeout is None:
+            timeout = self.timeout if self.timeout is not None else limits["timeout_seconds"]
+        memory_mb = self.max_memory_mb if self.max_memory_mb is not None else limits["max_memory_mb"]
+        args = (
+            content,
+            profile,
+            config if config is not None else self.config,
+            frozenset(include) if include is not None else None,
+            output,
+            source_id,
+        )
+
+        worker = self._idle.get()
+        healthy = False
+        try:
+            if not worker.wait_ready():
+                raise RuntimeError(f"Isolated parse worker failed to start (exit code {worker.process.exitcode})")
+            try:
+                worker.conn.send((args, timeout + 1.0, memory_mb or None))
+                if worker.conn.poll(timeout):
+                    status, value = worker.conn.recv()
+                else:
+                    status, value = "timeout", None
+            except (EOFError, OSError):
+                worker.process.join()
+                status, value = self._crash_reason(worker.process.exitcode), None
+            if status in ("ok", "error"):
+                healthy = True
+                with self._lock:
+                    self.stats["parses"] += 1
+                if status == "error":
+                    raise value
+                return value
+            with self._lock:
+                self.stats[status] += 1
+            raise self._budget_error(status, profile, content, timeout, memory_mb, worker.process.exitcode)
+        finally:
+            if healthy:
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+
+    def close(self) -> None:
+        """Stop all workers. Parses still running are killed."""
+        with self._lock:
+            self._closed = True
+            workers, self._all = self._all, set()
+        for worker in workers:
+            worker.stop()
+
+    def _spawn(self) -> _Worker:
+        """Start a worker and track it."""
+        worker = _Worker(self._ctx, self._profiles)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a worker and put a fresh one in the idle queue (unless closed)."""
+        with self._lock:
+            self._all.discard(worker)
+        worker.kill()
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    @staticmethod
+    def _crash_reason(exitcode: int | None) -> str:
+        """Isolation reason for a worker that died mid-parse."""
+        if hasattr(signal, "SIGXCPU") and exitcode == -signal.SIGXCPU:
+            return "cpu_limit"
+        return "worker_crashed"
+
+    @staticmethod
+    def _budget_error(
+        reason: str, profile: str, content: str, timeout: float, memory_mb: int, exitcode: int | None
+    ) -> MarkdownSecurityError:
+        """Build the structured error for a parse stopped by isolation."""
+        messages = {
+            "timeout": f"Parse exceeded the {timeout}s deadline",
+            "memory_limit": f"Parse exceeded the {memory_mb} MB memory cap",
+            "cpu_limit": "Parse exceeded its CPU time limit",
+            "worker_crashed": f"Parse worker died (exit code {exitcode})",
+        }
+        return MarkdownSecurityError(
+            messages[reason],
+            security_profile=profile,
+            content_info={
+                "isolation": reason,
+                "timeout_seconds": timeout,
+                "max_memory_mb": memory_mb,
+                "exit_code": exitcode,
+                "content_length": len(content),
+            },
+        )
+
+
+_default_pool: IsolatedParsePool | None = None
+_default_lock = threading.Lock()
+
+
+def _close_default_pool() -> None:
+    global _default_pool
+    with _default_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.close()
+
+
+def parse_isolated(
+    content: str,
+    profile: str | None = None,
+    *,
+    config: dict[str, Any] | None = None,
+    include: set[str] | frozenset[str] | None = None,
+    output: Output = "dict",
+    source_id: str = "",
+    timeout: float | None = None,
+) -> dict[str, Any] | DocumentIR:
+    """Parse content with the process-wide default pool.
+
+    The pool (one worker per CPU) starts on first use and stops at
+    interpreter exit. Each parse gets the budgets of its profile from
+    config.ISOLATION_LIMITS. See IsolatedParsePool.parse() for arguments
+    and errors.
+
+    Example:
+        >>> result = parse_isolated(untrusted, "strict")
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = IsolatedParsePool()
+            atexit.register(_close_default_pool)
+        pool = _default_pool
+    return pool.parse(
+        content,
+        profile,
+        config=config,
+        include=include,
+        output=output,
+        source_id=source_id,
+        timeout=timeout,
+    )
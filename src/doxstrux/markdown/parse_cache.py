@@ -0,0 +1,313 @@
+"""Persistent, content-addressed cache of parse() results.
+
+Results are stored in a SQLite database keyed by
+(content SHA-256, security profile, parser config, parse subset, doxstrux
+version), so a hit returns the stored result without constructing a parser
+or running markdown-it. Entries are zlib-compressed pickles. The raw content
+and lines, which the caller already has, are stripped before storing and put
+back on load. The document string and its ``SourceLines`` are pickled as
+references, so ``content_mode="spans"`` views (``TextSpan``) are stored as
+offsets and rebound to the caller's content on load.
+
+Size is bounded: once the stored bytes exceed ``max_bytes``, the least
+recently used entries are evicted down to ``EVICT_TO`` (90%) of it, so the
+next puts do not evict again. Stored bytes are tracked as a running total per
+connection (read from the table when it is opened), not re-summed per put.
+
+Security: entries are pickles, and loading a pickle can run arbitrary code.
+Anyone who can write the cache file can therefore run code in every process
+that reads it. Keep the database in a directory only the parsing user can
+write, and never point a ParseCache at a file from an untrusted source.
+
+The cache can be shared by threads (one lock-protected connection) and by
+processes (each process opens its own connection; SQLite WAL handles
+concurrent writers). A ParseCache pickles as its path and limits, so it can
+be handed to ``parse_many`` workers.
+
+Note: the doxstrux version is part of the key. When running from a source
+checkout with local changes, clear the cache after changing extractors.
+
+Classes:
+    ParseCache: SQLite-backed LRU cache of parse() results
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+from doxstrux.markdown import __version__ as _PACKAGE_VERSION
+from doxstrux.markdown.utils.source_view import SourceLines
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+# Bump when the stored format or table layout changes (older tables are dropped)
+CACHE_FORMAT = 3
+
+# Persistent ids of the document string and its SourceLines in stored pickles
+_SOURCE_ID = "source"
+_LINES_ID = "lines"
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+EVICT_TO = 0.9  # Eviction low-water mark, as a fraction of max_bytes
+
+
+def _doxstrux_version() -> str:
+    """Installed distribution version, falling back to the package constant."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        return version("doxstrux")
+    except (ImportError, PackageNotFoundError):
+        return _PACKAGE_VERSION
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of the content, computed as in MarkdownParserCore.to_ir()."""
+    return hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+class _SourcePickler(pickle.Pickler):
+    """Pickle the document and its line view as references, not copies."""
+
+    def __init__(self, file: io.BytesIO, content: str):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.content = content
+
+    def persistent_id(self, obj: Any) -> str | None:
+        if isinstance(obj, str):
+            if len(obj) == len(self.content) and obj == self.content:
+                return _SOURCE_ID
+        elif isinstance(obj, SourceLines) and obj.source == self.content:
+            return _LINES_ID
+        return None
+
+
+class _SourceUnpickler(pickle.Unpickler):
+    """Resolve document references to the caller's content."""
+
+    def __init__(self, file: io.BytesIO, content: str):
+        super().__init__(file)
+        self.content = content
+        self.lines: SourceLines | None = None
+
+    def persistent_load(self, pid: str) -> Any:
+        if pid == _SOURCE_ID:
+            return self.content
+        if pid == _LINES_ID:
+            if self.lines is None:
+                self.lines = SourceLines(self.content)
+            return self.lines
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid!r}")
+
+
+class ParseCache:
+    """SQLite-backed LRU cache of parse() results.
+
+    The database file must be trusted: entries are unpickled on load, so
+    whoever can write it can run code in this process.
+
+    Example:
+        >>> cache = ParseCache("~/.cache/doxstrux/parse.sqlite", max_bytes=2 * 1024**3)
+        >>> result = cache.parse(content, profile="strict")   # Parses on miss
+        >>> result = cache.parse(content, profile="strict")   # No markdown-it
+        >>> cache.stats()
+        {'entries': 1, 'bytes': 2311, 'hits': 1, 'misses': 1}
+    """
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Upper bound on stored (compressed) result bytes
+        """
+        self.path = os.path.expanduser(os.fspath(path))
+        self.max_bytes = max_bytes
+        self.version = _doxstrux_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._approx_bytes = 0
+
+    # Pickle as (path, max_bytes): connections are per process
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"], state["max_bytes"])
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it on first use."""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_FORMAT:
+            # Entries of other formats can never hit; drop them with their layout
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(f"PRAGMA user_version = {CACHE_FORMAT}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+        self._approx_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def key(
+        self,
+        content: str,
+        profile: str | None = None,
+        config: dict[str, Any] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> str:
+        """Return the cache key for a parse request.
+
+        Args:
+            content: Markdown content
+            profile: Security profile (None means the parser default, moderate)
+            config: Parser config dict
+            include: Optional parse(include=...) subset
+
+        Returns:
+            Hex digest identifying (content, profile, config, include, version)
+        """
+        parts = [
+            CACHE_FORMAT,
+            content_hash(content),
+            profile or "moderate",
+            json.dumps(config or {}, sort_keys=True, default=repr),
+            sorted(include) if include is not None else None,
+            self.version,
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        content: str,
+        profile: str | None = None,
+        config: dict[str, Any] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> dict[str, Any] | None:
+        """Return the cached parse() result, or None on a miss."""
+        key = self.key(content, profile, config, include)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+
+        result = _SourceUnpickler(io.BytesIO(zlib.decompress(row[0])), content).load()
+        stored_content = result.get("content")
+        if stored_content is not None and stored_content["lines"] is None:
+            stored_content["lines"] = content.split("\n")
+        return result
+
+    def put(
+        self,
+        content: str,
+        result: dict[str, Any],
+        profile: str | None = None,
+        config: dict[str, Any] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> None:
+        """Store a parse() result, evicting LRU entries if over max_bytes."""
+        key = self.key(content, profile, config, include)
+        stored = dict(result)
+        if isinstance((stored.get("content") or {}).get("lines"), list):
+            # Line copies are split from the caller's content on load
+            stored["content"] = {**stored["content"], "lines": None}
+        buffer = io.BytesIO()
+        _SourcePickler(buffer, content).dump(stored)
+        blob = zlib.compress(buffer.getvalue())
+
+        with self._lock:
+            conn = self._connect()
+            replaced = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._approx_bytes += len(blob) - (replaced[0] if replaced else 0)
+            if self._approx_bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until under EVICT_TO * max_bytes."""
+        target = int(self.max_bytes * EVICT_TO)
+        total = self._approx_bytes
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        else:
+            total = 0  # Table emptied; drop any drift from other processes
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self._approx_bytes = max(total, 0)
+
+    def parse(
+        self,
+        content: str,
+        profile: str | None = None,
+        config: dict[str, Any] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return the cached result, or parse, store and return it.
+
+        Raises:
+            MarkdownSizeError, MarkdownSecurityError: As MarkdownParserCore
+                (failures are not cached)
+        """
+        include = frozenset(include) if include is not None else None
+        result = self.get(content, profile, config, include)
+        if result is None:
+            parser = MarkdownParserCore(content, config=config, security_profile=profile)
+            result = parser.parse(include=include)
+            self.put(content, result, profile, config, include)
+        return result
+
+    def clear(self) -> None:
+        """Delete all entries and reset statistics."""
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+            self._approx_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return entry count, stored bytes and this instance's hit/miss counts."""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
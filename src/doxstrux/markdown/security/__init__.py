@@ -5,6 +5,9 @@ Security validation and policy enforcement modules.
 
 Modules:
 - validators: Content validation functions (URL schemes, BiDi, confusables)
+- raw_scanner: Multi-pattern scanner for raw-content checks
+- prompt_injection: Keyword-anchored prompt injection matcher
+- unicode_scanner: Whole-document Unicode risk classification
 - policies: Security policy application (fail-closed approach)
 - unicode: Unicode security (BiDi controls, confusable characters)
 
@@ -0,0 +1,164 @@
+"""
+Prompt Injection - Keyword-anchored matcher for prompt injection phrases.
+
+Each pattern in PROMPT_INJECTION_PATTERNS starts with a literal keyword
+("ignore", "system", "act", ...). The matcher case-folds the text once, finds
+keyword occurrences with ``str.find`` and only then runs the (whitespace
+tolerant) pattern anchored at that position. Every character is visited by
+one ``find`` per keyword plus the anchored matches, so arbitrarily long text
+is scanned in linear time, without the old 1KB truncation.
+
+``scan_segments`` scans many texts (document, link texts, table cells, ...)
+in one call over a NUL-joined view and maps each hit back to its segment.
+NUL is neither whitespace nor a word character, so no phrase can span two
+segments.
+
+Classes:
+    InjectionHit: One phrase hit in a text
+    SegmentHit: One phrase hit mapped back to its source segment
+    PromptInjectionMatcher: Keyword-anchored multi-phrase matcher
+"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from doxstrux.markdown.security.raw_scanner import fold_case
+
+_KEYWORD_RE = re.compile(r"[a-z]+")
+_SEPARATOR = "\x00"
+
+
+class InjectionHit(NamedTuple):
+    """One prompt injection phrase found in a text.
+
+    Attributes:
+        pattern: Source of the matching regex
+        start: Offset of the match
+        end: Offset one past the match
+        text: Matched text
+    """
+
+    pattern: str
+    start: int
+    end: int
+    text: str
+
+
+class SegmentHit(NamedTuple):
+    """A hit mapped back to the segment it was found in.
+
+    Attributes:
+        segment: Index into the scanned segments
+        pattern: Source of the matching regex
+        start: Offset of the match within the segment text
+        end: Offset one past the match within the segment text
+        text: Matched text
+    """
+
+    segment: int
+    pattern: str
+    start: int
+    end: int
+    text: str
+
+
+class PromptInjectionMatcher:
+    """Keyword-anchored matcher over a fixed set of phrase regexes.
+
+    Example:
+        >>> matcher = PromptInjectionMatcher(PROMPT_INJECTION_PATTERNS)
+        >>> matcher.search("Please IGNORE   previous\\ninstructions.")
+        InjectionHit(pattern='ignore\\\\s+previous\\\\s+instructions?', start=7, end=37, ...)
+    """
+
+    def __init__(self, patterns: Iterable[re.Pattern]):
+        """
+        Args:
+            patterns: Compiled case-insensitive regexes, each starting with a
+                literal lowercase keyword
+
+        Raises:
+            ValueError: If a pattern does not start with a literal keyword
+        """
+        self.patterns = tuple(patterns)
+        self._by_keyword: dict[str, list[re.Pattern]] = {}
+        for pattern in self.patterns:
+            m = _KEYWORD_RE.match(pattern.pattern)
+            if not m:
+                raise ValueError(f"Pattern must start with a literal keyword: {pattern.pattern!r}")
+            self._by_keyword.setdefault(m.group(0), []).append(pattern)
+
+    def finditer(self, text: str) -> list[InjectionHit]:
+        """Return all hits in text, sorted by offset.
+
+        Hits of one pattern do not overlap; hits of different patterns may.
+
+        Args:
+            text: Text to scan (any length)
+
+        Returns:
+            List of InjectionHit
+        """
+        if not text:
+            return []
+
+        hits: list[InjectionHit] = []
+        folded = fold_case(text)
+        if len(folded) != len(text):
+            # Rare: lower() changed length (e.g. U+0130), keyword offsets would drift
+            for pattern in self.patterns:
+                hits.extend(
+                    InjectionHit(pattern.pattern, m.start(), m.end(), m.group(0))
+                    for m in pattern.finditer(text)
+                )
+            hits.sort(key=lambda h: h.start)
+            return hits
+
+        for keyword, patterns in self._by_keyword.items():
+            resume = dict.fromkeys(patterns, 0)  # Per-pattern end of last hit
+            pos = folded.find(keyword)
+            while pos != -1:
+                for pattern in patterns:
+                    if pos < resume[pattern]:
+                        continue
+                    m = pattern.match(text, pos)
+                    if m:
+                        hits.append(InjectionHit(pattern.pattern, pos, m.end(), m.group(0)))
+                        resume[pattern] = m.end()
+                pos = folded.find(keyword, pos + 1)
+
+        hits.sort(key=lambda h: h.start)
+        return hits
+
+    def search(self, text: str) -> InjectionHit | None:
+        """Return the first hit in text, or None."""
+        hits = self.finditer(text)
+        return hits[0] if hits else None
+
+    def scan_segments(self, segments: Sequence[str]) -> list[SegmentHit]:
+        """Scan many texts in one pass over their NUL-joined view.
+
+        Args:
+            segments: Texts to scan (None/empty entries are allowed)
+
+        Returns:
+            Hits sorted by segment, then by offset within the segment
+        """
+        texts = [s or "" for s in segments]
+        if not texts:
+            return []
+        starts = []
+        pos = 0
+        for text in texts:
+            starts.append(pos)
+            pos += len(text) + 1
+
+        hits = []
+        for hit in self.finditer(_SEPARATOR.join(texts)):
+            segment = bisect_right(starts, hit.start) - 1
+            base = starts[segment]
+            hits.append(SegmentHit(segment, hit.pattern, hit.start - base, hit.end - base, hit.text))
+        return hits
+
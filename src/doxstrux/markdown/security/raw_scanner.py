@@ -0,0 +1,259 @@
+"""
+Raw Scanner - Multi-pattern security scan of raw content.
+
+Security checks that run on the raw document (dangerous schemes, style-based
+JavaScript, frame-like tags, invisible/BiDi characters, ...) register their
+patterns with a RawScanner. One ``scan()`` call then reports every hit with
+its offset, instead of each check re-reading the content.
+
+Patterns are grouped by kind, because CPython's ``re`` has no multi-literal
+prefilter and a single alternation over all patterns is several times slower
+than the grouped scan:
+
+- literals: case-insensitive strings, found with ``str.find`` on one
+  case-folded copy of the content
+- patterns: regexes, each run with its own literal-prefix fast search
+- chars: single characters, all kinds merged into one character-class pass
+
+Functions:
+    fold_case: Lowercase text the way re.IGNORECASE compares ASCII letters
+
+Classes:
+    RawHit: One pattern hit (name, start, end, text)
+    RawScanner: Registry of named raw-content patterns
+"""
+
+import re
+from collections.abc import Iterable
+from typing import NamedTuple
+
+
+# Non-ASCII characters that re.IGNORECASE matches to an ASCII letter but that
+# str.lower() leaves alone (U+0130 changes length and is handled separately)
+_ASCII_FOLDS = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+
+def fold_case(text: str) -> str:
+    """Lowercase text so ASCII literals can be found as re.IGNORECASE would.
+
+    The result has the same length as ``text`` unless ``text.lower()``
+    changes length (U+0130); callers must check before mapping offsets.
+
+    Args:
+        text: Text to fold
+
+    Returns:
+        Lowercased text with dotless i and long s mapped to "i" and "s"
+    """
+    folded = text.lower()
+    if "\u0131" in folded or "\u017f" in folded:
+        folded = folded.translate(_ASCII_FOLDS)
+    return folded
+
+
+class RawHit(NamedTuple):
+    """One pattern hit in raw content.
+
+    Attributes:
+        name: Registered pattern name
+        start: Offset of the first matched character
+        end: Offset one past the last matched character
+        text: Matched text, as it appears in the content
+    """
+
+    name: str
+    start: int
+    end: int
+    text: str
+
+
+class RawScanner:
+    """Registry of named patterns scanned together over raw content.
+
+    Example:
+        >>> scanner = RawScanner()
+        >>> scanner.add_literal("js", "javascript:")
+        >>> scanner.add_pattern("frame", r"<(iframe|object|embed)[^>]*>")
+        >>> scanner.add_chars("nbsp", "\\xa0")
+        >>> scanner.first_hits("<IFRAME src=x> JavaScript:alert(1)")
+        {'frame': RawHit(name='frame', start=0, end=14, text='<IFRAME src=x>'),
+         'js': RawHit(name='js', start=15, end=26, text='JavaScript:')}
+    """
+
+    def __init__(self):
+        self._literals: dict[str, tuple[str, re.Pattern]] = {}
+        self._patterns: dict[str, re.Pattern] = {}
+        self._chars: dict[str, frozenset[str]] = {}
+        self._order: dict[str, int] = {}
+        self._char_res: dict[frozenset[str], re.Pattern] = {}
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Registered pattern names, in registration order."""
+        return tuple(self._order)
+
+    def _register(self, name: str) -> None:
+        if name in self._order:
+            raise ValueError(f"Pattern already registered: {name}")
+        self._order[name] = len(self._order)
+
+    def add_literal(self, name: str, text: str) -> None:
+        """Register a case-insensitive literal string.
+
+        Args:
+            name: Unique pattern name
+            text: Literal to find (matched case-insensitively)
+
+        Raises:
+            ValueError: If name is already registered or text is empty
+        """
+        if not text:
+            raise ValueError("Literal must not be empty")
+        self._register(name)
+        # Fallback for content whose lowercased form changes length
+        self._literals[name] = (text.lower(), re.compile(re.escape(text), re.IGNORECASE))
+
+    def add_pattern(self, name: str, pattern: str | re.Pattern) -> None:
+        """Register a regex.
+
+        Args:
+            name: Unique pattern name
+            pattern: Compiled regex, or a string compiled with re.IGNORECASE
+
+        Raises:
+            ValueError: If name is already registered
+        """
+        self._register(name)
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern, re.IGNORECASE)
+        self._patterns[name] = pattern
+
+    def add_chars(self, name: str, chars: Iterable[str]) -> None:
+        """Register a set of single characters.
+
+        Args:
+            name: Unique pattern name
+            chars: Characters to find (a string or iterable of 1-char strings)
+
+        Raises:
+            ValueError: If name is already registered or chars is empty
+        """
+        char_set = frozenset(chars)
+        if not char_set or any(len(c) != 1 for c in char_set):
+            raise ValueError("chars must be a non-empty set of single characters")
+        self._register(name)
+        self._chars[name] = char_set
+        self._char_res.clear()
+
+    def _char_re(self, names: list[str]) -> re.Pattern:
+        """Return the merged character-class regex for the given char kinds."""
+        chars = frozenset().union(*(self._chars[n] for n in names))
+        compiled = self._char_res.get(chars)
+        if compiled is None:
+            compiled = re.compile("[" + "".join(re.escape(c) for c in sorted(chars)) + "]")
+            self._char_res[chars] = compiled
+        return compiled
+
+    def scan(
+        self,
+        content: str,
+        names: Iterable[str] | None = None,
+        endpos: int | None = None,
+        first_only: bool = False,
+    ) -> list[RawHit]:
+        """Scan content for registered patterns.
+
+        Args:
+            content: Raw content
+            names: Pattern names to scan for (default: all)
+            endpos: Only report hits that end at or before this offset, as if
+                scanning ``content[:endpos]``
+            first_only: Report only the first hit of each pattern
+
+        Returns:
+            Hits sorted by start offset (ties in registration order)
+
+        Raises:
+            ValueError: If a name is not registered
+        """
+        if names is None:
+            wanted = list(self._order)
+        else:
+            wanted = list(dict.fromkeys(names))
+            unknown = [n for n in wanted if n not in self._order]
+            if unknown:
+                raise ValueError(f"Unknown raw scan pattern(s): {', '.join(unknown)}")
+
+        if endpos is None or endpos > len(content):
+            endpos = len(content)
+
+        hits: list[RawHit] = []
+
+        literal_names = [n for n in wanted if n in self._literals]
+        if literal_names:
+            window = content[:endpos]
+            folded = fold_case(window)
+            same_length = len(folded) == len(window)
+            for name in literal_names:
+                lowered, fallback = self._literals[name]
+                if not same_length:
+                    # Rare: lower() changed length (e.g. U+0130), offsets would drift
+                    for m in fallback.finditer(window):
+                        hits.append(RawHit(name, m.start(), m.end(), m.group(0)))
+                        if first_only:
+                            break
+                    continue
+                pos = folded.find(lowered)
+                while pos != -1:
+                    end = pos + len(lowered)
+                    hits.append(RawHit(name, pos, end, window[pos:end]))
+                    if first_only:
+                        break
+                    pos = folded.find(lowered, end)
+
+        for name in wanted:
+            pattern = self._patterns.get(name)
+            if pattern is None:
+                continue
+            if first_only:
+                m = pattern.search(content, 0, endpos)
+                if m:
+                    hits.append(RawHit(name, m.start(), m.end(), m.group(0)))
+            else:
+                for m in pattern.finditer(content, 0, endpos):
+                    hits.append(RawHit(name, m.start(), m.end(), m.group(0)))
+
+        char_names = [n for n in wanted if n in self._chars]
+        if char_names:
+            pending = set(char_names)
+            for m in self._char_re(char_names).finditer(content, 0, endpos):
+                char = m.group(0)
+                for name in char_names:
+                    if char in self._chars[name] and (not first_only or name in pending):
+                        hits.append(RawHit(name, m.start(), m.end(), char))
+                        pending.discard(name)
+                if first_only and not pending:
+                    break
+
+        order = self._order
+        hits.sort(key=lambda h: (h.start, order[h.name]))
+        return hits
+
+    def first_hits(
+        self,
+        content: str,
+        names: Iterable[str] | None = None,
+        endpos: int | None = None,
+    ) -> dict[str, RawHit]:
+        """Return the first hit of each pattern found.
+
+        Args:
+            content: Raw content
+            names: Pattern names to scan for (default: all)
+            endpos: Only consider ``content[:endpos]``
+
+        Returns:
+            Dict of pattern name -> first RawHit, in offset order; patterns
+            without a hit are absent
+        """
+        return {hit.name: hit for hit in self.scan(content, names, endpos, first_only=True)}
@@ -0,0 +1,159 @@
+"""
+Unicode Scanner - Whole-document Unicode risk classification.
+
+Classifies every distinct non-ASCII code point of a text once (confusable,
+Latin / other script, right-to-left, BiDi override, zero-width) and then
+locates the first character of each risk class. Work is proportional to the
+text for a few C-level passes (ASCII stripping, distinct code points, one
+search per risk class found) plus one ``unicodedata`` lookup per *distinct*
+character, so documents of any size are scanned in full:
+
+- Pure-ASCII text returns after ``str.isascii()``.
+- Code point classes are kept in a table shared by all scans, so each code
+  point is looked up in ``unicodedata`` once per process. The table holds at
+  most ``max_cached`` entries and is cleared when full, so texts built from
+  hundreds of thousands of distinct code points cannot grow it for good.
+
+Script detection keeps the historical heuristic: the "script" of a character
+is the first word of its Unicode name (``CYRILLIC``, ``GREEK``, ``LATIN``,
+...), and any ASCII character counts as Latin.
+
+Classes:
+    UnicodeRiskScanner: Code point classifier and whole-text scanner
+"""
+
+import re
+import unicodedata
+from array import array
+from collections.abc import Mapping
+
+# Code point class flags
+CONFUSABLE = 1
+LATIN = 2
+OTHER_SCRIPT = 4
+RTL = 8
+BIDI_OVERRIDE = 16
+ZERO_WIDTH = 32
+
+BIDI_OVERRIDE_CHARS = frozenset("\u202d\u202e")
+ZERO_WIDTH_CHARS = frozenset("\u200b\u200c\u200d")
+
+# First words of Unicode names that are not scripts (whitespace, typographic
+# variants, neutral characters); excluded from mixed-script detection
+NEUTRAL_NAME_WORDS = frozenset(
+    ("COMMON", "INHERITED", "NO-BREAK", "SPACE", "HYPHEN", "DASH", "FULLWIDTH", "HALFWIDTH")
+)
+
+# Result key for each flag, in report order
+_FLAG_KEYS = (
+    (BIDI_OVERRIDE, "has_bidi_override"),
+    (CONFUSABLE, "has_confusables"),
+    (OTHER_SCRIPT, "has_mixed_scripts"),
+    (RTL, "has_rtl"),
+    (ZERO_WIDTH, "has_zero_width"),
+)
+
+_ASCII_RUNS_RE = re.compile(r"[\x00-\x7f]+")
+
+# Class table bound; real text uses a few thousand distinct code points at most
+DEFAULT_MAX_CACHED = 16384
+
+
+class UnicodeRiskScanner:
+    """Classify code points and scan whole texts for Unicode risks.
+
+    Example:
+        >>> scanner = UnicodeRiskScanner(CONFUSABLES_EXTENDED)
+        >>> scanner.scan("p\u0430ypal")       # Cyrillic "а"
+        {'has_bidi_override': False, 'has_confusables': True,
+         'has_mixed_scripts': True, 'has_rtl': False, 'has_zero_width': False,
+         'offsets': {'has_confusables': 1, 'has_mixed_scripts': 1}}
+    """
+
+    def __init__(self, confusables: Mapping[str, str], max_cached: int = DEFAULT_MAX_CACHED):
+        """
+        Args:
+            confusables: Characters that look like Latin letters (char -> lookalike)
+            max_cached: Code point classes kept between lookups (0 disables the memo)
+        """
+        self.confusables = confusables
+        self.max_cached = max_cached
+        self._classes: dict[int, int] = {}
+
+    def char_class(self, cp: int) -> int:
+        """Return the class flags of a non-ASCII code point (memoized)."""
+        flags = self._classes.get(cp)
+        if flags is not None:
+            return flags
+
+        char = chr(cp)
+        flags = 0
+        if char in self.confusables:
+            flags |= CONFUSABLE
+        if char in BIDI_OVERRIDE_CHARS:
+            flags |= BIDI_OVERRIDE
+        if char in ZERO_WIDTH_CHARS:
+            flags |= ZERO_WIDTH
+        name = unicodedata.name(char, "")
+        if name:  # Unnamed code points have no script or bidi classification
+            script = name.split()[0]
+            if "LATIN" in script:
+                flags |= LATIN
+            elif script not in NEUTRAL_NAME_WORDS:
+                flags |= OTHER_SCRIPT
+            if unicodedata.bidirectional(char) in ("R", "AL"):
+                flags |= RTL
+
+        classes = self._classes
+        if len(classes) >= self.max_cached:
+            classes.clear()  # Bounded memory; common code points are re-learned quickly
+        if self.max_cached:
+            classes[cp] = flags
+        return flags
+
+    def scan(self, text: str) -> dict:
+        """Scan the whole text for Unicode risks.
+
+        Args:
+            text: Text to analyze (any length)
+
+        Returns:
+            dict with:
+            - has_bidi_override: bool (BiDi override characters present)
+            - has_confusables: bool (Latin lookalikes from other scripts)
+            - has_mixed_scripts: bool (Mixed scripts with Latin)
+            - has_rtl: bool (Right-to-left text present)
+            - has_zero_width: bool (Zero-width characters present)
+            - offsets: dict of the above key -> offset of the first offending
+              character, for each risk found
+        """
+        result = {key: False for _, key in _FLAG_KEYS}
+        result["offsets"] = {}
+        if text.isascii():
+            return result
+
+        non_ascii = _ASCII_RUNS_RE.sub("", text)
+        has_ascii = len(non_ascii) < len(text)
+        code_points = set(array("I", non_ascii.encode("utf-32-le", "surrogatepass")))
+
+        chars_by_flag: dict[int, list[str]] = {flag: [] for flag, _ in _FLAG_KEYS}
+        has_latin = has_ascii
+        char_class = self.char_class
+        for cp in code_points:
+            flags = char_class(cp)
+            if flags & LATIN:
+                has_latin = True
+            for flag, chars in chars_by_flag.items():
+                if flags & flag:
+                    chars.append(chr(cp))
+
+        if not has_latin:
+            chars_by_flag[OTHER_SCRIPT] = []  # Other scripts only matter next to Latin
+
+        for flag, key in _FLAG_KEYS:
+            chars = chars_by_flag[flag]
+            if chars:
+                result[key] = True
+                pattern = "[" + "".join(re.escape(c) for c in sorted(chars)) + "]"
+                result["offsets"][key] = re.search(pattern, text).start()
+        return result
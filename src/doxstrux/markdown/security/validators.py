@@ -8,10 +8,16 @@ because they operate on raw content, not parsed markdown structure.
 All functions tagged with: # REGEX RETAINED (§6 Security)
 """
 
+import posixpath
 import re
-import unicodedata
+import urllib.parse
 from typing import Any
 
+from doxstrux.markdown import config
+from doxstrux.markdown.security.prompt_injection import PromptInjectionMatcher
+from doxstrux.markdown.security.raw_scanner import RawScanner
+from doxstrux.markdown.security.unicode_scanner import UnicodeRiskScanner
+
 # ============================================================================
 # REGEX RETAINED (§6 Security) - Scheme Detection
 # ============================================================================
@@ -26,6 +32,7 @@ _DISALLOWED_SCHEMES_RAW_RE = re.compile(
 
 # Scheme extraction from URLs
 _URL_SCHEME_RE = re.compile(r"^([a-z][a-z0-9+.-]*):(?://)?", re.IGNORECASE)  # REGEX RETAINED (§6 Security)
+_DRIVE_LETTER_RE = re.compile(r"^[a-z]:[/\\]")  # REGEX RETAINED (§6 Security)
 
 
 # ============================================================================
@@ -41,9 +48,10 @@ _DATA_URI_RE = re.compile(r"^data:([^;,]+)?(;base64)?,(.*)$", re.IGNORECASE)  #
 # Constants - Allowed Schemes
 # ============================================================================
 
-ALLOWED_LINK_SCHEMES_STRICT = {"https"}
-ALLOWED_LINK_SCHEMES_MODERATE = {"http", "https", "mailto", "tel"}
-ALLOWED_LINK_SCHEMES_PERMISSIVE = {"http", "https", "mailto", "tel", "ftp"}
+# Defined in config.py with the security profiles
+ALLOWED_LINK_SCHEMES_STRICT = config.ALLOWED_LINK_SCHEMES_STRICT
+ALLOWED_LINK_SCHEMES_MODERATE = config.ALLOWED_LINK_SCHEMES_MODERATE
+ALLOWED_LINK_SCHEMES_PERMISSIVE = config.ALLOWED_LINK_SCHEMES_PERMISSIVE
 
 
 # ============================================================================
@@ -68,6 +76,9 @@ CONFUSABLES_EXTENDED = {
     "ⅵ": "vi", "ⅶ": "vii", "ⅷ": "viii", "ⅸ": "ix", "ⅹ": "x",
 }
 
+# Whole-document Unicode risk scanner (shared code point class table)
+UNICODE_SCANNER = UnicodeRiskScanner(CONFUSABLES_EXTENDED)
+
 
 # ============================================================================
 # Constants - Prompt Injection Patterns
@@ -86,6 +97,45 @@ PROMPT_INJECTION_PATTERNS = [
     re.compile(r"override\s+your\s+instructions?", re.IGNORECASE),  # REGEX RETAINED (§6 Security)
 ]
 
+# Keyword-anchored matcher over PROMPT_INJECTION_PATTERNS (full text, linear time)
+PROMPT_INJECTION_MATCHER = PromptInjectionMatcher(PROMPT_INJECTION_PATTERNS)
+
+
+# ============================================================================
+# Raw Content Scanner
+# ============================================================================
+# Shared multi-pattern scanner for raw-content checks. All patterns are
+# registered here (those defined in config.py included); callers run one scan
+# per document.
+
+RAW_SCANNER = RawScanner()
+
+# Dangerous schemes, in _DISALLOWED_SCHEMES_RAW_RE alternation order.
+# Each is registered as a case-insensitive literal named after the scheme.
+DISALLOWED_SCHEMES_RAW = ("javascript:", "file:", "vbscript:", "data:text/html")
+
+for _scheme in DISALLOWED_SCHEMES_RAW:
+    RAW_SCANNER.add_literal(_scheme, _scheme)
+
+# Quick malicious pattern scan (first 10KB): (scanner name, pattern, description)
+MALICIOUS_PATTERNS = [
+    ("script_tag", r"<script[^>]*>", "script tag"),
+    ("javascript:", r"javascript:", "javascript protocol"),
+    ("data:text/html", r"data:text/html", "HTML data URI"),
+    ("vbscript:", r"vbscript:", "vbscript protocol"),
+    ("event_handler", r"on\w+\s*=", "event handler"),
+]
+MALICIOUS_SCAN_BYTES = 10000
+
+RAW_SCANNER.add_pattern("script_tag", r"<script[^>]*>")  # REGEX RETAINED (§6 Security)
+RAW_SCANNER.add_pattern("event_handler", r"on\w+\s*=")  # REGEX RETAINED (§6 Security)
+RAW_SCANNER.add_chars("nbsp", "\xa0")
+RAW_SCANNER.add_chars("zero_width", "\u200b\u200c\u200d")
+RAW_SCANNER.add_pattern("style_js", config._STYLE_JS_PAT)
+RAW_SCANNER.add_pattern("meta_refresh", config._META_REFRESH_PAT)
+RAW_SCANNER.add_pattern("frame_like", config._FRAMELIKE_PAT)
+RAW_SCANNER.add_chars("bidi_control", config._BIDI_CONTROLS)
+
 
 # ============================================================================
 # Validator Functions
@@ -106,10 +156,11 @@ def scan_raw_for_disallowed_schemes(content: str) -> dict[str, Any]:
     Returns:
         dict with 'found' (bool) and 'match' (str or None)
     """
-    match = _DISALLOWED_SCHEMES_RAW_RE.search(content)
+    hits = RAW_SCANNER.first_hits(content, DISALLOWED_SCHEMES_RAW)
+    match = next(iter(hits.values()), None)
     return {
         "found": match is not None,
-        "match": match.group(0) if match else None
+        "match": match.text if match else None
     }
 
 
@@ -194,7 +245,7 @@ def parse_data_uri(uri: str) -> dict[str, Any]:
     }
 
 
-def detect_unicode_issues(content: str, max_scan_bytes: int = 10240) -> dict[str, Any]:
+def detect_unicode_issues(content: str, max_scan_bytes: int | None = None) -> dict[str, Any]:
     """
     Detect Unicode spoofing attempts including confusables and mixed scripts.
 
@@ -202,9 +253,12 @@ def detect_unicode_issues(content: str, max_scan_bytes: int = 10240) -> dict[str
     Rationale: Character-level analysis requires iterating over Unicode codepoints,
     checking character properties (script, category). Cannot be done with tokens.
 
+    The whole content is scanned: UNICODE_SCANNER classifies each distinct
+    code point once and returns immediately for pure-ASCII content.
+
     Args:
         content: Text content to analyze
-        max_scan_bytes: Maximum bytes to scan (performance limit)
+        max_scan_bytes: Optional limit on the characters scanned (default: all)
 
     Returns:
         dict with:
@@ -213,64 +267,22 @@ def detect_unicode_issues(content: str, max_scan_bytes: int = 10240) -> dict[str
         - has_mixed_scripts: bool (Mixed scripts with Latin)
         - has_rtl: bool (Right-to-left text present)
         - has_zero_width: bool (Zero-width characters present)
+        - offsets: dict of the above key -> offset of the first offending character
     """
-    issues = {
-        "has_bidi_override": False,
-        "has_confusables": False,
-        "has_mixed_scripts": False,
-        "has_rtl": False,
-        "has_zero_width": False,
-    }
-
-    # Limit scan size for performance
-    scan_content = content[:max_scan_bytes]
+    scan_content = content if max_scan_bytes is None else content[:max_scan_bytes]
 
     try:
-        # Quick byte-level checks first
-        if "\u202e" in scan_content or "\u202d" in scan_content:  # BiDi override
-            issues["has_bidi_override"] = True
-
-        if "\u200b" in scan_content or "\u200c" in scan_content or "\u200d" in scan_content:  # Zero-width
-            issues["has_zero_width"] = True
-
-        # Character-level analysis
-        scripts_seen = set()
-        has_latin = False
-
-        for char in scan_content:
-            # Skip ASCII for performance
-            if ord(char) < 128:
-                has_latin = True
-                continue
-
-            # Check for confusable characters
-            if char in CONFUSABLES_EXTENDED:
-                issues["has_confusables"] = True
-
-            # Script detection
-            try:
-                script = unicodedata.name(char, "").split()[0]
-                if "LATIN" in script:
-                    has_latin = True
-                # Exclude whitespace, typographic variants, and neutral scripts from spoofing detection
-                elif script and script not in ("COMMON", "INHERITED", "NO-BREAK", "SPACE", "HYPHEN", "DASH", "FULLWIDTH", "HALFWIDTH"):
-                    scripts_seen.add(script)
-
-                # RTL detection
-                if unicodedata.bidirectional(char) in ("R", "AL"):
-                    issues["has_rtl"] = True
-            except (ValueError, IndexError):
-                pass
-
-        # Mixed scripts with Latin (potential spoofing)
-        if has_latin and scripts_seen:
-            issues["has_mixed_scripts"] = True
-
+        return UNICODE_SCANNER.scan(scan_content)
     except Exception:
         # On any error, mark as having confusables (fail-closed)
-        issues["has_confusables"] = True
-
-    return issues
+        return {
+            "has_bidi_override": False,
+            "has_confusables": True,
+            "has_mixed_scripts": False,
+            "has_rtl": False,
+            "has_zero_width": False,
+            "offsets": {},
+        }
 
 
 def check_prompt_injection(text: str, timeout_seconds: float = 0.1) -> bool:
@@ -281,9 +293,12 @@ def check_prompt_injection(text: str, timeout_seconds: float = 0.1) -> bool:
     Rationale: Prompt injection detection requires pattern matching on content.
     These patterns describe semantic attack vectors, not markdown structure.
 
+    The whole text is checked (PROMPT_INJECTION_MATCHER is linear in its
+    length). To check many texts, use ``PROMPT_INJECTION_MATCHER.scan_segments``.
+
     Args:
         text: Text content to check
-        timeout_seconds: Timeout for regex matching (safety limit)
+        timeout_seconds: Unused, kept for backward compatibility
 
     Returns:
         bool: True if prompt injection patterns detected
@@ -291,18 +306,7 @@ def check_prompt_injection(text: str, timeout_seconds: float = 0.1) -> bool:
     if not text:
         return False
 
-    # Truncate for performance (only check first 1KB)
-    check_text = text[:1024]
-
-    try:
-        for pattern in PROMPT_INJECTION_PATTERNS:
-            if pattern.search(check_text):
-                return True
-    except Exception:
-        # On regex timeout or error, return False (fail-open for this check)
-        pass
-
-    return False
+    return PROMPT_INJECTION_MATCHER.search(text) is not None
 
 
 def classify_link_type(url: str) -> str:
@@ -338,3 +342,87 @@ def classify_link_type(url: str) -> str:
 
     # Relative paths
     return "relative"
+
+
+def check_path_traversal(url: str) -> bool:
+    """
+    Comprehensive path traversal detection.
+
+    # REGEX RETAINED (§6 Security)
+    Rationale: Windows drive letter detection; the remaining checks are
+    substring and normpath based.
+
+    Args:
+        url: URL or path to check
+
+    Returns:
+        True if path traversal detected, False otherwise
+    """
+    if not url:
+        return False
+
+    # URL decode first (handle multiple encoding levels)
+    decoded = url
+    for _ in range(3):  # Handle triple encoding
+        try:
+            prev = decoded
+            decoded = urllib.parse.unquote(decoded)
+            if prev == decoded:
+                break
+        except:
+            return True  # Suspicious if can't decode
+
+    # Convert to lowercase for pattern matching
+    decoded_lower = decoded.lower()
+
+    # Check for file:// scheme first (always suspicious in web context)
+    if decoded_lower.startswith("file://"):
+        return True
+
+    # Check multiple path traversal patterns
+    patterns = [
+        "../",
+        "..\\",  # Direct traversal
+        "..%2f",
+        "..%5c",  # Mixed encoding
+        "%2e%2e/",
+        "%2e%2e\\",  # Fully encoded
+        "%2e%2e%2f",
+        "%2e%2e%5c",  # Fully encoded variations
+        "%252e%252e",  # Double encoded
+        "..;",
+        "..//",  # Variations
+        "//",
+        "\\\\",  # UNC paths
+        "%5c%5c",  # Encoded UNC paths
+        "file://",
+        "file:\\",  # File protocol
+    ]
+
+    # Check for Windows drive letters
+    if _DRIVE_LETTER_RE.match(decoded_lower):
+        return True
+
+    for pattern in patterns:
+        if pattern in decoded_lower:
+            return True
+
+    # Normalize path and check
+    try:
+        # Use posixpath for consistent handling
+        normalized = posixpath.normpath(decoded)
+
+        # Check if path tries to escape
+        if normalized.startswith(".."):
+            return True
+        if "/../" in normalized or "/.." in normalized:
+            return True
+
+        # Check for absolute paths that might be suspicious
+        if normalized.startswith("/etc/") or normalized.startswith("/proc/"):
+            return True
+
+    except:
+        return True  # Suspicious if can't normalize
+
+    return False
@@ -0,0 +1,357 @@
+"""Streaming, section-by-section parsing of very large documents.
+
+``iter_sections`` reads a document line by line, cuts it into windows at
+safe top-level block boundaries and parses each window with its own
+``MarkdownParserCore``. Section ids, slugs, parents and line/character
+offsets are stitched across windows, and sections are yielded as soon as
+the next heading closes them. Memory is bounded by the window size (plus
+the largest single section), not by the document size, so documents above
+the profile size limits can be ingested; every window must still pass
+them.
+
+A window boundary is a blank line outside fenced code, multi-line HTML
+blocks (script/pre/style/textarea, comments, processing instructions,
+CDATA), ``$$`` math blocks and front matter, followed by a line that
+starts at column 0 and is not a list item (which could continue a loose
+list); see ``utils/block_boundaries.py``.
+
+Differences from ``parse()``: a streamed section covers its heading up to
+the next heading of any level (its own content; subsections are separate
+items linked by ``parent_id``), and reference-style link definitions and
+footnotes only resolve within their window.
+
+Functions:
+    iter_sections: Parse a file, path or line iterator section by section
+
+Classes:
+    StreamedSection: One section (or the preamble) with its structure items
+"""
+
+import io
+import os
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.extractors.sections import slugify_base
+from doxstrux.markdown.utils.block_boundaries import BoundaryScanner, is_safe_cut
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DEFAULT_WINDOW_LINES = 1000
+
+# Structure fields carried per section (items located by their start line)
+STREAMED_FIELDS = (
+    "paragraphs",
+    "lists",
+    "tasklists",
+    "tables",
+    "code_blocks",
+    "blockquotes",
+    "links",
+    "images",
+    "html_blocks",
+    "html_inline",
+)
+
+_LINE_KEYS = frozenset({"start_line", "end_line", "line"})
+_CHAR_KEYS = frozenset({"start_char", "end_char"})
+
+
+@dataclass
+class StreamedSection:
+    """One streamed section with the structure items of its own content.
+
+    Attributes:
+        section: Section dict like parse()["structure"]["sections"] items
+            (id, level, title, slug, parent_id, start/end line and char,
+            raw_content, text_content) with document-wide ids and offsets,
+            or None for the preamble before the first heading. end_line is
+            the line before the next heading of any level.
+        structure: STREAMED_FIELDS lists with the items located in this
+            section; line/char offsets are document-wide and section_id is
+            the streamed section id. Item ids are unique within a window.
+            The preamble also carries "frontmatter" when the document has one.
+        window: Index of the window the section starts in
+        security: metadata["security"] of that window
+    """
+
+    section: dict[str, Any] | None
+    structure: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    window: int = 0
+    security: dict[str, Any] = field(default_factory=dict)
+
+
+def _iter_lines(source: TextIO | str | os.PathLike | Iterable[str]) -> Iterator[str]:
+    """Yield document lines without their newline, like ``content.split("\\n")``."""
+    if isinstance(source, os.PathLike):
+        with open(source, encoding="utf-8") as f:
+            yield from _iter_lines(f)
+        return
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    ended_with_newline = False
+    seen = False
+    for line in source:
+        seen = True
+        if line.endswith("\n"):
+            ended_with_newline = True
+            line = line[:-1]
+        else:
+            ended_with_newline = False
+        yield line
+    if ended_with_newline or not seen:
+        # split("\n") yields a final empty line after a trailing newline
+        yield ""
+
+
+def _iter_windows(
+    lines: Iterator[str], window_lines: int, max_window_lines: int, profile: str
+) -> Iterator[list[str]]:
+    """Group lines into windows that end on a safe blank line.
+
+    A window is cut once it holds at least ``window_lines`` lines and its
+    last line is a safe boundary for the following line.
+
+    Raises:
+        MarkdownSizeError: If no safe boundary occurs within max_window_lines
+    """
+    scanner = BoundaryScanner()
+    window: list[str] = []
+    line_no = 0
+    for line in lines:
+        if (
+            len(window) >= window_lines
+            and not scanner.in_block
+            and is_safe_cut(window[-1], line)
+        ):
+            yield window
+            window = []
+        elif len(window) >= max_window_lines:
+            raise MarkdownSizeError(
+                f"No safe block boundary within {max_window_lines} lines "
+                f"(window starting near line {line_no - len(window)})",
+                profile,
+                {"lines": len(window), "limit": max_window_lines, "line": line_no},
+            )
+        scanner.feed(line, line_no)
+        window.append(line)
+        line_no += 1
+    if window:
+        yield window
+
+
+def _shift(value: Any, line_base: int, char_base: int, section_id: str | None) -> Any:
+    """Copy of an item with document-wide offsets and the streamed section id."""
+    if isinstance(value, dict):
+        shifted = {}
+        for key, v in value.items():
+            if key in _LINE_KEYS and isinstance(v, int):
+                v = v + line_base
+            elif key in _CHAR_KEYS and isinstance(v, int):
+                v = v + char_base
+            elif key == "section_id":
+                v = section_id
+            else:
+                v = _shift(v, line_base, char_base, section_id)
+            shifted[key] = v
+        return shifted
+    if isinstance(value, list):
+        return [_shift(v, line_base, char_base, section_id) for v in value]
+    return value
+
+
+def _item_line(item: dict[str, Any]) -> int | None:
+    line = item.get("start_line")
+    return item.get("line") if line is None else line
+
+
+class _Stitcher:
+    """Assemble streamed sections from consecutive window parses."""
+
+    def __init__(self) -> None:
+        self.current: StreamedSection | None = None
+        self.raw_parts: list[str] = []
+        self.text_parts: list[str] = []
+        self.heading_stack: list[tuple[int, str]] = []
+        self.slug_counts: dict[str, int] = {}
+
+    def _open(self, section: dict[str, Any] | None, window: int, security: dict[str, Any]) -> None:
+        self.current = StreamedSection(
+            section, {name: [] for name in STREAMED_FIELDS}, window, security
+        )
+        self.raw_parts = []
+        self.text_parts = []
+
+    def _close(self, end_line: int, end_char: int) -> StreamedSection | None:
+        """Finish the current section and return it (None if none is open)."""
+        current = self.current
+        self.current = None
+        if current is not None and current.section is not None:
+            current.section["end_line"] = end_line
+            current.section["end_char"] = end_char
+            current.section["raw_content"] = "\n".join(self.raw_parts)
+            current.section["text_content"] = "\n\n".join(t for t in self.text_parts if t)
+        elif current is not None and not (
+            "\n".join(self.raw_parts).strip() or any(current.structure.values())
+        ):
+            return None  # Empty preamble
+        return current
+
+    def _stable_id(self, title: str) -> tuple[str, str]:
+        """Document-wide stable (id, slug) for a section title."""
+        base_slug = slugify_base(title)
+        count = self.slug_counts.get(base_slug)
+        if count is None:
+            self.slug_counts[base_slug] = 1
+            slug = base_slug
+        else:
+            self.slug_counts[base_slug] = count + 1
+            slug = f"{base_slug}-{count + 1}"
+        return f"section_{slug}", slug
+
+    def add_window(
+        self,
+        parser: MarkdownParserCore,
+        result: dict[str, Any],
+        window: int,
+        line_base: int,
+        char_base: int,
+    ) -> list[StreamedSection]:
+        """Stitch one parsed window; return the sections it closes."""
+        structure = result["structure"]
+        security = result["metadata"].get("security", {})
+        line_count = len(parser.lines)
+
+        if self.current is None:
+            self._open(None, window, security)
+            if structure.get("frontmatter"):
+                self.current.structure["frontmatter"] = structure["frontmatter"]
+
+        heads = [s for s in structure["sections"] if s["start_line"] is not None]
+        starts = [s["start_line"] for s in heads]
+        stops = starts[1:] + [line_count]
+
+        # Content before the window's first heading continues the open section
+        self._add_range(parser, 0, starts[0] if starts else line_count)
+        carried = self.current
+        opened: list[StreamedSection] = []
+        closed: list[StreamedSection] = []
+
+        for head, start, stop in zip(heads, starts, stops):
+            heading_char = char_base + parser._line_start_offsets[start]
+            previous = self._close(line_base + start - 1, heading_char)
+            if previous is not None:
+                closed.append(previous)
+
+            level = head["level"]
+            while self.heading_stack and self.heading_stack[-1][0] >= level:
+                self.heading_stack.pop()
+            section_id, slug = self._stable_id(head["title"])
+            self._open({
+                "id": section_id,
+                "level": level,
+                "title": head["title"],
+                "slug": slug,
+                "start_line": line_base + start,
+                "end_line": None,  # Set when the next heading (or the end) arrives
+                "start_char": heading_char,
+                "end_char": None,
+                "parent_id": self.heading_stack[-1][1] if self.heading_stack else None,
+            }, window, security)
+            self.heading_stack.append((level, section_id))
+            self._add_range(parser, start, stop)
+            opened.append(self.current)
+
+        # Distribute items by start line over the carried and new sections
+        for name in STREAMED_FIELDS:
+            for item in structure.get(name) or ():
+                line = _item_line(item)
+                idx = bisect_right(starts, line) - 1 if line is not None else -1
+                target = carried if idx < 0 else opened[idx]
+                section_id = target.section["id"] if target.section else None
+                target.structure[name].append(_shift(item, line_base, char_base, section_id))
+
+        return closed
+
+    def _add_range(self, parser: MarkdownParserCore, start: int, stop: int) -> None:
+        """Append window lines [start, stop) to the current section's content."""
+        if stop <= start:
+            return
+        self.raw_parts.append(parser._slice_lines_raw(start, stop))
+        self.text_parts.append(parser._plain_text_in_range(start, stop - 1))
+
+    def finish(self, end_line: int, end_char: int) -> StreamedSection | None:
+        """Close the last section at the end of the document."""
+        return self._close(end_line, end_char)
+
+
+def iter_sections(
+    source: TextIO | str | os.PathLike | Iterable[str],
+    profile: str | None = None,
+    *,
+    config: dict[str, Any] | None = None,
+    window_lines: int = DEFAULT_WINDOW_LINES,
+    max_window_lines: int | None = None,
+) -> Iterator[StreamedSection]:
+    """Parse a document window by window, yielding sections in order.
+
+    Args:
+        source: Text file object, path (os.PathLike), iterable of lines (with
+            or without trailing newlines), or markdown str
+        profile: Security profile applied to every window (default: moderate)
+        config: Parser config passed to every window's MarkdownParserCore
+        window_lines: Minimum lines per window before cutting at the next
+            safe boundary
+        max_window_lines: Fail if a window grows this large without a safe
+            boundary (default: the profile's max_line_count)
+
+    Yields:
+        StreamedSection per section (and a leading preamble if the document
+        has content before its first heading)
+
+    Raises:
+        ValueError: If window_lines < 1 or max_window_lines < window_lines
+        MarkdownSizeError: If no safe boundary occurs within max_window_lines
+            lines, or a window exceeds the profile limits
+        MarkdownSecurityError: If a window fails security validation
+
+    Example:
+        >>> with open("CHANGELOG.md", encoding="utf-8") as f:
+        ...     for item in iter_sections(f, profile="permissive"):
+        ...         if item.section:
+        ...             index(item.section["id"], item.section["text_content"])
+    """
+    profile = profile or "moderate"
+    if profile not in MarkdownParserCore.SECURITY_LIMITS:
+        raise ValueError(
+            f"Unknown security profile: {profile}. "
+            f"Available: {sorted(MarkdownParserCore.SECURITY_LIMITS)}"
+        )
+    if max_window_lines is None:
+        max_window_lines = MarkdownParserCore.SECURITY_LIMITS[profile]["max_line_count"]
+    if window_lines < 1:
+        raise ValueError(f"window_lines must be >= 1, got {window_lines}")
+    if max_window_lines < window_lines:
+        raise ValueError(
+            f"max_window_lines ({max_window_lines}) must be >= window_lines ({window_lines})"
+        )
+
+    stitcher = _Stitcher()
+    line_base = 0
+    char_base = 0
+    for window, lines in enumerate(_iter_windows(
+        _iter_lines(source), window_lines, max_window_lines, profile
+    )):
+        content = "\n".join(lines)
+        parser = MarkdownParserCore(content, config=config, security_profile=profile)
+        yield from stitcher.add_window(parser, parser.parse(), window, line_base, char_base)
+        line_base += len(lines)
+        char_base += len(content) + 1
+
+    # char_base is one past the newline that would follow the last line
+    last = stitcher.finish(line_base - 1, char_base - 1)
+    if last is not None:
+        yield last
@@ -0,0 +1,82 @@
+"""Lazy, on-demand view of a parser's document structure.
+
+``parser.structure.links`` extracts links on first access and memoizes the
+result in the parser's ``_cache``; other structure kinds are never computed
+unless asked for.
+
+Values are the raw extractor output. Security policy enforcement (stripping
+HTML, dropping unsafe links/images) happens in ``parse()``; use
+``parse(include={...})`` for a policy-enforced subset.
+
+Classes:
+    LazyStructure: Attribute/mapping view that extracts fields on demand
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+
+class LazyStructure:
+    """Attribute/mapping view that extracts structure fields on demand.
+
+    Attributes:
+        fields: Field names available for this parser, in parse() order
+
+    Example:
+        >>> parser = MarkdownParserCore(content)
+        >>> parser.structure.links          # Only links are extracted
+        [{'url': 'https://...', ...}]
+        >>> parser.structure["headings"]
+        [...]
+        >>> parser.structure.to_dict(["links", "images"])
+        {'links': [...], 'images': [...]}
+    """
+
+    __slots__ = ("fields", "_resolve")
+
+    def __init__(self, fields: Iterable[str], resolve: Callable[[str], Any]):
+        """
+        Args:
+            fields: Available field names, in output order
+            resolve: Function(name) -> value that extracts and memoizes a field
+        """
+        self.fields = tuple(fields)
+        self._resolve = resolve
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self.fields:
+            raise AttributeError(f"Unknown structure field: {name}")
+        return self._resolve(name)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.fields:
+            raise KeyError(name)
+        return self._resolve(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __dir__(self) -> list[str]:
+        return [*self.fields, "fields", "keys", "to_dict"]
+
+    def keys(self) -> tuple[str, ...]:
+        """Return available field names."""
+        return self.fields
+
+    def to_dict(self, include: Iterable[str] | None = None) -> dict[str, Any]:
+        """Extract fields into a plain dict.
+
+        Args:
+            include: Field names to extract (default: all). Unknown names are ignored.
+
+        Returns:
+            Dict of field name -> value, in parse() order
+        """
+        wanted = self.fields if include is None else set(include)
+        return {name: self._resolve(name) for name in self.fields if name in wanted}
@@ -0,0 +1,189 @@
+"""Process-wide LRU cache of URL security verdicts.
+
+Every link and image URL is checked for its scheme, link type, path
+traversal and image kind/format. Documents in a corpus link to the same URLs
+over and over, so the analysis is done once per (URL, allowed schemes) and
+the immutable ``UrlVerdict`` is shared by every MarkdownParserCore in the
+process.
+
+The cache is bounded (least recently used verdicts are dropped) and
+thread-safe. URLs longer than ``MAX_CACHED_URL_LENGTH`` (typically data:
+URIs) are analyzed without being cached, so they never pin large strings.
+
+Functions:
+    image_metadata: Image kind and format of an image src
+    analyze_url: Compute a verdict without the cache
+    get_verdict: Return the cached verdict, computing it on a miss
+    clear_url_cache: Drop all cached verdicts
+    set_url_cache_size: Change the cache bound
+    url_cache_info: Cache statistics
+
+Classes:
+    UrlVerdict: Immutable analysis result for one URL
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from doxstrux.markdown.security import validators as security_validators
+
+DEFAULT_MAXSIZE = 4096
+MAX_CACHED_URL_LENGTH = 2048
+
+
+class UrlVerdict(NamedTuple):
+    """Security analysis of one URL under one set of allowed schemes.
+
+    Attributes:
+        scheme: Lowercased URL scheme, or None for relative/anchor URLs
+        allowed: Whether the scheme is allowed (schemeless URLs are allowed)
+        link_type: "absolute", "relative", "anchor" or "malformed"
+        path_traversal: Whether the URL contains a path traversal pattern
+        image_kind: "external", "local" or "data" (when used as an image src)
+        image_format: Image format from extension or data URI mediatype
+    """
+
+    scheme: str | None
+    allowed: bool
+    link_type: str
+    path_traversal: bool
+    image_kind: str
+    image_format: str
+
+
+_verdicts: "OrderedDict[tuple[str, frozenset[str]], UrlVerdict]" = OrderedDict()
+_lock = threading.Lock()
+_maxsize = DEFAULT_MAXSIZE
+_stats = {"hits": 0, "misses": 0}
+
+
+def image_metadata(src: str) -> dict[str, str]:
+    """Determine image_kind and format from src URL for consistent metadata.
+
+    Args:
+        src: Image source URL or path
+
+    Returns:
+        Dictionary with 'image_kind' and 'format' keys
+    """
+    # Determine image kind and parse data URIs
+    if src.startswith("data:"):
+        image_kind = "data"
+        data_info = security_validators.parse_data_uri(src)
+        # Extract format from mediatype (e.g., "image/png" → "png")
+        mediatype = data_info.get("mediatype", "")
+        format_type = mediatype.split("/")[1] if "/" in mediatype else "unknown"
+    elif src.startswith(("http://", "https://")):
+        image_kind = "external"
+        # Extract format from extension for external URIs
+        _, ext = os.path.splitext(src.lower())
+        format_type = ext.lstrip(".") if ext else "unknown"
+    else:
+        image_kind = "local"
+        # Extract format from extension for local paths
+        _, ext = os.path.splitext(src.lower())
+        format_type = ext.lstrip(".") if ext else "unknown"
+
+    return {"image_kind": image_kind, "format": format_type}
+
+
+def analyze_url(url: str, allowed_schemes: frozenset[str] | set[str]) -> UrlVerdict:
+    """Compute the verdict for a URL (uncached).
+
+    Args:
+        url: Link href or image src
+        allowed_schemes: Schemes allowed by the security profile
+
+    Returns:
+        UrlVerdict
+    """
+    scheme, allowed = security_validators.validate_link_scheme(url, allowed_schemes)
+    image = image_metadata(url)
+    return UrlVerdict(
+        scheme=scheme,
+        allowed=allowed,
+        link_type=security_validators.classify_link_type(url),
+        path_traversal=security_validators.check_path_traversal(url),
+        image_kind=image["image_kind"],
+        image_format=image["format"],
+    )
+
+
+def get_verdict(
+    url: str,
+    allowed_schemes: frozenset[str],
+    stats: dict[str, int] | None = None,
+) -> UrlVerdict:
+    """Return the verdict for a URL, analyzing it on a cache miss.
+
+    Args:
+        url: Link href or image src
+        allowed_schemes: Schemes allowed by the security profile (frozenset,
+            part of the cache key)
+        stats: Optional per-caller counter dict; its "hits"/"misses" are
+            incremented
+
+    Returns:
+        UrlVerdict
+    """
+    if len(url) > MAX_CACHED_URL_LENGTH:
+        if stats is not None:
+            stats["misses"] += 1
+        return analyze_url(url, allowed_schemes)
+
+    key = (url, allowed_schemes)
+    with _lock:
+        verdict = _verdicts.get(key)
+        if verdict is not None:
+            _verdicts.move_to_end(key)
+            _stats["hits"] += 1
+            if stats is not None:
+                stats["hits"] += 1
+            return verdict
+
+    verdict = analyze_url(url, allowed_schemes)
+    with _lock:
+        _stats["misses"] += 1
+        if stats is not None:
+            stats["misses"] += 1
+        _verdicts[key] = verdict
+        while len(_verdicts) > _maxsize:
+            _verdicts.popitem(last=False)
+    return verdict
+
+
+def clear_url_cache() -> None:
+    """Drop all cached verdicts and reset statistics."""
+    with _lock:
+        _verdicts.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+def set_url_cache_size(maxsize: int) -> None:
+    """Change the maximum number of cached verdicts.
+
+    Args:
+        maxsize: New bound (0 disables caching)
+
+    Raises:
+        ValueError: If maxsize is negative
+    """
+    global _maxsize
+    if maxsize < 0:
+        raise ValueError(f"maxsize must be >= 0, got {maxsize}")
+    with _lock:
+        _maxsize = maxsize
+        while len(_verdicts) > _maxsize:
+            _verdicts.popitem(last=False)
+
+
+def url_cache_info() -> dict[str, int]:
+    """Return cache statistics.
+
+    Returns:
+        Dict with size, maxsize, hits and misses (process-wide)
+    """
+    return {"size": len(_verdicts), "maxsize": _maxsize, "hits": _stats["hits"], "misses": _stats["misses"]}
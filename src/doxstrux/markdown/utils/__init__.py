@@ -7,6 +7,15 @@ Modules:
 - token_utils: Token traversal and manipulation (walk_tokens_iter, TokenAdapter)
 - line_utils: Line slicing and manipulation
 - text_utils: Text extraction from tokens
+- dispatch: Single-pass node dispatch to multiple extractors
+- token_warehouse: Token index (by type, pairs, parents, sections, fences) built once per parse
+- line_mappings: Array-backed line kind and section maps
+- section_index: Binary-search interval index for line -> section lookups
+- text_cache: Per-parse node text memo shared by the tree extractors
+- tree_walk: Iterative syntax tree walker (pre/post hooks, no depth limit)
+- source_view: Zero-copy line and span views of the source (content_mode="spans")
+- block_boundaries: Safe top-level cut points in raw lines (streaming, incremental)
+- incremental: Line diffing and token splicing for MarkdownParserCore.update()
 
 All utilities are stateless functions with clear interfaces.
 No dependencies on parser internals.
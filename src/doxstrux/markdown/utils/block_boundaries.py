@@ -0,0 +1,140 @@
+"""Safe top-level block boundaries in raw markdown lines.
+
+A document can be tokenized in pieces, each piece on its own, when it is cut
+where markdown-it's block state is clean: on a blank line outside blocks
+that may contain blank lines, before a line that cannot continue anything
+above it. Used by streaming (window cuts) and incremental re-parsing
+(re-tokenized regions).
+
+The blocks that may contain blank lines are fenced code, HTML blocks of
+CommonMark types 1-5 (script/pre/style/textarea, comments, processing
+instructions, declarations, CDATA), ``$$`` math blocks and front matter.
+After a blank line, a line at column 0 that is not a list item closes
+every open container (lists, blockquotes, indented code).
+
+Functions:
+    is_safe_cut: True if a piece may start at line after prev_line
+
+Classes:
+    BoundaryScanner: Line-by-line tracker of blocks that may contain blank lines
+"""
+
+import re
+
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_LIST_ITEM_RE = re.compile(r"^(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)")
+# HTML block types 1-5 (CommonMark): start pattern -> end marker
+_HTML_BLOCK_STARTS = (
+    (re.compile(r"^ {0,3}<(?:script|pre|style|textarea)(?:\s|>|$)", re.I),
+     re.compile(r"</(?:script|pre|style|textarea)>", re.I)),
+    (re.compile(r"^ {0,3}<!--"), re.compile(r"-->")),
+    (re.compile(r"^ {0,3}<\?"), re.compile(r"\?>")),
+    (re.compile(r"^ {0,3}<![A-Za-z]"), re.compile(r">")),
+    (re.compile(r"^ {0,3}<!\[CDATA\["), re.compile(r"\]\]>")),
+)
+
+
+def is_safe_cut(prev_line: str, line: str) -> bool:
+    """Return True if a piece may start at line, given the line before it.
+
+    prev_line must be blank, and line must start at column 0 and be
+    neither a list item (which could continue a loose list) nor ``---``
+    (which opens front matter at the start of a piece). The caller must
+    also check that no BoundaryScanner block is open.
+
+    Example:
+        >>> is_safe_cut("", "# Heading"), is_safe_cut("", "- item")
+        (True, False)
+    """
+    return (
+        not prev_line.strip()
+        and line[:1] not in ("", " ", "\t")
+        and not line.startswith("---")
+        and not _LIST_ITEM_RE.match(line)
+    )
+
+
+class BoundaryScanner:
+    """Track multi-line block state to find safe boundaries.
+
+    Feed every line of a piece in order, with its document line number
+    (front matter only opens at line 0). ``in_block`` is True while a block
+    that may contain blank lines is open.
+
+    Example:
+        >>> scanner = BoundaryScanner()
+        >>> for no, line in enumerate(["```", "", "```"]):
+        ...     scanner.feed(line, no)
+        >>> scanner.in_block
+        False
+    """
+
+    __slots__ = ("fence", "html_end", "math", "frontmatter", "after_frontmatter")
+
+    def __init__(self) -> None:
+        self.fence: tuple[str, int] | None = None
+        self.html_end: re.Pattern | None = None
+        self.math = False
+        self.frontmatter = False
+        # The front matter plugin only closes the block if a line follows it
+        self.after_frontmatter = False
+
+    def feed(self, line: str, line_no: int) -> None:
+        """Update the block state with one line."""
+        if self.frontmatter:
+            if line.rstrip() in ("---", "..."):
+                self.frontmatter = False
+                self.after_frontmatter = True
+            return
+        if self.after_frontmatter:
+            if not line.strip():
+                return
+            self.after_frontmatter = False
+        if line_no == 0 and line.rstrip() == "---":
+            self.frontmatter = True
+            return
+
+        if self.fence is not None:
+            char, length = self.fence
+            stripped = line.lstrip(" ")
+            if (
+                len(line) - len(stripped) <= 3
+                and stripped.startswith(char * length)
+                and not stripped.rstrip().strip(char)
+            ):
+                self.fence = None
+            return
+        if self.html_end is not None:
+            if self.html_end.search(line):
+                self.html_end = None
+            return
+        if self.math:
+            if "$$" in line:
+                self.math = False
+            return
+
+        m = _FENCE_RE.match(line)
+        if m:
+            marker = m.group(1)
+            self.fence = (marker[0], len(marker))
+            return
+        stripped = line.strip()
+        if stripped.startswith("$$"):
+            self.math = not (len(stripped) > 2 and stripped.endswith("$$"))
+            return
+        for start_re, end_re in _HTML_BLOCK_STARTS:
+            if start_re.match(line):
+                if not end_re.search(line, line.index("<") + 2):
+                    self.html_end = end_re
+                return
+
+    @property
+    def in_block(self) -> bool:
+        """True inside a block that may contain blank lines."""
+        return (
+            self.frontmatter
+            or self.after_frontmatter
+            or self.fence is not None
+            or self.html_end is not None
+            or self.math
+        )
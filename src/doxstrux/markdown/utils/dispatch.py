@@ -0,0 +1,145 @@
+"""Single-pass node dispatch for SyntaxTreeNode traversal.
+
+This module lets several extractors share one walk over the markdown-it
+syntax tree instead of each running its own full recursive traversal.
+Each extractor registers a collector with the node types it cares about;
+the dispatcher visits every node once and routes it only to interested
+collectors.
+
+Processors keep the ``process_tree`` contract: ``processor(node, ctx, level)``
+returns True to keep descending. Returning False prunes the subtree for that
+collector only - other collectors still see the descendants.
+
+Classes:
+    NodeCollector: Processor, context, and finalizer registered for node types
+    NodeDispatcher: Walk a tree once and route nodes to interested collectors
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+_NO_BLOCKED: frozenset[int] = frozenset()
+
+
+class NodeCollector:
+    """Extractor state registered with a NodeDispatcher.
+
+    Attributes:
+        name: Collector name (used as the result key)
+        types: Node types routed to the processor, or None for every node
+        processor: Function(node, context, level) -> bool (should recurse)
+        context: Mutable context object passed to the processor
+        finalize_func: Optional function(context) -> result run after the walk
+
+    Example:
+        >>> collector = NodeCollector("paras", {"paragraph"}, processor, [])
+        >>> dispatcher.register(collector)
+    """
+
+    __slots__ = ("name", "types", "processor", "context", "finalize_func")
+
+    def __init__(
+        self,
+        name: str,
+        types: Iterable[str] | None,
+        processor: Callable[[Any, Any, int], bool],
+        context: Any,
+        finalize: Callable[[Any], Any] | None = None,
+    ):
+        self.name = name
+        self.types = frozenset(types) if types is not None else None
+        self.processor = processor
+        self.context = context
+        self.finalize_func = finalize
+
+    def finalize(self) -> Any:
+        """Return the collector result (finalizer output, or the raw context)."""
+        if self.finalize_func is None:
+            return self.context
+        return self.finalize_func(self.context)
+
+
+class NodeDispatcher:
+    """Walk a syntax tree once and route each node to interested collectors.
+
+    Traversal is iterative pre-order DFS, matching the visiting order of
+    ``MarkdownParserCore.process_tree`` for every collector. With ``max_depth``
+    set, nodes deeper than it are skipped along with their subtrees; the
+    default walks the whole tree.
+
+    Example:
+        >>> dispatcher = NodeDispatcher()
+        >>> dispatcher.register(paragraph_collector(...))
+        >>> dispatcher.register(table_collector(...))
+        >>> results = dispatcher.run(tree)
+        >>> results["paragraphs"]
+    """
+
+    def __init__(self, max_depth: int | None = None):
+        self.max_depth = max_depth
+        self._collectors: list[NodeCollector] = []
+
+    def register(self, collector: NodeCollector) -> None:
+        """Register a collector. Dispatch order follows registration order."""
+        self._collectors.append(collector)
+
+    def _build_routing(self) -> tuple[dict[str, tuple[int, ...]], tuple[int, ...]]:
+        """Build node type -> collector indices routing table."""
+        wildcard = tuple(i for i, c in enumerate(self._collectors) if c.types is None)
+        all_types: set[str] = set()
+        for c in self._collectors:
+            if c.types is not None:
+                all_types.update(c.types)
+
+        routing = {}
+        for node_type in all_types:
+            routing[node_type] = tuple(
+                i
+                for i, c in enumerate(self._collectors)
+                if c.types is None or node_type in c.types
+            )
+        return routing, wildcard
+
+    def run(self, root: Any) -> dict[str, Any]:
+        """Walk the tree once, then finalize every collector.
+
+        Args:
+            root: Root SyntaxTreeNode
+
+        Returns:
+            Dict mapping collector name to its finalized result
+        """
+        collectors = self._collectors
+        if collectors:
+            routing, wildcard = self._build_routing()
+            processors = [c.processor for c in collectors]
+            contexts = [c.context for c in collectors]
+            max_depth = self.max_depth
+            total = len(collectors)
+
+            # Stack entries: (node, level, collectors pruned by an ancestor)
+            stack: list[tuple[Any, int, frozenset[int]]] = [(root, 0, _NO_BLOCKED)]
+            while stack:
+                node, level, blocked = stack.pop()
+                if max_depth is not None and level > max_depth:
+                    continue
+
+                pruned = None
+                for idx in routing.get(node.type, wildcard):
+                    if idx in blocked:
+                        continue
+                    if not processors[idx](node, contexts[idx], level):
+                        if pruned is None:
+                            pruned = set(blocked)
+                        pruned.add(idx)
+
+                child_blocked = blocked if pruned is None else frozenset(pruned)
+                if len(child_blocked) == total:
+                    continue
+
+                children = node.children
+                if children:
+                    for child in reversed(children):
+                        stack.append((child, level + 1, child_blocked))
+
+        return {c.name: c.finalize() for c in collectors}
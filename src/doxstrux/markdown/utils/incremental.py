@@ -0,0 +1,276 @@
+"""Line diffing and token splicing for incremental re-parsing.
+
+``MarkdownParserCore.update()`` re-tokenizes only the top-level blocks an
+edit touches. The changed lines are found by comparing the old and new text
+from both ends (slice comparisons, not a per-line loop), widened to old
+top-level block starts where markdown-it's block state is clean (see
+``block_boundaries``), tokenized on their own, and spliced between the
+untouched tokens, whose ``map`` line ranges are shifted by the line delta.
+
+Functions:
+    common_prefix_length: Length of the common prefix of two strings
+    common_suffix_length: Length of the common suffix of two strings
+    changed_line_range: Minimal line range covering the difference
+    top_level_blocks: Token index and start line of each top-level block
+    reparse_window: Widen a changed range to safe block boundaries
+    shift_maps: Shift token line maps by a line delta
+    first_block_at: Index of the first top-level token at or after a line
+    same_tokens: Compare token runs up to a line shift
+    splice_line_starts: Line start offsets after a line range was replaced
+    splice_blocks: Top-level block index after a block range was replaced
+
+Classes:
+    ReparseRange: Lines re-tokenized by an update
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+from doxstrux.markdown.utils.block_boundaries import BoundaryScanner, is_safe_cut
+
+
+class ReparseRange(NamedTuple):
+    """Lines re-tokenized by ``MarkdownParserCore.update()``.
+
+    Lines before start_line are unchanged. Old lines from old_end_line on
+    are new lines from new_end_line on (same text, shifted by
+    new_end_line - old_end_line).
+
+    Attributes:
+        start_line: First re-tokenized line (same in old and new content)
+        old_end_line: End (exclusive) of the replaced old lines
+        new_end_line: End (exclusive) of the re-tokenized new lines
+        full: True if the whole document was re-tokenized
+    """
+
+    start_line: int
+    old_end_line: int
+    new_end_line: int
+    full: bool
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of a and b.
+
+    Binary search over slice comparisons: O(n) character comparisons in C
+    and O(log n) Python steps.
+    """
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_length(a: str, b: str, limit: int | None = None) -> int:
+    """Return the length of the longest common suffix of a and b (at most limit)."""
+    len_a, len_b = len(a), len(b)
+    lo, hi = 0, min(len_a, len_b) if limit is None else min(len_a, len_b, limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len_a - mid : len_a - lo] == b[len_b - mid : len_b - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def changed_line_range(old: str, new: str) -> tuple[int, int, int]:
+    """Return the line range covering every difference between old and new.
+
+    Returns:
+        (start, old_end, new_end): old lines [start, old_end) were replaced
+        by new lines [start, new_end); both ranges hold at least one line,
+        and the lines after them are identical
+
+    Example:
+        >>> changed_line_range("a\\nb\\nc", "a\\nB\\nc")
+        (1, 2, 2)
+    """
+    prefix = common_prefix_length(old, new)
+    suffix = common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    start = old.count("\n", 0, prefix)
+    old_end = old.count("\n", 0, len(old) - suffix) + 1
+    new_end = new.count("\n", 0, len(new) - suffix) + 1
+    return start, old_end, new_end
+
+
+def top_level_blocks(tokens: Sequence[Any]) -> tuple[list[int], list[int]] | None:
+    """Return the token index and start line of every top-level block.
+
+    Returns:
+        (token_indices, start_lines), or None if a top-level token has no
+        line map (e.g. the footnote block appended by the footnote plugin)
+    """
+    indices: list[int] = []
+    lines: list[int] = []
+    for i, tok in enumerate(tokens):
+        if tok.level == 0 and tok.nesting >= 0:
+            if tok.map is None:
+                return None
+            indices.append(i)
+            lines.append(tok.map[0])
+    return indices, lines
+
+
+def reparse_window(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    block_lines: Sequence[int],
+    start: int,
+    old_end: int,
+    new_end: int,
+) -> tuple[int, int, int]:
+    """Widen a changed line range to block boundaries it can be re-tokenized at.
+
+    The window starts at the last old top-level block start at or before
+    start that is a safe cut in both old and new content (else line 0). It
+    ends at the first old block start at or after old_end that is a safe cut
+    in the new content with no block open in the new window lines (else the
+    end of the document). Tokens outside the window keep their meaning.
+
+    Args:
+        old_lines: Lines of the old content
+        new_lines: Lines of the new content
+        block_lines: Start lines of the old top-level blocks (ascending)
+        start, old_end, new_end: Range from changed_line_range()
+
+    Returns:
+        (start, old_end, new_end) of the window
+    """
+    i = bisect_right(block_lines, start) - 1
+    while i >= 0:
+        line = block_lines[i]
+        if line == 0 or (
+            is_safe_cut(old_lines[line - 1], old_lines[line])
+            and is_safe_cut(new_lines[line - 1], new_lines[line])
+        ):
+            break
+        i -= 1
+    window_start = block_lines[i] if i >= 0 else 0
+
+    delta = new_end - old_end
+    scanner = BoundaryScanner()
+    fed = window_start
+    for j in range(bisect_left(block_lines, old_end), len(block_lines)):
+        old_cut = block_lines[j]
+        new_cut = old_cut + delta
+        while fed < new_cut:
+            scanner.feed(new_lines[fed], fed)
+            fed += 1
+        if not scanner.in_block and is_safe_cut(new_lines[new_cut - 1], new_lines[new_cut]):
+            return window_start, old_cut, new_cut
+    return window_start, len(old_lines), len(new_lines)
+
+
+def shift_maps(tokens: Sequence[Any], delta: int) -> None:
+    """Shift the line map of every token by delta, in place.
+
+    Maps are replaced, not mutated: markdown-it shares one map list between
+    some tokens (e.g. table_open and its rows).
+    """
+    if not delta:
+        return
+    for tok in tokens:
+        m = tok.map
+        if m is not None:
+            tok.map = [m[0] + delta, m[1] + delta]
+
+
+def first_block_at(tokens: Sequence[Any], line: int) -> int:
+    """Return the index of the first top-level token starting at or after line (len if none)."""
+    for i, tok in enumerate(tokens):
+        if tok.level == 0 and tok.nesting >= 0 and tok.map is not None and tok.map[0] >= line:
+            return i
+    return len(tokens)
+
+
+def same_tokens(old: Sequence[Any], new: Sequence[Any], line_delta: int) -> bool:
+    """Return True if new equals old with every line map shifted by line_delta."""
+    if len(old) != len(new):
+        return False
+    for a, b in zip(old, new):
+        if a.map is None or b.map is None:
+            if a.map is not b.map:
+                return False
+        elif b.map[0] != a.map[0] + line_delta or b.map[1] != a.map[1] + line_delta:
+            return False
+        if (
+            a.type != b.type
+            or a.nesting != b.nesting
+            or a.level != b.level
+            or a.content != b.content
+            or a.markup != b.markup
+            or a.info != b.info
+            or a.attrs != b.attrs
+            or a.meta != b.meta
+            or a.hidden != b.hidden
+            or a.children != b.children
+        ):
+            return False
+    return True
+
+
+def splice_line_starts(
+    starts: Sequence[int],
+    content: str,
+    start: int,
+    old_end: int,
+    new_end: int,
+    char_delta: int,
+) -> Any:
+    """Return the line start offsets of content after a line range was replaced.
+
+    Args:
+        starts: Old line start offsets (list or array; the result has the same type)
+        content: New content
+        start, old_end, new_end: Range from changed_line_range() (or wider)
+        char_delta: len(new content) - len(old content)
+
+    Returns:
+        New line start offsets: the prefix kept, the changed lines scanned and
+        the suffix shifted by char_delta
+    """
+    spliced = starts[: start + 1]
+    pos = starts[start]
+    middle = []
+    for _ in range(new_end - start - 1):
+        pos = content.index("\n", pos) + 1
+        middle.append(pos)
+    spliced.extend(middle)
+    spliced.extend([offset + char_delta for offset in starts[old_end:]])
+    return spliced
+
+
+def splice_blocks(
+    blocks: tuple[list[int], list[int]],
+    block_start: int,
+    block_end: int,
+    region_blocks: tuple[list[int], list[int]],
+    tok_start: int,
+    tok_delta: int,
+    line_delta: int,
+) -> tuple[list[int], list[int]]:
+    """Return the top-level block index after blocks were re-tokenized.
+
+    Args:
+        blocks: Old top_level_blocks() result
+        block_start, block_end: Replaced block range
+        region_blocks: top_level_blocks() of the new region tokens (token
+            indices relative to the region, document line numbers)
+        tok_start: Token index of the region in the new token list
+        tok_delta: Change in token count
+        line_delta: Change in line count
+    """
+    indices, lines = blocks
+    region_indices, region_lines = region_blocks
+    return (
+        indices[:block_start]
+        + [tok_start + i for i in region_indices]
+        + [i + tok_delta for i in indices[block_end:]],
+        lines[:block_start] + region_lines + [line + line_delta for line in lines[block_end:]],
+    )
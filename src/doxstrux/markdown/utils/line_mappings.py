@@ -0,0 +1,185 @@
+"""Compact line-to-content mappings.
+
+Line classification is stored in flat arrays instead of per-line string-keyed
+dicts and membership-checked lists:
+
+    kinds: bytearray, one byte per line (LINE_PROSE or LINE_CODE)
+    section_index: array('i'), index into section_ids per line (-1 = none)
+    code_ranges: [(start, end)] half-open code line ranges, in block order
+
+The legacy ``{"line_to_type", "line_to_section", "prose_lines", "code_lines",
+"code_blocks"}`` dict shape is built by ``to_dict()`` in linear time (once per
+LineMappings). ``parse()`` calls it whenever the result includes "mappings",
+so the string-keyed dicts are allocated on every such parse; the two dicts
+share one key str per line.
+
+Classes:
+    LineMappings: Array-backed line kind and section maps
+"""
+
+from array import array
+from typing import Any
+
+LINE_PROSE = 0
+LINE_CODE = 1
+
+_KIND_NAMES = ("prose", "code")
+
+
+class LineMappings:
+    """Array-backed line kind and section maps.
+
+    Attributes:
+        line_count: Number of source lines
+        kinds: Line kind per line (LINE_PROSE / LINE_CODE)
+        section_index: Index into section_ids per line, -1 if outside sections
+        section_ids: Section ids in document order
+        code_ranges: Half-open (start, end) code line ranges in block order
+        code_blocks: Code blocks as {start_line, end_line (inclusive), language}
+
+    Example:
+        >>> lm = LineMappings(len(lines), sections)
+        >>> lm.add_code_block(3, 6, "python")
+        >>> lm.kind_of(4)
+        'code'
+        >>> lm.to_dict()["code_lines"]
+        [3, 4, 5]
+    """
+
+    __slots__ = (
+        "line_count", "kinds", "section_index", "section_ids",
+        "code_ranges", "code_blocks", "_dict",
+    )
+
+    def __init__(self, line_count: int, sections: list[dict[str, Any]]):
+        """Mark every line as prose and assign lines to sections.
+
+        Nested sections are assigned in document order, so a line ends up
+        mapped to the innermost section containing it.
+
+        Args:
+            line_count: Number of source lines
+            sections: Section dicts with id, start_line, end_line (inclusive)
+        """
+        self.line_count = line_count
+        self.kinds = bytearray(line_count)
+        self.section_index = array("i", [-1]) * line_count
+        self.section_ids: list[str] = []
+        self.code_ranges: list[tuple[int, int]] = []
+        self.code_blocks: list[dict[str, Any]] = []
+        self._dict: dict[str, Any] | None = None
+
+        section_index = self.section_index
+        for section in sections:
+            start, end = section["start_line"], section["end_line"]
+            if start is None or end is None:
+                continue
+            lo = max(start, 0)
+            hi = min(end + 1, line_count)
+            idx = len(self.section_ids)
+            self.section_ids.append(section["id"])
+            if lo < hi:
+                section_index[lo:hi] = array("i", [idx]) * (hi - lo)
+
+    def add_code_block(self, start: int, end: int, language: str | None) -> None:
+        """Mark lines ``start`` to ``end`` (exclusive) as code.
+
+        Args:
+            start: First code line (0-based)
+            end: Line after the block (markdown-it convention)
+            language: Code block language, if any
+        """
+        self._dict = None
+        self.code_blocks.append({
+            "start_line": start,
+            "end_line": end - 1,  # Inclusive, for backward compat
+            "language": language,
+        })
+        self.code_ranges.append((start, end))
+        lo = max(start, 0)
+        hi = min(end, self.line_count)
+        if lo < hi:
+            self.kinds[lo:hi] = b"\x01" * (hi - lo)
+
+    def kind_of(self, line_num: int) -> str | None:
+        """Return "prose" or "code" for a line, or None if out of range."""
+        if 0 <= line_num < self.line_count:
+            return _KIND_NAMES[self.kinds[line_num]]
+        return None
+
+    def section_id_of(self, line_num: int) -> str | None:
+        """Return the innermost section id containing a line, or None."""
+        if 0 <= line_num < self.line_count:
+            idx = self.section_index[line_num]
+            if idx >= 0:
+                return self.section_ids[idx]
+        return None
+
+    def prose_ranges(self) -> list[tuple[int, int]]:
+        """Return half-open (start, end) ranges of consecutive prose lines."""
+        ranges = []
+        kinds = self.kinds
+        pos = 0
+        n = self.line_count
+        while pos < n:
+            start = kinds.find(LINE_PROSE, pos)
+            if start < 0:
+                break
+            end = kinds.find(LINE_CODE, start)
+            if end < 0:
+                end = n
+            ranges.append((start, end))
+            pos = end
+        return ranges
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the legacy mappings dict (built once, then memoized).
+
+        Returns:
+            Dict with line_to_type, line_to_section, prose_lines, code_lines
+            and code_blocks, keyed by stringified line numbers
+        """
+        if self._dict is not None:
+            return self._dict
+
+        n = self.line_count
+        kinds = self.kinds
+        # One str per line, shared by both dicts
+        keys = [str(i) for i in range(n)]
+        line_to_type = dict(zip(keys, [_KIND_NAMES[k] for k in kinds]))
+
+        section_ids = self.section_ids
+        line_to_section = {
+            keys[i]: section_ids[idx]
+            for i, idx in enumerate(self.section_index)
+            if idx >= 0
+        }
+
+        prose_lines = [i for start, end in self.prose_ranges() for i in range(start, end)]
+
+        # Code lines in block order, first occurrence wins
+        code_lines = []
+        seen = bytearray(n)
+        extra_seen = set()
+        for start, end in self.code_ranges:
+            for ln in range(start, end):
+                if 0 <= ln < n:
+                    if seen[ln]:
+                        continue
+                    seen[ln] = 1
+                else:
+                    # Block reaching past the last line: keep legacy keys
+                    if ln in extra_seen:
+                        continue
+                    extra_seen.add(ln)
+                    line_to_type[str(ln)] = "code"
+                code_lines.append(ln)
+
+        self._dict = {
+            "line_to_type": line_to_type,
+            "line_to_section": line_to_section,
+            "prose_lines": prose_lines,
+            "code_lines": code_lines,
+            "code_blocks": self.code_blocks,
+        }
+        return self._dict
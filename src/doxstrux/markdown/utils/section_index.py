@@ -0,0 +1,97 @@
+"""Interval index over section line ranges.
+
+Sections produced by ``extract_sections`` are sorted by start line and
+laminar (any two are either nested or disjoint), so a binary search over
+start lines finds the innermost section containing a line; its enclosing
+sections follow from a precomputed parent chain.
+
+Classes:
+    SectionIndex: O(log N) line -> section lookups
+"""
+
+from bisect import bisect_right
+from typing import Any
+
+
+class SectionIndex:
+    """O(log N) line -> section lookups over extracted sections.
+
+    Attributes:
+        sections: The indexed section dicts (not copied)
+        starts: Section start lines (sorted)
+        ends: Section end lines (inclusive)
+        enclosing: Index of the nearest enclosing section, -1 at top level
+        outermost: Index of the top-level section enclosing each section
+        by_slug: Slug -> id of the first section with that slug
+
+    Example:
+        >>> index = SectionIndex(sections)
+        >>> index.innermost_id(12)
+        'section_installation'
+        >>> index.outermost_id(12)
+        'section_guide'
+    """
+
+    __slots__ = ("sections", "ids", "starts", "ends", "enclosing", "outermost", "by_slug")
+
+    def __init__(self, sections: list[dict[str, Any]]):
+        """Build the index.
+
+        Args:
+            sections: Section dicts with id, slug, start_line, end_line
+                (inclusive), in document order
+        """
+        self.sections = sections
+        self.ids: list[str] = []
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.enclosing: list[int] = []
+        self.outermost: list[int] = []
+        self.by_slug: dict[str, str] = {}
+
+        stack: list[int] = []
+        for section in sections:
+            slug = section.get("slug")
+            if slug is not None and slug not in self.by_slug:
+                self.by_slug[slug] = section["id"]
+
+            start, end = section.get("start_line"), section.get("end_line")
+            if start is None or end is None:
+                continue
+
+            while stack and self.ends[stack[-1]] < start:
+                stack.pop()
+            idx = len(self.ids)
+            parent = stack[-1] if stack else -1
+            self.ids.append(section["id"])
+            self.starts.append(start)
+            self.ends.append(end)
+            self.enclosing.append(parent)
+            self.outermost.append(self.outermost[parent] if parent >= 0 else idx)
+            stack.append(idx)
+
+    def innermost_index(self, line_num: int) -> int:
+        """Return the index of the innermost section containing a line, or -1."""
+        idx = bisect_right(self.starts, line_num) - 1
+        ends = self.ends
+        enclosing = self.enclosing
+        while idx >= 0 and ends[idx] < line_num:
+            idx = enclosing[idx]
+        return idx
+
+    def innermost_id(self, line_num: int) -> str | None:
+        """Return the id of the innermost section containing a line."""
+        idx = self.innermost_index(line_num)
+        return self.ids[idx] if idx >= 0 else None
+
+    def outermost_id(self, line_num: int) -> str | None:
+        """Return the id of the top-level section containing a line.
+
+        This is the first section in document order that contains the line.
+        """
+        idx = self.innermost_index(line_num)
+        return self.ids[self.outermost[idx]] if idx >= 0 else None
+
+    def id_for_slug(self, slug: str) -> str | None:
+        """Return the id of the first section with the given slug."""
+        return self.by_slug.get(slug)
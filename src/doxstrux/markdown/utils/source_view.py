@@ -0,0 +1,188 @@
+"""Zero-copy views of the source document.
+
+In ``content_mode="spans"`` the parser keeps the document as one string and
+indexes its line starts once. Lines and raw slices (section, table and HTML
+block ``raw_content``) are views into that buffer and are only copied when
+they are read.
+
+Classes:
+    SourceLines: Lazy ``list[str]``-like sequence of the document's lines
+    TextSpan: Lazy ``str``-like view of ``source[start:end]``
+
+Functions:
+    line_starts: Line start offsets of a str or bytes-like buffer (e.g. mmap)
+    materialize: Replace views in a parse() result by plain str/list values
+"""
+
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+_NEWLINE_RE = re.compile("\n")
+_NEWLINE_BYTES_RE = re.compile(b"\n")
+
+
+def line_starts(buffer: Any) -> array:
+    """Return the start offset of every line in buffer as ``array('q')``.
+
+    Works on str and on any bytes-like object, including an ``mmap``,
+    without copying it. Offsets are in the buffer's units (characters for
+    str, bytes otherwise); for ASCII text they coincide.
+
+    Example:
+        >>> list(line_starts(b"a\\nbc\\n"))
+        [0, 2, 5]
+    """
+    pattern = _NEWLINE_RE if isinstance(buffer, str) else _NEWLINE_BYTES_RE
+    starts = array("q", [0])
+    starts.extend(m.end() for m in pattern.finditer(buffer))
+    return starts
+
+
+class TextSpan:
+    """View of ``source[start:end]``, materialized on demand.
+
+    Compares equal to the str it stands for; ``str(span)`` returns it.
+
+    Example:
+        >>> span = TextSpan("# A\\n\\ntext", 0, 3)
+        >>> span == "# A", len(span), str(span)
+        (True, 3, '# A')
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source: str, start: int, end: int):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def text(self) -> str:
+        """The viewed text (a new str)."""
+        return self.source[self.start : self.end]
+
+    def __str__(self) -> str:
+        return self.source[self.start : self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, key: int | slice) -> str:
+        return self.text[key]
+
+    def __contains__(self, item: str) -> bool:
+        return self.source.find(item, self.start, self.end) != -1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TextSpan):
+            return len(self) == len(other) and self.text == other.text
+        if isinstance(other, str):
+            return len(self) == len(other) and self.source.startswith(other, self.start, self.end)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __repr__(self) -> str:
+        preview = self.source[self.start : min(self.end, self.start + 40)]
+        return f"TextSpan({self.start}, {self.end}, {preview!r})"
+
+
+class SourceLines(Sequence[str]):
+    """The document's lines as a lazy sequence over one source string.
+
+    Behaves like ``source.split("\\n")`` (same length, indexing, slicing to a
+    list, iteration) but stores only the line start offsets (8 bytes per line)
+    and builds each line string when it is accessed.
+
+    Attributes:
+        source: The document
+        starts: Character offset of each line start (``array('q')``)
+    """
+
+    __slots__ = ("source", "starts")
+
+    def __init__(self, source: str, starts: array | None = None):
+        """Index the lines of source.
+
+        Args:
+            source: The document
+            starts: Precomputed line_starts(source), e.g. scanned from the
+                mapped file of an ASCII document (not validated)
+        """
+        self.source = source
+        self.starts = starts if starts is not None else line_starts(source)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_end(self, index: int) -> int:
+        """Offset one past the last character of line ``index`` (before its newline)."""
+        if index + 1 < len(self.starts):
+            return self.starts[index + 1] - 1
+        return len(self.source)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        n = len(self.starts)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self.source[self.starts[start] : self.line_end(stop - 1)].split("\n")
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("line index out of range")
+        return self.source[self.starts[index] : self.line_end(index)]
+
+    def __iter__(self) -> Iterator[str]:
+        source, starts = self.source, self.starts
+        for i in range(len(starts)):
+            yield source[starts[i] : self.line_end(i)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SourceLines):
+            return self.source == other.source
+        if isinstance(other, list):
+            return len(other) == len(self) and list(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.source)
+
+    def __repr__(self) -> str:
+        return f"SourceLines({len(self)} lines)"
+
+    def span(self, start_line: int | None, end_line: int | None) -> TextSpan:
+        """View of the lines in [start_line, end_line) joined by newlines.
+
+        Same bounds handling as ``line_utils.slice_lines_raw`` (markdown-it
+        convention: end_line is the first line after the content).
+        """
+        n = len(self.starts)
+        if start_line is None or end_line is None or start_line < 0 or start_line >= n or end_line <= start_line:
+            return TextSpan(self.source, 0, 0)
+        return TextSpan(self.source, self.starts[start_line], self.line_end(min(end_line, n) - 1))
+
+
+def materialize(value: Any) -> Any:
+    """Return value with every TextSpan / SourceLines replaced by str / list.
+
+    Recurses into dicts, lists and tuples; other values are returned as is.
+    Use it before JSON serialization of a ``content_mode="spans"`` result.
+    """
+    if isinstance(value, TextSpan):
+        return value.text
+    if isinstance(value, SourceLines):
+        return list(value)
+    if isinstance(value, dict):
+        return {k: materialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [materialize(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(materialize(v) for v in value)
+    return value
@@ -0,0 +1,167 @@
+"""Per-parse memo of syntax tree node text.
+
+Several extractors textify the same nodes: headings are read by both
+``extract_sections`` and ``extract_headings``, blockquote and footnote text
+contains paragraphs and list items that other extractors also read.
+``NodeTextCache`` textifies each inline token once, straight from its flat
+child token list, and builds block text by joining the cached text of the
+inline tokens below the block, so each inline subtree is textified once per
+parse however many extractors ask.
+
+Text is identical to ``text_utils.node_text``. Nodes are keyed by identity,
+so a cache belongs to one SyntaxTreeNode tree and must not outlive it; when
+subtrees are replaced (incremental re-parse), ``discard`` drops their entries.
+
+Classes:
+    NodeTextCache: Identity-keyed node text memo
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+from doxstrux.markdown.utils.text_utils import node_text
+
+
+def _inline_text(tokens: list[Any]) -> str:
+    """Text of an inline token's children (flat token list, see node_text)."""
+    parts = []
+    for tok in tokens:
+        t = tok.type
+        if t == "text" or t == "code_inline":
+            if tok.content:
+                parts.append(tok.content)
+        elif t == "softbreak" or t == "hardbreak":
+            parts.append("\n")
+        elif t == "image":
+            # Prefer token.content (canonical alt text), fall back to attrGet('alt')
+            try:
+                alt = getattr(tok, "content", "") or tok.attrGet("alt") or ""
+            except Exception:
+                alt = ""
+            if alt:
+                parts.append(alt)
+            if tok.children:
+                parts.append(_inline_text(tok.children))
+    return "".join(parts)
+
+
+class NodeTextCache:
+    """Memoized node text for one syntax tree.
+
+    Inline nodes are textified from their token's children, without walking
+    the inline SyntaxTreeNode subtree. Block nodes (root, paragraphs,
+    headings, blockquotes, list items, ...) walk down to their inline nodes
+    and join those, reusing inline and block text cached by earlier calls.
+    Nodes inside inline content (em, link, text, ...) fall back to node_text
+    uncached.
+
+    Attributes:
+        texts: id(node) -> text for block nodes, id(token) for inline tokens
+        hits: Cached texts reused (directly or while joining a block)
+
+    Example:
+        >>> cache = NodeTextCache()
+        >>> cache.text(heading_node)
+        'Install'
+        >>> cache.text(heading_node.children[0])  # Inline child: filled already
+        'Install'
+    """
+
+    __slots__ = ("texts", "hits")
+
+    def __init__(self) -> None:
+        self.texts: dict[int, str] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def seed(self, node: Any, text: str) -> None:
+        """Record text already computed for a node (e.g. by paragraph_features)."""
+        self.texts[id(node)] = text
+
+    def discard(self, subtrees: Iterable[Any], ancestors: Iterable[Any] = ()) -> None:
+        """Forget the text of replaced subtrees and of ancestors that contained them.
+
+        Needed before the nodes are dropped: their ids may be reused by new
+        nodes. Text of untouched subtrees stays valid, as it does not depend
+        on position.
+        """
+        texts = self.texts
+        for node in ancestors:
+            texts.pop(id(node), None)
+        stack = list(subtrees)
+        while stack:
+            node = stack.pop()
+            texts.pop(id(node), None)
+            if node.token is not None:
+                texts.pop(id(node.token), None)
+            stack.extend(node.children)
+
+    def token_text(self, token: Any) -> str:
+        """Return the text of an ``inline`` token, textifying it once.
+
+        Inline nodes share the entry of their token, so token-based callers
+        (the heading index) and node-based callers hit the same cache.
+        """
+        texts = self.texts
+        key = id(token)
+        cached = texts.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        text = texts[key] = _inline_text(token.children or ())
+        return text
+
+    def text(self, node: Any) -> str:
+        """Return the node's text, filling the cache on first request.
+
+        Args:
+            node: markdown-it SyntaxTreeNode of the cached tree
+
+        Returns:
+            Concatenated text (breaks as newlines, image alt text included)
+        """
+        texts = self.texts
+        key = id(node)
+        cached = texts.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        tok = node.token
+        if tok is not None:
+            if tok.type != "inline":
+                # Inside inline content, or a leaf block (fence, hr, html_block)
+                return node_text(node)
+            return self.token_text(tok)
+        nester = node.nester_tokens
+        if nester is not None and not nester.opening.block:
+            # Inline container (em, strong, link, ...)
+            return node_text(node)
+
+        parts = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            n_key = id(n)
+            cached = texts.get(n_key)
+            if cached is not None:
+                self.hits += 1
+                parts.append(cached)
+                continue
+            tok = n.token
+            if tok is None:
+                children = n.children
+                if children:
+                    stack.extend(reversed(children))
+            elif tok.type == "inline":
+                tok_key = id(tok)
+                inline = texts.get(tok_key)
+                if inline is None:
+                    inline = texts[tok_key] = _inline_text(tok.children or ())
+                else:
+                    self.hits += 1
+                parts.append(inline)
+        text = texts[key] = "".join(parts)
+        return text
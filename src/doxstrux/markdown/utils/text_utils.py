@@ -5,10 +5,15 @@ token trees, handling inline formatting, and checking token structure.
 
 Functions:
     collect_text_segments: Collect text segments from token stream with line ranges
+    index_text_segments: Build a bisect index over text segments
+    segments_in_range: Return segments overlapping a line range via the index
     extract_text_from_inline: Extract plain text from inline token children
+    node_text: Plain text of a syntax tree node (breaks and image alt included)
+    paragraph_features: Text, word count and inline flags of a node in one walk
     has_child_type: Check if token has children of specified type(s)
 """
 
+from bisect import bisect_right
 from typing import Any
 
 
@@ -72,6 +77,79 @@ def collect_text_segments(tokens: list[Any]) -> list[tuple[int, int, str]]:
     return segs
 
 
+def index_text_segments(
+    segments: list[tuple[int, int, str]]
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    Build a range-query index over text segments.
+
+    Segments are usually in start-line order, but not always (e.g. footnote
+    definitions are emitted at the end of the token stream), so the index
+    keeps its own sorted order.
+
+    Args:
+        segments: Segments from collect_text_segments (document order)
+
+    Returns:
+        Tuple (order, starts, max_ends): segment positions sorted by start
+        line, their start lines, and the running max end line over that order
+
+    Examples:
+        >>> index_text_segments([(4, 4, "b"), (0, 2, "a")])
+        ([1, 0], [0, 4], [2, 4])
+    """
+    order = sorted(range(len(segments)), key=lambda i: segments[i][0])
+    starts = []
+    max_ends = []
+    max_end = -1
+    for i in order:
+        s, e, _ = segments[i]
+        if e > max_end:
+            max_end = e
+        starts.append(s)
+        max_ends.append(max_end)
+    return order, starts, max_ends
+
+
+def segments_in_range(
+    segments: list[tuple[int, int, str]],
+    index: tuple[list[int], list[int], list[int]],
+    start_line: int,
+    end_line: int,
+) -> list[tuple[int, int, str]]:
+    """
+    Return segments overlapping [start_line, end_line], in original order.
+
+    Cost is O(log n + matches): segments starting inside the range are found
+    by bisect, and segments starting earlier are only examined while the
+    running max end line still reaches the range.
+
+    Args:
+        segments: Segments from collect_text_segments
+        index: Result of index_text_segments for these segments
+        start_line: First line of the range (inclusive)
+        end_line: Last line of the range (inclusive)
+
+    Returns:
+        Overlapping segments in their original order
+    """
+    order, starts, max_ends = index
+    lo = bisect_right(starts, start_line - 1)
+    hi = bisect_right(starts, end_line)
+
+    positions = [i for i in order[lo:hi] if segments[i][1] >= start_line]
+
+    # Segments starting before the range that extend into it
+    j = lo - 1
+    while j >= 0 and max_ends[j] >= start_line:
+        if segments[order[j]][1] >= start_line:
+            positions.append(order[j])
+        j -= 1
+
+    positions.sort()
+    return [segments[i] for i in positions]
+
+
 def extract_text_from_inline(inline_token: Any) -> str:
     """
     Extract plain text from inline token children.
@@ -110,6 +188,108 @@ def extract_text_from_inline(inline_token: Any) -> str:
     return "".join(text_parts)
 
 
+def node_text(node: Any) -> str:
+    """
+    Get all text content from a node and its descendants.
+
+    Text and inline code are kept, soft/hard breaks become newlines and
+    images contribute their alt text. The subtree is walked with an explicit
+    stack (pre-order), so any depth is handled.
+
+    Args:
+        node: markdown-it SyntaxTreeNode
+
+    Returns:
+        Concatenated text
+
+    Examples:
+        >>> node_text(paragraph_node)  # "Hello *world*\nnext ![pic](a.png)"
+        'Hello world\nnext pic'
+    """
+    parts = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        t = n.type
+        if t == "text" or t == "code_inline":
+            content = n.content
+            if content:
+                parts.append(content)
+        elif t == "softbreak" or t == "hardbreak":
+            parts.append("\n")
+        elif t == "image":
+            # Prefer token.content (canonical alt text), fall back to attrGet('alt')
+            alt = ""
+            tok = n.token
+            if tok:
+                try:
+                    alt = getattr(tok, "content", "") or tok.attrGet("alt") or ""
+                except Exception:
+                    alt = ""
+            if alt:
+                parts.append(alt)
+        children = n.children
+        if children:
+            stack.extend(reversed(children))
+    return "".join(parts)
+
+
+def paragraph_features(node: Any) -> tuple[str, int, bool, bool, bool]:
+    """
+    Collect text, word count and inline-markup flags of a node in one walk.
+
+    Fuses ``node_text`` with the ``has_child_type`` checks for links,
+    emphasis (em/strong) and inline code, so a paragraph subtree is walked
+    once instead of five times. Text follows ``node_text`` exactly.
+
+    Args:
+        node: markdown-it SyntaxTreeNode
+
+    Returns:
+        Tuple (text, word_count, has_links, has_emphasis, has_code)
+
+    Examples:
+        >>> paragraph_features(paragraph_node)  # "See [docs](a) *now*"
+        ('See docs now', 3, True, True, False)
+    """
+    parts = []
+    has_links = has_emphasis = has_code = False
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        t = n.type
+        if t == "text":
+            content = n.content
+            if content:
+                parts.append(content)
+        elif t == "code_inline":
+            has_code = True
+            content = n.content
+            if content:
+                parts.append(content)
+        elif t == "softbreak" or t == "hardbreak":
+            parts.append("\n")
+        elif t == "link":
+            has_links = True
+        elif t == "em" or t == "strong":
+            has_emphasis = True
+        elif t == "image":
+            alt = ""
+            tok = n.token
+            if tok:
+                try:
+                    alt = getattr(tok, "content", "") or tok.attrGet("alt") or ""
+                except Exception:
+                    alt = ""
+            if alt:
+                parts.append(alt)
+        children = n.children
+        if children:
+            stack.extend(reversed(children))
+    text = "".join(parts)
+    return text, len(text.split()), has_links, has_emphasis, has_code
+
+
 def has_child_type(node: Any, types: str | list[str]) -> bool:
     """
     Check if node has children of specified type(s).
@@ -0,0 +1,184 @@
+"""Token index built once per parse for O(1) structural lookups.
+
+The parser builds a TokenWarehouse right after ``md.parse()``. Extractors query
+it instead of rescanning the full token list for every feature.
+
+Indices (all built in a single pass over the block-level token stream):
+    by_type: token type -> [token indices] in document order
+    pairs / pairs_rev: opening token index <-> matching closing token index
+    parents: token index -> index of the enclosing opening token
+    sections: (start_line, end_line, token_idx, level) per heading
+    fences: (start_line, end_line, info) per fenced code block
+
+Inline children (links, images, html_inline, ...) live inside ``inline``
+tokens; use ``tokens_of_type("inline")`` to reach them.
+
+Classes:
+    TokenWarehouse: Structural index over a markdown-it token stream
+"""
+
+from bisect import bisect_right
+from heapq import merge
+from typing import Any
+
+
+class TokenWarehouse:
+    """Structural index over a markdown-it token stream.
+
+    Attributes:
+        tokens: The indexed token list (not copied)
+        line_count: Number of source lines
+        by_type: token type -> list of token indices (document order)
+        pairs: opening token index -> closing token index
+        pairs_rev: closing token index -> opening token index
+        parents: token index -> enclosing opening token index
+        sections: list of (start_line, end_line, token_idx, level) tuples
+        fences: list of (start_line, end_line, info) tuples
+
+    Example:
+        >>> wh = TokenWarehouse(tokens, line_count=len(lines))
+        >>> [t.info for t in wh.tokens_of_type("fence")]
+        ['python', 'bash']
+        >>> wh.range_for(wh.iter_by_type("bullet_list_open")[0])
+        17
+    """
+
+    __slots__ = (
+        "tokens", "line_count",
+        "by_type", "pairs", "pairs_rev", "parents",
+        "sections", "fences", "_section_starts",
+    )
+
+    def __init__(self, tokens: list[Any], line_count: int):
+        """Build all indices for the token stream.
+
+        Args:
+            tokens: Block-level token list from ``md.parse()``
+            line_count: Number of lines in the parsed source
+        """
+        self.tokens = tokens
+        self.line_count = line_count
+        self.by_type: dict[str, list[int]] = {}
+        self.pairs: dict[int, int] = {}
+        self.pairs_rev: dict[int, int] = {}
+        self.parents: dict[int, int] = {}
+        self.sections: list[tuple[int, int, int, int]] = []
+        self.fences: list[tuple[int, int, str]] = []
+        self._section_starts: list[int] = []
+
+        self._index_structure()
+        self._build_sections()
+
+    def _index_structure(self) -> None:
+        """Populate by_type, pairs, parents and fences in one pass."""
+        by_type = self.by_type
+        pairs = self.pairs
+        pairs_rev = self.pairs_rev
+        parents = self.parents
+        open_stack: list[int] = []
+
+        for i, tok in enumerate(self.tokens):
+            ttype = tok.type
+            indices = by_type.get(ttype)
+            if indices is None:
+                by_type[ttype] = [i]
+            else:
+                indices.append(i)
+
+            nesting = tok.nesting
+            if nesting == -1:
+                if open_stack:
+                    open_idx = open_stack.pop()
+                    pairs[open_idx] = i
+                    pairs_rev[i] = open_idx
+                    # Closing token's parent is its matching opener
+                    parents[i] = open_idx
+                continue
+
+            if open_stack:
+                parents[i] = open_stack[-1]
+            if nesting == 1:
+                open_stack.append(i)
+
+            if ttype == "fence" and tok.map:
+                self.fences.append((tok.map[0], tok.map[1], tok.info or ""))
+
+    def _build_sections(self) -> None:
+        """Build heading section ranges.
+
+        A section runs from its heading line until the line before the next
+        heading of equal or higher level, or to the last line of the document.
+        """
+        open_sections: list[list[int]] = []
+        built: list[list[int]] = []
+
+        for idx in self.by_type.get("heading_open", []):
+            tok = self.tokens[idx]
+            if not tok.map:
+                continue
+            start = tok.map[0]
+            tag = tok.tag or ""
+            level = int(tag[1:]) if tag.startswith("h") and tag[1:].isdigit() else 1
+
+            while open_sections and open_sections[-1][3] >= level:
+                open_sections.pop()[1] = start - 1
+
+            section = [start, -1, idx, level]
+            open_sections.append(section)
+            built.append(section)
+
+        for section in open_sections:
+            section[1] = self.line_count - 1
+
+        self.sections = [tuple(s) for s in built]
+        self._section_starts = [s[0] for s in built]
+
+    # Query API
+
+    def iter_by_type(self, token_type: str) -> list[int]:
+        """Return indices of all tokens with the given type (document order)."""
+        return self.by_type.get(token_type, [])
+
+    def tokens_of_type(self, token_type: str) -> list[Any]:
+        """Return all tokens with the given type (document order)."""
+        tokens = self.tokens
+        return [tokens[i] for i in self.by_type.get(token_type, ())]
+
+    def tokens_of_types(self, *token_types: str) -> list[Any]:
+        """Return tokens of any of the given types, merged in document order."""
+        tokens = self.tokens
+        streams = [self.by_type.get(t, []) for t in token_types]
+        return [tokens[i] for i in merge(*streams)]
+
+    def first_of_type(self, token_type: str) -> Any | None:
+        """Return the first token with the given type, or None."""
+        indices = self.by_type.get(token_type)
+        return self.tokens[indices[0]] if indices else None
+
+    def range_for(self, open_idx: int) -> int | None:
+        """Return the index of the closing token matching ``open_idx``."""
+        return self.pairs.get(open_idx)
+
+    def parent(self, token_idx: int) -> int | None:
+        """Return the index of the enclosing opening token, or None at top level."""
+        return self.parents.get(token_idx)
+
+    def section_of(self, line_num: int) -> tuple[int, int, int, int] | None:
+        """Return the innermost section containing ``line_num``.
+
+        Uses binary search over section start lines (O(log n)).
+
+        Args:
+            line_num: Line number (0-based)
+
+        Returns:
+            (start_line, end_line, token_idx, level) tuple, or None if the
+            line precedes the first heading
+        """
+        idx = bisect_right(self._section_starts, line_num) - 1
+        if idx < 0:
+            return None
+        section = self.sections[idx]
+        if line_num > section[1]:
+            return None
+        return section
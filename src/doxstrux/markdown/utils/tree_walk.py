@@ -0,0 +1,94 @@
+"""Iterative traversal of markdown-it SyntaxTreeNode trees.
+
+``walk_tree`` replaces the recursive ``process_tree``: an explicit stack
+instead of one Python call frame per node, so there is no recursion limit
+and no depth at which content is silently dropped. Like ``walk_tokens_iter``
+for token streams, it visits nodes in depth-first pre-order.
+
+Processors keep the ``process_tree`` contract: ``processor(node, ctx, level)``
+returns ``DESCEND`` (True) to visit the node's children or ``SKIP_CHILDREN``
+(False) to prune them. An optional ``post(node, ctx, level)`` hook runs after
+a node's subtree has been visited (or pruned).
+
+Functions:
+    walk_tree: Pre-order walk with processor / post hooks
+    iter_tree: Generator of (node, level) in pre-order
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+DESCEND = True
+SKIP_CHILDREN = False
+
+
+def walk_tree(
+    root: Any,
+    processor: Callable[[Any, Any, int], bool],
+    context: Any | None = None,
+    post: Callable[[Any, Any, int], None] | None = None,
+    level: int = 0,
+) -> Any:
+    """Walk a syntax tree iteratively, calling hooks for every node.
+
+    Args:
+        root: SyntaxTreeNode to start from (visited first)
+        processor: Function(node, context, level) -> bool (descend into children)
+        context: Mutable context passed to the hooks (default: new dict)
+        post: Optional function(node, context, level) run after the subtree
+        level: Level of root (children are level + 1)
+
+    Returns:
+        The context object
+
+    Example:
+        >>> walk_tree(tree, lambda n, ctx, lvl: ctx.append(n.type) or DESCEND, [])
+        ['root', 'heading', 'inline', 'text', ...]
+    """
+    if context is None:
+        context = {}
+
+    if post is None:
+        stack: list[tuple[Any, int]] = [(root, level)]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node, lvl = pop()
+            if processor(node, context, lvl):
+                children = node.children
+                if children:
+                    lvl += 1
+                    for child in reversed(children):
+                        push((child, lvl))
+        return context
+
+    # Entries: (node, level, exiting) - exiting entries run the post hook
+    post_stack: list[tuple[Any, int, bool]] = [(root, level, False)]
+    while post_stack:
+        node, lvl, exiting = post_stack.pop()
+        if exiting:
+            post(node, context, lvl)
+            continue
+        post_stack.append((node, lvl, True))
+        if processor(node, context, lvl):
+            children = node.children
+            if children:
+                for child in reversed(children):
+                    post_stack.append((child, lvl + 1, False))
+    return context
+
+
+def iter_tree(root: Any) -> Iterator[tuple[Any, int]]:
+    """Yield (node, level) for root and all descendants in pre-order.
+
+    Example:
+        >>> [n.type for n, _ in iter_tree(tree)][:3]
+        ['root', 'heading', 'inline']
+    """
+    stack: list[tuple[Any, int]] = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        yield node, level
+        children = node.children
+        if children:
+            for child in reversed(children):
+                stack.append((child, level + 1))
@@ -6,26 +6,30 @@ No backward compatibility burden - fresh architecture.
 """
 
 import hashlib
-import posixpath
+import mmap
+import os
 import re
-import urllib.parse
 import warnings
-from collections.abc import Callable
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
 from typing import Any
 import yaml
-from markdown_it import MarkdownIt
 from markdown_it.tree import SyntaxTreeNode
-from mdit_py_plugins.texmath import texmath_plugin
-from mdit_py_plugins.footnote import footnote_plugin
-from mdit_py_plugins.tasklists import tasklists_plugin
-from mdit_py_plugins.front_matter import front_matter_plugin
 from doxstrux.markdown.security import validators as security_validators
 from doxstrux.markdown.ir import DocumentIR, DocNode
 from doxstrux.markdown.utils.token_utils import walk_tokens_iter
-from doxstrux.markdown.utils import line_utils, text_utils
+from doxstrux.markdown.utils.dispatch import NodeDispatcher
+from doxstrux.markdown.utils.line_mappings import LineMappings
+from doxstrux.markdown.utils.section_index import SectionIndex
+from doxstrux.markdown.utils.source_view import SourceLines, line_starts
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+from doxstrux.markdown.utils.text_cache import NodeTextCache
+from doxstrux.markdown.utils.tree_walk import walk_tree
+from doxstrux.markdown.utils import incremental, line_utils, text_utils
 from doxstrux.markdown.exceptions import MarkdownSecurityError, MarkdownSizeError
-from doxstrux.markdown import config
-from doxstrux.markdown.extractors import media, footnotes, blockquotes, html, sections, paragraphs, lists, codeblocks, tables, links, math
+from doxstrux.markdown import config, engines, isolation, url_cache
+from doxstrux.markdown.structure import LazyStructure
+from doxstrux.markdown.extractors import media, footnotes, blockquotes, html, sections, paragraphs, lists, codeblocks, tables, links, math, records
 
 class MarkdownParserCore:
     """
@@ -36,7 +40,7 @@ class MarkdownParserCore:
     - Universal recursion pattern
     - Extract everything, analyze nothing
     - Preserve original formatting
-    - No file I/O (takes content string)
+    - No file I/O beyond from_path() (takes content string)
     - No Pydantic models (plain dicts)
     """
 
@@ -73,17 +77,14 @@ class MarkdownParserCore:
         if line_count > limits["max_line_count"]:
             issues.append(f"Line count {line_count} exceeds {limits['max_line_count']} limit")
 
-        # Quick malicious pattern scan
-        malicious_patterns = [
-            (r"<script[^>]*>", "script tag"),
-            (r"javascript:", "javascript protocol"),
-            (r"data:text/html", "HTML data URI"),
-            (r"vbscript:", "vbscript protocol"),
-            (r"on\w+\s*=", "event handler"),
-        ]
-
-        for pattern, description in malicious_patterns:
-            if re.search(pattern, content[:10000], re.IGNORECASE):  # Check first 10KB
+        # Quick malicious pattern scan (first 10KB, one scanner call)
+        hits = security_validators.RAW_SCANNER.first_hits(
+            content,
+            [name for name, _, _ in security_validators.MALICIOUS_PATTERNS],
+            endpos=security_validators.MALICIOUS_SCAN_BYTES,
+        )
+        for name, _, description in security_validators.MALICIOUS_PATTERNS:
+            if name in hits:
                 issues.append(f"Suspicious pattern detected: {description}")
                 if security_profile == "strict":
                     break  # Stop on first issue in strict mode
@@ -96,14 +97,122 @@ class MarkdownParserCore:
             "line_count": line_count,
         }
 
+    @classmethod
+    def from_path(
+        cls,
+        path: str | os.PathLike,
+        config: dict[str, Any] | None = None,
+        security_profile: str | None = None,
+    ) -> "MarkdownParserCore":
+        """Create a parser for a UTF-8 file without extra copies of its content.
+
+        Size limits are checked from ``os.stat`` before anything is read, and
+        the line count from a newline scan of the memory-mapped file before
+        it is decoded. The file is decoded straight from the mapping into the
+        one str markdown-it needs; no bytes copy or encoded copy is made.
+        For ASCII files the line index scanned from the mapping is reused
+        for character offsets.
+
+        Lines are plain lists, as with the constructor, so the result is
+        JSON-serializable. ``{"content_mode": "spans"}`` is an opt-in that
+        also skips the ``split()`` line list; results then hold
+        ``SourceLines``/``TextSpan`` views (see ``source_view.materialize``).
+
+        Newlines are normalized like ``Path.read_text()`` ("\\r\\n" and "\\r"
+        become "\\n"), so results match ``MarkdownParserCore(path.read_text())``
+        with the same config.
+
+        Args:
+            path: File to parse
+            config: Parser config
+            security_profile: Optional security profile ('strict', 'moderate', 'permissive')
+
+        Returns:
+            Parser for the file's content
+
+        Raises:
+            ValueError: If the security profile is unknown
+            MarkdownSizeError: If the file exceeds the profile size or line limits
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        profile = security_profile or "moderate"
+        if profile not in cls.SECURITY_LIMITS:
+            raise ValueError(
+                f"Unknown security profile: {security_profile}. Available: {sorted(cls.SECURITY_LIMITS)}"
+            )
+
+        content_size = os.stat(path).st_size
+        cls._check_size_limits(profile, content_size, None)
+
+        starts = None
+        with open(path, "rb") as f:
+            if content_size == 0:
+                content = ""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    starts = line_starts(mm)
+                    cls._check_size_limits(profile, None, len(starts))
+                    content = str(mm, "utf-8")
+                    has_cr = mm.find(b"\r") != -1
+
+        if starts is not None and has_cr:
+            # Universal newlines, as read_text() does; offsets and size change
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+            content_size = starts = None
+        elif starts is not None and not content.isascii():
+            starts = None  # Byte offsets are not character offsets
+
+        lines = None
+        if starts is not None or (config or {}).get("content_mode") == "spans":
+            lines = SourceLines(content, starts)
+        return cls(content, config, security_profile, _prescanned=(content_size, lines))
+
+    @staticmethod
+    def parse_isolated(
+        content: str,
+        config: dict[str, Any] | None = None,
+        security_profile: str | None = None,
+        *,
+        include: Iterable[str] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Run parse() in an isolated worker process with hard budgets.
+
+        Uses the process-wide pool of markdown/isolation.py: a wall-clock
+        deadline and (on Unix) memory and CPU rlimits, with the profile's
+        budgets from config.ISOLATION_LIMITS. Use isolation.IsolatedParsePool
+        directly to choose worker count or budgets.
+
+        Args:
+            content: Raw markdown content
+            config: Parser config
+            security_profile: Security profile (default: moderate)
+            include: Optional parse(include=...) subset
+            timeout: Deadline in seconds (default: the profile's)
+
+        Returns:
+            parse() result
+
+        Raises:
+            MarkdownSecurityError: If validation fails, or the parse exceeded
+                a budget or crashed its worker (content_info["isolation"])
+
+        Example:
+            >>> result = MarkdownParserCore.parse_isolated(untrusted, security_profile="strict")
+        """
+        return isolation.parse_isolated(
+            content,
+            security_profile,
+            config=config,
+            include=frozenset(include) if include is not None else None,
+            timeout=timeout,
+        )
+
     # Phase 7 Task 7.4: Configuration moved to markdown/config.py
     # Use config.SECURITY_PROFILES, config.SECURITY_LIMITS, config.ALLOWED_PLUGINS
     # Use config._STYLE_JS_PAT, config._META_REFRESH_PAT, config._FRAMELIKE_PAT
     # Use config._BIDI_CONTROLS
 
-    # Safety: Maximum recursion depth to prevent stack overflow
-    MAX_RECURSION_DEPTH = config.MAX_RECURSION_DEPTH
-
     # Security: Content size limits (reference config module)
     SECURITY_LIMITS = config.SECURITY_LIMITS
 
@@ -119,11 +228,41 @@ class MarkdownParserCore:
     # Security profiles (reference config module)
     SECURITY_PROFILES = config.SECURITY_PROFILES
 
+    # Structure fields in parse() output order -> (_cache key, extractor method)
+    STRUCTURE_FIELDS = {
+        "sections": ("sections", "_extract_sections"),
+        "paragraphs": ("paragraphs", "_extract_paragraphs"),
+        "lists": ("lists", "_extract_lists"),
+        "tables": ("tables", "_extract_tables"),
+        "code_blocks": ("code_blocks", "_extract_code_blocks"),
+        "headings": ("headings", "_extract_headings"),
+        "links": ("links", "_extract_links"),
+        "images": ("images", "_extract_images"),
+        "blockquotes": ("blockquotes", "_extract_blockquotes"),
+        "frontmatter": ("frontmatter", "_extract_frontmatter"),
+        "tasklists": ("tasklists", "_extract_tasklists"),
+        "math": ("textmath", "_extract_math"),
+        "footnotes": ("footnotes", "_extract_footnotes"),
+        "html_blocks": ("html", "_extract_html"),
+        "html_inline": ("html", "_extract_html"),
+    }
+
+    # Non-structure result parts selectable with parse(include=...)
+    RESULT_PARTS = ("metadata", "mappings")
+
+    # Item types of result["structure"] lists (config "result_format")
+    RESULT_FORMATS = ("dicts", "records")
+
+    # Line/raw text storage (config "content_mode"): str copies or source views
+    CONTENT_MODES = ("copy", "spans")
+
     def __init__(
         self,
         content: str,
         config: dict[str, Any] | None = None,
         security_profile: str | None = None,
+        *,
+        _prescanned: tuple[int | None, SourceLines | None] | None = None,
     ):
         """
         Initialize parser with markdown content.
@@ -134,7 +273,17 @@ class MarkdownParserCore:
                 - 'plugins': list of markdown-it plugins to enable
                 - 'allows_html': bool, whether HTML blocks are allowed
                 - 'preset': str, markdown-it preset ('commonmark', 'gfm', etc.)
+                - 'result_format': "dicts" (default) or "records" (slotted
+                  record types from extractors/records.py, with to_dict())
+                - 'content_mode': "copy" (default) or "spans": lines and raw
+                  section/table/HTML text are views into the one source
+                  string (utils/source_view.py) instead of copies
+                - 'url_cache_stats': bool, report URL verdict cache hits in
+                  metadata["url_cache"] (off by default: the counts depend
+                  on what the process parsed before)
             security_profile: Optional security profile ('strict', 'moderate', 'permissive')
+            _prescanned: Internal (from_path): (UTF-8 byte size or None, line
+                index or None) already known for content
         """
         # Validate security profile if provided
         valid_profiles = {"strict", "moderate", "permissive"}
@@ -147,8 +296,24 @@ class MarkdownParserCore:
         self.config = config or {}
         self.security_profile = security_profile or "moderate"  # Default to moderate
 
+        self._result_format = self.config.get("result_format", "dicts")
+        if self._result_format not in self.RESULT_FORMATS:
+            raise ValueError(
+                f"Unknown result_format: {self._result_format}. Available: {list(self.RESULT_FORMATS)}"
+            )
+        self._content_mode = self.config.get("content_mode", "copy")
+        if self._content_mode not in self.CONTENT_MODES:
+            raise ValueError(
+                f"Unknown content_mode: {self._content_mode}. Available: {list(self.CONTENT_MODES)}"
+            )
+
         # Validate content size limits BEFORE any processing
-        self._validate_content_security(content)
+        content_size, prescanned_lines = _prescanned or (None, None)
+        self._validate_content_security(
+            content,
+            content_size,
+            len(prescanned_lines) if prescanned_lines is not None else None,
+        )
 
         # Set effective allowed schemes based on security profile
         profile = self.SECURITY_PROFILES.get(
@@ -156,23 +321,29 @@ class MarkdownParserCore:
         )
         # Phase 6 Task 6.1: Use centralized security_validators constants
         self._effective_allowed_schemes = profile.get("allowed_schemes", security_validators.ALLOWED_LINK_SCHEMES_MODERATE)
+        # Hashable key for the process-wide URL verdict cache
+        self._allowed_schemes_key = frozenset(self._effective_allowed_schemes)
 
         # Store limits for later validation
         limits = self.SECURITY_LIMITS[self.security_profile]
         self._max_token_count = limits["max_token_count"]
-        self.MAX_RECURSION_DEPTH = limits["max_recursion_depth"]
 
         # Use original content (frontmatter will be extracted by plugin after parsing)
         self.content = content
-        self.lines = self.content.split("\n")
+        if self._content_mode == "spans":
+            self.lines: list[str] | SourceLines = prescanned_lines or SourceLines(self.content)
+        else:
+            self.lines = self.content.split("\n")
 
         # Build character offset map for RAG chunking
-        self._build_line_offsets()
+        if prescanned_lines is not None:
+            self._line_start_offsets, self._total_chars_with_lf = prescanned_lines.starts, len(content)
+        else:
+            self._build_line_offsets()
 
-        # Initialize markdown parser with configurable features
-        # Always enable HTML parsing to get tokens (policy enforces allows_html)
+        # Markdown parser configuration (HTML parsing is always on in the
+        # engine to get tokens; policy enforces allows_html)
         preset = self.config.get("preset", "commonmark")
-        self.md = MarkdownIt(preset, options_update={"html": True})
 
         # Enable built-in plugins and external plugins
         # Use profile-appropriate defaults when not specified
@@ -191,49 +362,48 @@ class MarkdownParserCore:
         self.rejected_plugins = rejected
 
         # Track what we actually enabled
-        self.enabled_plugins = set()
-
-        # Enable allowed built-in plugins
-        if allowed_builtin:
-            self.md.enable(allowed_builtin)
-            self.enabled_plugins.update(allowed_builtin)
-
-        # Apply allowed external plugins with availability check
-        for plugin_config in allowed_external:
-            if plugin_config == "footnote":
-                self.md.use(footnote_plugin)
-                self.enabled_plugins.add("footnote")
-            elif plugin_config == "tasklists":
-                self.md.use(tasklists_plugin)
-                self.enabled_plugins.add("tasklists")
-            elif plugin_config == "front_matter":
-                self.md.use(front_matter_plugin)
-                self.enabled_plugins.add("front_matter")
-            elif plugin_config == "texmath":
-                self.md.use(texmath_plugin, inline_delimiter="$", block_delimiter="dollars")
-                self.enabled_plugins.add("texmath")
-        rules = self.md.get_active_rules()
-        all_rules = self.md.get_all_rules()
-        # print("\nActive rules:\n", rules)
-        # print("All rules:", all_rules)
+        self.enabled_plugins = set(allowed_builtin)
+        self.enabled_plugins.update(allowed_external)
+
+        # Shared, pre-configured engine for this (preset, plugins) combination.
+        # Read-only: never enable/use plugins on it.
+        self.md = engines.get_engine(preset, allowed_builtin, allowed_external)
 
         # Track enabled features for extraction logic
         self.allows_html = self.config.get("allows_html", False)
 
-        # Initialize env dict for plugins (front_matter plugin stores data here)
-        self.md.env = {}
+        # Per-parse env dict for plugins (front_matter plugin stores data here);
+        # kept on the parser, not the shared engine
+        self.env: dict[str, Any] = {}
 
         # Parse once and create tree (frontmatter extracted by plugin to env)
-        self.tokens = self.md.parse(self.content, self.md.env)
+        self.tokens = self.md.parse(self.content, self.env)
         self.tree = SyntaxTreeNode(self.tokens)
 
-        # Pre-collect text segments for faster plain text extraction
-        self._text_segments = []
-        self._collect_text_segments()
+        # Node text memo shared by all extractors (tied to self.tree)
+        self._text_cache = NodeTextCache()
+
+        # Index tokens once (by type, open/close pairs, parents, sections, fences)
+        self._warehouse: TokenWarehouse | None = TokenWarehouse(self.tokens, len(self.lines))
+
+        # Text segments for plain text extraction (collected on first use)
+        self._text_segments: list[tuple[int, int, str]] | None = None
+
+        # Top-level block index for update() (built on first update)
+        self._blocks: tuple[list[int], list[int]] | None = None
 
         # Track sections for cross-referencing
         self._sections = []
 
+        # Heading levels, text and slugs shared by sections/headings
+        self._heading_index: list[sections.HeadingEntry] | None = None
+
+        # Interval index over self._sections (built with sections)
+        self._section_index: SectionIndex | None = None
+
+        # Array-backed line mappings (built by _build_mappings)
+        self._line_mappings: LineMappings | None = None
+
         # Initialize extraction caches to avoid redundant work
         self._cache = {
             "code_blocks": None,  # Cache for code blocks
@@ -248,52 +418,275 @@ class MarkdownParserCore:
             "footnotes": None,  # Cache for footnotes
             "html_blocks": None,  # Cache for HTML blocks
             "textmath": None,  # Cache for math blocks
+            "tasklists": None,  # Cache for task lists
+            "frontmatter": None,  # Cache for frontmatter
+            "html": None,  # Cache for HTML blocks + inline ({"blocks", "inline"})
         }
+        self._structure_view: LazyStructure | None = None
 
-    def _validate_content_security(self, content: str) -> None:
-        """Comprehensive content security validation.
+        # Memoized full parse() result (see invalidate())
+        self._parse_result: dict[str, Any] | None = None
 
-        Performs size validation and malicious pattern detection based on security profile.
+        # URL verdict cache lookups made by this parser (see _url_verdict())
+        self._url_stats = {"hits": 0, "misses": 0}
+
+    @property
+    def warehouse(self) -> TokenWarehouse:
+        """Token index over self.tokens (rebuilt on first use after update())."""
+        if self._warehouse is None:
+            self._warehouse = TokenWarehouse(self.tokens, len(self.lines))
+        return self._warehouse
+
+    def invalidate(self) -> None:
+        """Drop the memoized parse() result and all extraction caches.
+
+        parse() memoizes its result on the instance and returns the same dict
+        on later calls. Call invalidate() after mutating that dict or changing
+        parser attributes (e.g. allows_html) to force a fresh extraction from
+        the already tokenized content.
         """
-        limits = self.SECURITY_LIMITS[self.security_profile]
+        self._parse_result = None
+        for key in self._cache:
+            self._cache[key] = None
+        self._sections = []
+        self._section_index = None
+        self._heading_index = None
+        self._line_mappings = None
+        self._structure_view = None
+        self._url_stats = {"hits": 0, "misses": 0}
+
+    def update(self, content: str) -> incremental.ReparseRange:
+        """Re-parse in place for edited content, re-tokenizing only what changed.
+
+        The changed lines are widened to the enclosing top-level blocks (see
+        utils/incremental.py). Only those are tokenized again; the other
+        tokens, syntax tree nodes and cached node text are kept, with line
+        maps shifted. Extraction caches are invalidated, so the next parse()
+        or structure access extracts from the updated tree.
+
+        The whole document is re-tokenized if the edit may change tokens
+        outside its blocks: with footnotes, when the edited lines (old or new)
+        contain a link reference definition, when line 0 opens front matter
+        that is not closed above the edit, or with CR line endings.
+        The parser is left unchanged if content fails validation.
 
-        # Size validation
-        content_size = len(content.encode("utf-8"))
-        if content_size > limits["max_content_size"]:
+        Args:
+            content: Complete new markdown content
+
+        Returns:
+            ReparseRange with the re-tokenized lines
+
+        Raises:
+            MarkdownSizeError: If content exceeds the profile limits
+            MarkdownSecurityError: If content fails security validation
+
+        Example:
+            >>> parser = MarkdownParserCore(text)
+            >>> parser.update(text.replace("teh", "the"))
+            ReparseRange(start_line=40, old_end_line=42, new_end_line=42, full=False)
+            >>> parser.parse()["structure"]["paragraphs"]
+        """
+        if content == self.content:
+            return incremental.ReparseRange(0, 0, 0, False)
+        self._validate_content_security(content)
+
+        old_content, old_lines = self.content, self.lines
+        changed = incremental.changed_line_range(old_content, content)
+        starts = incremental.splice_line_starts(
+            self._line_start_offsets, content, *changed, len(content) - len(old_content)
+        )
+        new_lines = SourceLines(content, starts) if self._content_mode == "spans" else content.split("\n")
+        window = self._reparse_window(old_content, old_lines, content, new_lines, changed)
+        region_tokens = self._tokenize_window(window) if window is not None else None
+
+        if region_tokens is None:
+            self.env = {}
+            self.tokens = self.md.parse(content, self.env)
+            self.tree = SyntaxTreeNode(self.tokens)
+            self._text_cache = NodeTextCache()
+            self._blocks = None
+            reparsed = incremental.ReparseRange(0, len(old_lines), len(new_lines), True)
+        else:
+            (start, old_end, new_end), (tok_start, tok_end, _), (block_start, block_end), _, _ = window
+            incremental.shift_maps(self.tokens[tok_end:], new_end - old_end)
+            self.tokens = self.tokens[:tok_start] + region_tokens + self.tokens[tok_end:]
+
+            region_blocks = incremental.top_level_blocks(region_tokens)
+            self._blocks = region_blocks and incremental.splice_blocks(
+                self._blocks, block_start, block_end, region_blocks,
+                tok_start, len(region_tokens) - (tok_end - tok_start), new_end - old_end,
+            )
+
+            region_nodes = SyntaxTreeNode(region_tokens).children
+            for node in region_nodes:
+                node._parent = self.tree
+            children = self.tree.children
+            self._text_cache.discard(children[block_start:block_end], ancestors=(self.tree,))
+            children[block_start:block_end] = region_nodes
+            reparsed = incremental.ReparseRange(start, old_end, new_end, False)
+
+        self.original_content = self.content = content
+        self.lines = new_lines
+        self._line_start_offsets, self._total_chars_with_lf = starts, len(content)
+        # Token index and text segments are rebuilt on first use
+        self._warehouse = None
+        self._text_segments = None
+        self.invalidate()
+        return reparsed
+
+    def _reparse_window(
+        self,
+        old_content: str,
+        old_lines: list[str] | SourceLines,
+        content: str,
+        new_lines: list[str] | SourceLines,
+        changed: tuple[int, int, int],
+    ) -> tuple[tuple[int, int, int], tuple[int, int, int], tuple[int, int], str, str] | None:
+        """Locate the tokens, tree nodes and new text an update re-tokenizes.
+
+        Args:
+            old_content, old_lines: Current content (self._line_start_offsets
+                still indexes it)
+            content, new_lines: New content
+            changed: (start, old_end, new_end) from changed_line_range()
+
+        Returns:
+            ((start, old_end, new_end) lines, (start, end, next block end)
+            token indices, (start, end) root child indices, new region text,
+            new text of the block after the region), or None if the whole
+            document must be re-tokenized
+        """
+        footnote_data = self.env.get("footnotes")
+        if (footnote_data and (footnote_data.get("refs") or footnote_data.get("list"))) or "\r" in content:
+            return None
+        if self._blocks is None:
+            self._blocks = incremental.top_level_blocks(self.tokens)
+        if self._blocks is None or len(self._blocks[0]) != len(self.tree.children):
+            return None
+        block_tokens, block_lines = self._blocks
+
+        start, old_end, new_end = incremental.reparse_window(
+            old_lines, new_lines, block_lines, *changed
+        )
+        if start == 0 and old_end == len(old_lines):
+            return None
+        if new_lines[0].startswith("---") and not (
+            start > 0 and self.tokens and self.tokens[0].type == "front_matter"
+        ):
+            return None  # Front matter may close anywhere below line 0
+
+        # Old and new region text, up to the next block (markdown-it only
+        # counts a trailing blank line if a newline ends it)
+        region_start = self._line_start_offsets[start]
+        if old_end < len(old_lines):
+            old_stop = self._line_start_offsets[old_end]
+            new_stop = old_stop + len(content) - len(old_content)
+        else:
+            old_stop, new_stop = len(old_content), len(content)
+        region = content[region_start:new_stop]
+        old_region = old_content[region_start:old_stop]
+        if "]:" in region or "]:" in old_region or "[^" in region or "^[" in region:
+            return None  # Reference definitions or footnotes affect other blocks
+
+        block_start = bisect_left(block_lines, start)
+        block_end = bisect_left(block_lines, old_end)
+        tok_start = block_tokens[block_start] if block_start < len(block_tokens) else len(self.tokens)
+        tok_end = block_tokens[block_end] if block_end < len(block_tokens) else len(self.tokens)
+
+        # The block after the region, to check that the region leaves no block open
+        lookahead, tok_next = "", tok_end
+        if block_end < len(block_tokens):
+            if block_end + 1 < len(block_tokens):
+                tok_next = block_tokens[block_end + 1]
+                next_stop = self._line_start_offsets[block_lines[block_end + 1]] + len(content) - len(old_content)
+            else:
+                tok_next, next_stop = len(self.tokens), len(content)
+            lookahead = content[new_stop:next_stop]
+        return (
+            (start, old_end, new_end),
+            (tok_start, tok_end, tok_next),
+            (block_start, block_end),
+            region,
+            lookahead,
+        )
+
+    def _tokenize_window(
+        self, window: tuple[tuple[int, int, int], tuple[int, int, int], tuple[int, int], str, str]
+    ) -> list | None:
+        """Tokenize an update's region (see _reparse_window) with document line maps.
+
+        The region is tokenized together with the block after it. That block
+        must come out as before: otherwise the region left a block open
+        (e.g. a fence inside a list item that the scanner took for closed).
+
+        Returns:
+            The region's tokens, or None if the whole document must be re-tokenized
+        """
+        (start, old_end, new_end), (_, tok_end, tok_next), _, region, lookahead = window
+        # Region parsed on its own; it defines no references but may use them
+        tokens = self.md.parse(region + lookahead, dict(self.env))
+        incremental.shift_maps(tokens, start)
+        if not lookahead:
+            return tokens
+        split = incremental.first_block_at(tokens, new_end)
+        if not incremental.same_tokens(self.tokens[tok_end:tok_next], tokens[split:], new_end - old_end):
+            return None
+        return tokens[:split]
+
+    @classmethod
+    def _check_size_limits(
+        cls, security_profile: str, content_size: int | None, line_count: int | None
+    ) -> None:
+        """Raise MarkdownSizeError if a known size or line count exceeds the profile limits."""
+        limits = cls.SECURITY_LIMITS[security_profile]
+        if content_size is not None and content_size > limits["max_content_size"]:
             raise MarkdownSizeError(
                 f"Content size {content_size} bytes exceeds limit",
-                self.security_profile,
+                security_profile,
                 {"size": content_size, "limit": limits["max_content_size"]},
             )
-
-        # Line count validation
-        line_count = content.count("\n") + 1
-        if line_count > limits["max_line_count"]:
+        if line_count is not None and line_count > limits["max_line_count"]:
             raise MarkdownSizeError(
                 f"Line count {line_count} exceeds limit",
-                self.security_profile,
+                security_profile,
                 {"lines": line_count, "limit": limits["max_line_count"]},
             )
 
-        # Quick scan for obviously malicious patterns
-        malicious_patterns = [
-            r"<script[^>]*>",
-            r"javascript:",
-            r"data:text/html",
-            r"vbscript:",
-            r"on\w+\s*=",  # Event handlers
-        ]
-
-        for pattern in malicious_patterns:
-            if re.search(pattern, content[:10000], re.IGNORECASE):  # Check first 10KB
-                if self.security_profile == "strict":
+    def _validate_content_security(
+        self, content: str, content_size: int | None = None, line_count: int | None = None
+    ) -> None:
+        """Comprehensive content security validation.
+
+        Performs size validation and malicious pattern detection based on security profile.
+
+        Args:
+            content: Document text
+            content_size: UTF-8 size in bytes if already known (e.g. from os.stat)
+            line_count: Line count if already known (e.g. from a line index)
+        """
+        # Size validation (ASCII text: UTF-8 size is the length, no encoded copy)
+        if content_size is None:
+            content_size = len(content) if content.isascii() else len(content.encode("utf-8"))
+        # Line count validation
+        if line_count is None:
+            line_count = content.count("\n") + 1
+        self._check_size_limits(self.security_profile, content_size, line_count)
+
+        # Quick scan for obviously malicious patterns (first 10KB). Only strict
+        # mode acts on it; moderate/permissive catch these in detailed analysis.
+        if self.security_profile == "strict":
+            hits = security_validators.RAW_SCANNER.first_hits(
+                content,
+                [name for name, _, _ in security_validators.MALICIOUS_PATTERNS],
+                endpos=security_validators.MALICIOUS_SCAN_BYTES,
+            )
+            for name, pattern, _ in security_validators.MALICIOUS_PATTERNS:
+                if name in hits:
                     raise MarkdownSecurityError(
                         f"Malicious pattern detected: {pattern}",
                         self.security_profile,
                         {"pattern": pattern},
                     )
-                # In moderate/permissive, we'll catch it in detailed analysis
-                break
 
     def _validate_plugins(
         self, plugins: list[str], external_plugins: list[str]
@@ -314,7 +707,7 @@ class MarkdownParserCore:
 
         # Check builtin plugins
         for plugin in plugins:
-            if plugin in ["table", "strikethrough", "linkify"]:
+            if plugin in config.KNOWN_PLUGINS["builtin"]:
                 if plugin in profile_config["builtin"]:
                     allowed_builtin.append(plugin)
                 else:
@@ -324,7 +717,7 @@ class MarkdownParserCore:
 
         # Check external plugins
         for plugin in external_plugins:
-            if plugin in ["footnote", "tasklists", "front_matter", "texmath"]:
+            if plugin in config.KNOWN_PLUGINS["external"]:
                 if plugin in profile_config["external"]:
                     allowed_external.append(plugin)
                 else:
@@ -343,86 +736,127 @@ class MarkdownParserCore:
         processor: Callable,
         context: Any | None = None,
         level: int = 0,
+        post: Callable | None = None,
     ) -> Any:
         """
         Universal tree processor with pluggable logic.
 
-        This is the heart of the parser - one recursion pattern for all needs.
+        This is the heart of the parser - one traversal pattern for all needs.
+        The walk is iterative (utils/tree_walk.py), so arbitrarily deep trees
+        are visited in full.
 
         Args:
             node: Current node to process
             processor: Function(node, context, level) -> bool (should recurse)
             context: Mutable context object to collect results
             level: Current depth in tree
+            post: Optional function(node, context, level) run after the subtree
 
         Returns:
             The context object with accumulated results
         """
-        if context is None:
-            context = {}
-
-        # Safety: Prevent stack overflow from deeply nested structures
-        if level > self.MAX_RECURSION_DEPTH:
-            return context  # Bail out gracefully
+        return walk_tree(node, processor, context, post, level)
 
-        # Process current node - processor decides if we should recurse
-        should_recurse = processor(node, context, level)
+    @property
+    def structure(self) -> LazyStructure:
+        """Lazy structure view: each field is extracted on first access.
 
-        # Recurse into children if needed
-        if should_recurse and node.children:
-            for child in node.children:
-                self.process_tree(child, processor, context, level + 1)
-
-        return context
+        Example:
+            >>> MarkdownParserCore(content).structure.links
+        """
+        if self._structure_view is None:
+            fields = [
+                name for name in self.STRUCTURE_FIELDS
+                if name != "footnotes" or "footnote" in self.enabled_plugins
+            ]
+            self._structure_view = LazyStructure(fields, self._get_structure_field)
+        return self._structure_view
+
+    def _get_structure_field(self, name: str) -> Any:
+        """Extract one structure field, memoized through _cache."""
+        key, method = self.STRUCTURE_FIELDS[name]
+        value = self._get_cached(key, getattr(self, method))
+        if key == "html":
+            return value["blocks"] if name == "html_blocks" else value["inline"]
+        return value
+
+    def _check_token_count(self) -> None:
+        """Post-processing security validation - check token count."""
+        token_count = len(self.tokens)
+        if token_count > self._max_token_count:
+            raise MarkdownSizeError(
+                f"Token count {token_count} exceeds limit",
+                self.security_profile,
+                {"tokens": token_count, "limit": self._max_token_count},
+            )
 
-    def parse(self) -> dict[str, Any]:
+    def parse(self, include: Iterable[str] | None = None) -> dict[str, Any]:
         """
         Parse document and extract all structure with enhanced security validation.
 
+        Args:
+            include: Optional subset of structure fields (see STRUCTURE_FIELDS)
+                and result parts ("metadata", "mappings") to compute. Default
+                computes everything. In subset mode, "structure" holds only
+                the requested fields, with unsafe links/images dropped and HTML
+                stripped as in a full parse. Metadata and mappings are
+                omitted unless requested.
+
         Returns:
-            Dictionary with all extracted information
+            Dictionary with all extracted information. The full result is
+            memoized: later calls return the same dict until invalidate().
 
         Raises:
+            ValueError: If include names an unknown field
             MarkdownSizeError: If token count exceeds limit
             MarkdownSecurityError: If parsing fails due to security issues
+
+        Example:
+            >>> parser.parse(include={"links"})["structure"]
+            {'links': [...]}
         """
+        if include is not None:
+            return self._parse_subset(include)
+        if self._parse_result is not None:
+            return self._parse_result
+
         try:
-            # Post-processing security validation - check token count
-            token_count = len(self.tokens)
-            if token_count > self._max_token_count:
-                raise MarkdownSizeError(
-                    f"Token count {token_count} exceeds limit",
-                    self.security_profile,
-                    {"tokens": token_count, "limit": self._max_token_count},
-                )
+            self._check_token_count()
+
+            # Sections first: every other extractor resolves section_id against them
+            section_list = self._extract_sections()
+
+            # One shared tree walk for all node-based extractors
+            tree_data = self._dispatch_tree_extractors()
 
             structure = {
-                "sections": self._extract_sections(),
-                "paragraphs": self._extract_paragraphs(),
-                "lists": self._extract_lists(),
-                "tables": self._extract_tables(),
-                "code_blocks": self._extract_code_blocks(),
-                "headings": self._extract_headings(),
+                "sections": section_list,
+                "paragraphs": tree_data["paragraphs"],
+                "lists": tree_data["lists"],
+                "tables": tree_data["tables"],
+                "code_blocks": tree_data["code_blocks"],
+                "headings": tree_data["headings"],
                 "links": self._extract_links(),
                 "images": self._extract_images(),
-                "blockquotes": self._extract_blockquotes(),
+                "blockquotes": tree_data["blockquotes"],
                 "frontmatter": self._extract_frontmatter(),
-                "tasklists": self._extract_tasklists(),
+                "tasklists": tree_data["tasklists"],
                 "math": self._extract_math(),
             }
 
-
-
             # Add conditional extractions based on enabled features
             if "footnote" in self.enabled_plugins:
-                structure["footnotes"] = self._extract_footnotes()
+                structure["footnotes"] = tree_data["footnotes"]
 
             # Always extract HTML for security scanning (RAG safety)
             # Include 'allowed' flag based on allows_html config
-            html_data = self._extract_html()
+            html_data = tree_data["html"]
             structure["html_blocks"] = html_data["blocks"]
             structure["html_inline"] = html_data["inline"]
 
+            # Memoize for the lazy structure view (first result wins, as in _get_cached)
+            self._publish_structure(structure, html_data)
+
             result = {
                 "metadata": self._extract_metadata(structure),
                 "content": {"raw": self.content, "lines": self.lines},
@@ -440,6 +874,10 @@ class MarkdownParserCore:
             if hasattr(self, "rejected_plugins") and self.rejected_plugins:
                 result["metadata"]["security"]["rejected_plugins"] = self.rejected_plugins
 
+            if self._result_format == "records":
+                result["structure"] = records.to_records(result["structure"])
+
+            self._parse_result = result
             return result
 
         except MarkdownSecurityError:
@@ -453,6 +891,125 @@ class MarkdownParserCore:
                 {"original_error": str(e), "error_type": type(e).__name__},
             ) from e
 
+    def _parse_subset(self, include: Iterable[str]) -> dict[str, Any]:
+        """Compute only the requested structure fields / result parts.
+
+        Args:
+            include: Structure field names and/or "metadata", "mappings"
+
+        Returns:
+            Result dict with "content", "structure" (requested fields only) and
+            any requested result parts
+        """
+        wanted = set(include)
+        unknown = wanted - set(self.STRUCTURE_FIELDS) - set(self.RESULT_PARTS)
+        if unknown:
+            raise ValueError(
+                f"Unknown parse() include: {sorted(unknown)}. "
+                f"Available: {sorted([*self.STRUCTURE_FIELDS, *self.RESULT_PARTS])}"
+            )
+
+        try:
+            self._check_token_count()
+
+            view = self.structure
+            structure = view.to_dict(wanted)
+            result: dict[str, Any] = {}
+
+            if "metadata" in wanted:
+                # Security metadata reads frontmatter and HTML from the structure
+                meta_view = {**structure}
+                for name in ("frontmatter", "html_blocks", "html_inline"):
+                    if name not in meta_view:
+                        meta_view[name] = view[name]
+                result["metadata"] = self._extract_metadata(meta_view)
+
+            result["content"] = {"raw": self.content, "lines": self.lines}
+            result["structure"] = structure
+
+            if "mappings" in wanted:
+                result["mappings"] = self._build_mappings()
+
+            if "metadata" in wanted:
+                result = self._apply_security_policy(result)
+                security = result["metadata"]["security"]
+            else:
+                policy_applied = self._enforce_structure_policy(structure)
+                security = {}
+                result["metadata"] = {"security": security}
+                if policy_applied:
+                    result["metadata"]["security_policies_applied"] = policy_applied
+
+            # Record security profile used and any rejected plugins
+            security["profile_used"] = self.security_profile
+            if self.rejected_plugins:
+                security["rejected_plugins"] = self.rejected_plugins
+
+            if self._result_format == "records":
+                result["structure"] = records.to_records(result["structure"])
+
+            return result
+
+        except MarkdownSecurityError:
+            raise
+        except Exception as e:
+            raise MarkdownSecurityError(
+                f"Parsing failed: {str(e)}",
+                self.security_profile,
+                {"original_error": str(e), "error_type": type(e).__name__},
+            ) from e
+
+    def _publish_structure(self, structure: dict[str, Any], html_data: dict[str, Any]) -> None:
+        """Seed _cache with freshly extracted structure fields (if not cached yet)."""
+        for name, (key, _) in self.STRUCTURE_FIELDS.items():
+            if self._cache[key] is not None:
+                continue
+            if key == "html":
+                self._cache[key] = html_data
+            elif name in structure:
+                self._cache[key] = structure[name]
+
+    def _dispatch_tree_extractors(self) -> dict[str, Any]:
+        """Run all tree-based extractors in a single dispatched walk.
+
+        Each extractor registers a collector for the node types it handles, so
+        the tree is traversed once instead of once per extractor. Results are
+        identical to calling the individual _extract_* methods.
+
+        Returns:
+            Dict keyed by collector name (paragraphs, lists, tables, code_blocks,
+            blockquotes, tasklists, footnotes, html), plus headings from the
+            shared heading index
+        """
+        dispatcher = NodeDispatcher()
+        dispatcher.register(paragraphs.paragraph_collector(
+            self._paragraph_features, self._find_section_id
+        ))
+        dispatcher.register(lists.list_collector(self._extract_list_items, self._find_section_id))
+        dispatcher.register(tables.table_collector(
+            self.lines, self._find_section_id, self._slice_lines_raw
+        ))
+        if self._cache["code_blocks"] is None:
+            dispatcher.register(codeblocks.code_block_collector(
+                self.lines, self._find_section_id, self._slice_lines_inclusive, self._cache
+            ))
+        dispatcher.register(blockquotes.blockquote_collector(self._find_section_id, self._get_text))
+        dispatcher.register(lists.tasklist_collector(
+            self._extract_tasklist_items, self._find_section_id
+        ))
+        if "footnote" in self.enabled_plugins:
+            dispatcher.register(footnotes.footnote_collector(self._find_section_id, self._get_text))
+        dispatcher.register(html.html_collector(
+            self.warehouse, self.config, self._find_section_id, self._slice_lines_raw
+        ))
+
+        results = dispatcher.run(self.tree)
+        # Headings come from the shared heading index, not the tree walk
+        results["headings"] = self._extract_headings()
+        if "code_blocks" not in results:
+            results["code_blocks"] = self._cache["code_blocks"]
+        return results
+
     def _apply_security_policy(self, result: dict[str, Any]) -> dict[str, Any]:
         """
         Apply security policy enforcement based on metadata signals.
@@ -517,7 +1074,60 @@ class MarkdownParserCore:
             )
             policy_applied.append("embedding_blocked_frame")
 
-        # 2. Strip HTML blocks when allows_html=False
+        # 2./3. Strip HTML, drop unsafe links/images
+        policy_applied.extend(self._enforce_structure_policy(structure))
+
+        # 4. Quarantine documents with risky features
+        # Check for ragged tables
+        if security["statistics"].get("ragged_tables_count", 0) > 0:
+            quarantine_reasons.append(
+                f"ragged_tables:{security['statistics']['ragged_tables_count']}"
+            )
+
+        # Check for long footnote definitions (potential payload hiding)
+        if structure.get("footnotes"):
+            definitions = structure["footnotes"].get("definitions", [])
+            for footnote in definitions:
+                content = footnote.get("content", "")
+                if len(content) > 512:
+                    quarantine_reasons.append(f"long_footnote:{footnote.get('label', 'unknown')}")
+                    break
+
+        # Check for prompt injection in footnotes
+        if security.get("prompt_injection_in_footnotes"):
+            quarantine_reasons.append("prompt_injection_footnotes")
+
+        # Check for prompt injection in content
+        if security.get("prompt_injection_in_content"):
+            quarantine_reasons.append("prompt_injection_content")
+
+        # Set quarantine status if needed
+        if quarantine_reasons:
+            result["metadata"]["quarantined"] = True
+            result["metadata"]["quarantine_reasons"] = quarantine_reasons
+            # User can whitelist by checking quarantine_reasons
+
+        # Record what policies were applied
+        if policy_applied:
+            result["metadata"]["security_policies_applied"] = policy_applied
+
+        return result
+
+    def _enforce_structure_policy(self, structure: dict[str, Any]) -> list[str]:
+        """Strip HTML (when allows_html=False) and drop unsafe links/images.
+
+        Modifies ``structure`` in place by replacing lists (list items are not
+        mutated, so memoized extractor results stay intact).
+
+        Args:
+            structure: Structure dict (any subset of fields)
+
+        Returns:
+            List of applied policy names
+        """
+        policy_applied = []
+
+        # Strip HTML blocks when allows_html=False
         if not self.allows_html:
             # Strip HTML blocks
             if structure.get("html_blocks"):
@@ -531,7 +1141,7 @@ class MarkdownParserCore:
                 structure["html_inline"] = []
                 policy_applied.append(f"stripped_{original_count}_html_inline")
 
-        # 3. Drop unsafe links/images
+        # Drop unsafe links/images
         # Filter links - remove those with disallowed schemes
         if structure.get("links"):
             safe_links = []
@@ -565,41 +1175,7 @@ class MarkdownParserCore:
                 structure["images"] = safe_images
                 policy_applied.append(f"dropped_{dropped_count}_unsafe_images")
 
-        # 4. Quarantine documents with risky features
-        # Check for ragged tables
-        if security["statistics"].get("ragged_tables_count", 0) > 0:
-            quarantine_reasons.append(
-                f"ragged_tables:{security['statistics']['ragged_tables_count']}"
-            )
-
-        # Check for long footnote definitions (potential payload hiding)
-        if structure.get("footnotes"):
-            definitions = structure["footnotes"].get("definitions", [])
-            for footnote in definitions:
-                content = footnote.get("content", "")
-                if len(content) > 512:
-                    quarantine_reasons.append(f"long_footnote:{footnote.get('label', 'unknown')}")
-                    break
-
-        # Check for prompt injection in footnotes
-        if security.get("prompt_injection_in_footnotes"):
-            quarantine_reasons.append("prompt_injection_footnotes")
-
-        # Check for prompt injection in content
-        if security.get("prompt_injection_in_content"):
-            quarantine_reasons.append("prompt_injection_content")
-
-        # Set quarantine status if needed
-        if quarantine_reasons:
-            result["metadata"]["quarantined"] = True
-            result["metadata"]["quarantine_reasons"] = quarantine_reasons
-            # User can whitelist by checking quarantine_reasons
-
-        # Record what policies were applied
-        if policy_applied:
-            result["metadata"]["security_policies_applied"] = policy_applied
-
-        return result
+        return policy_applied
 
     def sanitize(
         self, policy: dict[str, Any] | None = None, security_profile: str | None = None
@@ -708,6 +1284,15 @@ class MarkdownParserCore:
         if hasattr(self, "frontmatter_error"):
             metadata["frontmatter_error"] = self.frontmatter_error
 
+        # URL verdict cache effectiveness for this parse (opt-in, not deterministic)
+        if self.config.get("url_cache_stats", False):
+            lookups = self._url_stats["hits"] + self._url_stats["misses"]
+            metadata["url_cache"] = {
+                "lookups": lookups,
+                "hits": self._url_stats["hits"],
+                "hit_rate": round(self._url_stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
         return metadata
 
     def _generate_security_metadata(self, structure: dict[str, Any]) -> dict[str, Any]:
@@ -815,8 +1400,11 @@ class MarkdownParserCore:
                 )
                 break
 
+        # One scanner pass over the raw content for every raw-pattern check below
+        raw_hits = security_validators.RAW_SCANNER.first_hits(raw_content)
+
         # Style-based JavaScript injection detection
-        if self._STYLE_JS_PAT.search(raw_content):
+        if "style_js" in raw_hits:
             security["statistics"]["has_style_scriptless"] = True
             security["warnings"].append(
                 {
@@ -827,7 +1415,7 @@ class MarkdownParserCore:
             )
 
         # Meta refresh detection (can be used for redirects)
-        if self._META_REFRESH_PAT.search(raw_content):
+        if "meta_refresh" in raw_hits:
             security["statistics"]["has_meta_refresh"] = True
             security["warnings"].append(
                 {
@@ -838,7 +1426,7 @@ class MarkdownParserCore:
             )
 
         # Frame-like element detection (iframe, object, embed)
-        if self._FRAMELIKE_PAT.search(raw_content):
+        if "frame_like" in raw_hits:
             security["statistics"]["has_frame_like"] = True
             security["warnings"].append(
                 {
@@ -884,7 +1472,7 @@ class MarkdownParserCore:
                     link_schemes["relative"] = link_schemes.get("relative", 0) + 1
 
             # Check for path traversal with comprehensive detection
-            if self._check_path_traversal(url):
+            if self._url_verdict(url).path_traversal:
                 security["statistics"]["path_traversal_pattern"] = True
                 security["warnings"].append(
                     {
@@ -907,12 +1495,16 @@ class MarkdownParserCore:
             )
 
         # Comprehensive Unicode security checks
-        unicode_issues = self._check_unicode_spoofing(raw_content)
+        unicode_issues = self._check_unicode_spoofing(raw_content, raw_hits)
+        unicode_offsets = unicode_issues["offsets"]
+        unicode_lines = {
+            key: raw_content.count("\n", 0, offset) for key, offset in unicode_offsets.items()
+        }
 
         # Basic Unicode checks
-        if "\xa0" in raw_content or "\u00a0" in raw_content:
+        if "nbsp" in raw_hits:
             security["statistics"]["nbsp_present"] = True
-        if "\u200b" in raw_content or "\u200c" in raw_content or "\u200d" in raw_content:
+        if "zero_width" in raw_hits:
             security["statistics"]["zwsp_present"] = True
 
         # BiDi control detection
@@ -922,7 +1514,8 @@ class MarkdownParserCore:
             security["warnings"].append(
                 {
                     "type": "bidi_controls",
-                    "line": None,
+                    "line": unicode_lines.get("has_bidi"),
+                    "offset": unicode_offsets.get("has_bidi"),
                     "message": "Document contains BiDi control characters (potential text direction manipulation)",
                 }
             )
@@ -935,7 +1528,8 @@ class MarkdownParserCore:
             security["warnings"].append(
                 {
                     "type": "confusable_characters",
-                    "line": None,
+                    "line": unicode_lines.get("has_confusables"),
+                    "offset": unicode_offsets.get("has_confusables"),
                     "message": "Document contains confusable Unicode characters (potential homograph attack)",
                 }
             )
@@ -946,7 +1540,8 @@ class MarkdownParserCore:
             security["warnings"].append(
                 {
                     "type": "mixed_scripts",
-                    "line": None,
+                    "line": unicode_lines.get("has_mixed_scripts"),
+                    "offset": unicode_offsets.get("has_mixed_scripts"),
                     "message": "Document mixes multiple scripts with Latin (potential spoofing)",
                 }
             )
@@ -957,7 +1552,8 @@ class MarkdownParserCore:
             security["warnings"].append(
                 {
                     "type": "invisible_characters",
-                    "line": None,
+                    "line": unicode_lines.get("has_invisible_chars"),
+                    "offset": unicode_offsets.get("has_invisible_chars"),
                     "message": "Document contains invisible/zero-width characters",
                 }
             )
@@ -974,104 +1570,89 @@ class MarkdownParserCore:
         security["statistics"]["unicode_risk_score"] = unicode_risk_score
 
         # Scan raw content for disallowed link schemes that markdown-it might not parse (Phase 6 Task 6.1)
-        scheme_scan = security_validators.scan_raw_for_disallowed_schemes(raw_content)
-        if scheme_scan["found"]:
+        scheme_hits = [hit for hit in raw_hits.values() if hit.name in security_validators.DISALLOWED_SCHEMES_RAW]
+        if scheme_hits:
             security["link_disallowed_schemes_raw"] = True
             security["warnings"].append(
                 {
                     "type": "disallowed_schemes_raw",
-                    "message": f"Raw content contains potentially dangerous scheme: {scheme_scan['match']}",
+                    "message": f"Raw content contains potentially dangerous scheme: {scheme_hits[0].text}",
                 }
             )
 
         # RAG Safety: Comprehensive prompt injection detection
-
-        # Check main content (Phase 6 Task 6.1)
-        if security_validators.check_prompt_injection(raw_content):
+        # One matcher pass over the document and all text-bearing structures
+        code_blocks = self._get_cached("code_blocks", self._extract_code_blocks)
+        footnotes = structure.get("footnotes", {})
+        injection_hits = self._scan_prompt_injection(
+            raw_content, images, links, code_blocks, tables, footnotes
+        )
+        injected: dict[str, dict[int, dict[str, Any]]] = {}
+        for hit in injection_hits:
+            injected.setdefault(hit["source"], {}).setdefault(hit["index"], hit)
+        if injection_hits:
+            security["prompt_injection_hits"] = injection_hits[: config.MAX_INJECTION_HITS_REPORTED]
+
+        # Check main content
+        if "content" in injected:
             security["statistics"]["suspected_prompt_injection"] = True
             security["warnings"].append(
                 {
                     "type": "prompt_injection",
-                    "line": None,
+                    "line": injected["content"][0]["line"],
                     "message": "Suspected prompt injection patterns detected in content",
                 }
             )
 
         # Check all image alt/title text
-        for img in images:
-            alt_text = img.get("alt", "")
-            title = img.get("title", "")
-            if security_validators.check_prompt_injection(alt_text) or security_validators.check_prompt_injection(title):
-                security["statistics"]["prompt_injection_in_images"] = True
-                security["warnings"].append(
-                    {
-                        "type": "prompt_injection_image",
-                        "line": img.get("line"),
-                        "message": "Prompt injection in image alt/title text",
-                    }
-                )
-                break
+        if "image" in injected:
+            security["statistics"]["prompt_injection_in_images"] = True
+            security["warnings"].append(
+                {
+                    "type": "prompt_injection_image",
+                    "line": images[min(injected["image"])].get("line"),
+                    "message": "Prompt injection in image alt/title text",
+                }
+            )
 
         # Check all link titles
-        for link in links:
-            title = link.get("title", "")
-            text = link.get("text", "")
-            if security_validators.check_prompt_injection(title) or security_validators.check_prompt_injection(text):
-                security["statistics"]["prompt_injection_in_links"] = True
-                security["warnings"].append(
-                    {
-                        "type": "prompt_injection_link",
-                        "line": link.get("line"),
-                        "message": "Prompt injection in link text/title",
-                    }
-                )
-                break
+        if "link" in injected:
+            security["statistics"]["prompt_injection_in_links"] = True
+            security["warnings"].append(
+                {
+                    "type": "prompt_injection_link",
+                    "line": links[min(injected["link"])].get("line"),
+                    "message": "Prompt injection in link text/title",
+                }
+            )
 
         # Check code block content (even though not rendered, could be copied)
-        code_blocks = self._get_cached("code_blocks", self._extract_code_blocks)
-        for block in code_blocks:
-            code = block.get("code", "")
-            if security_validators.check_prompt_injection(code):
-                security["statistics"]["prompt_injection_in_code"] = True
+        if "code" in injected:
+            security["statistics"]["prompt_injection_in_code"] = True
+            security["warnings"].append(
+                {
+                    "type": "prompt_injection_code",
+                    "line": code_blocks[min(injected["code"])].get("start_line"),
+                    "message": "Prompt injection patterns in code block",
+                }
+            )
+
+        # Check table cell content (one warning for headers, one for rows, per table)
+        for index, table in enumerate(tables):
+            for part in ("table_header", "table_cell"):
+                if index not in injected.get(part, {}):
+                    continue
+                security["statistics"]["prompt_injection_in_tables"] = True
                 security["warnings"].append(
                     {
-                        "type": "prompt_injection_code",
-                        "line": block.get("start_line"),
-                        "message": "Prompt injection patterns in code block",
+                        "type": "prompt_injection_table",
+                        "line": table.get("start_line"),
+                        "message": "Prompt injection in table content",
                     }
                 )
-                break
-
-        # Check table cell content
-        for table in tables:
-            # Check headers
-            for header in table.get("headers", []):
-                if security_validators.check_prompt_injection(header):
-                    security["statistics"]["prompt_injection_in_tables"] = True
-                    security["warnings"].append(
-                        {
-                            "type": "prompt_injection_table",
-                            "line": table.get("start_line"),
-                            "message": "Prompt injection in table content",
-                        }
-                    )
-                    break
-            # Check rows
-            for row in table.get("rows", []):
-                if any(security_validators.check_prompt_injection(cell) for cell in row):
-                    security["statistics"]["prompt_injection_in_tables"] = True
-                    security["warnings"].append(
-                        {
-                            "type": "prompt_injection_table",
-                            "line": table.get("start_line"),
-                            "message": "Prompt injection in table content",
-                        }
-                    )
-                    break
 
         # RAG Safety: Check footnotes for injection
-        footnotes = structure.get("footnotes", {})
-        if self._check_footnote_injection(footnotes):
+        if self._check_footnote_injection(footnotes, set(injected.get("footnote", {}))):
             security["statistics"]["footnote_injection"] = True
             security["warnings"].append(
                 {
@@ -1144,7 +1725,7 @@ class MarkdownParserCore:
         # RAG Safety: Raw scan for dangerous patterns that might bypass tokenizer
         dangerous_schemes = ["javascript:", "vbscript:", "data:text/html", "file:"]
         for scheme in dangerous_schemes:
-            if scheme in raw_content.lower():
+            if scheme in raw_hits:
                 security["statistics"]["raw_dangerous_schemes"] = True
                 security["warnings"].append(
                     {
@@ -1202,6 +1783,8 @@ class MarkdownParserCore:
         Returns:
             Joined string content with newlines preserved
         """
+        if isinstance(self.lines, SourceLines):
+            return self.lines.span(start_line, end_line)
         return line_utils.slice_lines_raw(self.lines, start_line, end_line)
 
     def _extract_frontmatter(self) -> dict | None:
@@ -1215,20 +1798,19 @@ class MarkdownParserCore:
             Frontmatter dict or None if not present
         """
         # Find front_matter token (plugin creates this)
-        for token in self.tokens:
-            if hasattr(token, 'type') and token.type == 'front_matter':
-                # Token content is the raw YAML string
-                yaml_content = token.content
-                if yaml_content:
-                    try:
-                        parsed_yaml = yaml.safe_load(yaml_content)
-                        # Return parsed YAML if it's a dict or list
-                        if isinstance(parsed_yaml, (dict, list)):
-                            return parsed_yaml
-                    except yaml.YAMLError:
-                        # Invalid YAML - return None
-                        pass
-                break
+        token = self.warehouse.first_of_type("front_matter")
+        if token is not None:
+            # Token content is the raw YAML string
+            yaml_content = token.content
+            if yaml_content:
+                try:
+                    parsed_yaml = yaml.safe_load(yaml_content)
+                    # Return parsed YAML if it's a dict or list
+                    if isinstance(parsed_yaml, (dict, list)):
+                        return parsed_yaml
+                except yaml.YAMLError:
+                    # Invalid YAML - return None
+                    pass
         return None
 
     # Phase 6 Task 6.1: Removed get_total_hrule_count() - broken after frontmatter plugin migration
@@ -1243,17 +1825,15 @@ class MarkdownParserCore:
         Phase 7.6.1: Delegated to extractors/sections.py
         """
         result = sections.extract_sections(
-            self.tree,
+            self._get_heading_index(),
             self.lines,
-            self.process_tree,
-            self._heading_level,
-            self._get_text,
             self._slice_lines_raw,
             self._plain_text_in_range,
             self._span_from_lines,
             self._cache
         )
         self._sections = result
+        self._section_index = SectionIndex(result)
         return result
 
     def _extract_paragraphs(self) -> list[dict]:
@@ -1264,9 +1844,8 @@ class MarkdownParserCore:
         return paragraphs.extract_paragraphs(
             self.tree,
             self.process_tree,
-            self._get_text,
-            self._find_section_id,
-            self._has_child_type
+            self._paragraph_features,
+            self._find_section_id
         )
 
     def _extract_lists(self) -> list[dict]:
@@ -1338,7 +1917,8 @@ class MarkdownParserCore:
             self.tree,
             self.lines,
             self.process_tree,
-            self._find_section_id
+            self._find_section_id,
+            self._slice_lines_raw
         )
 
     def _extract_code_blocks(self) -> list[dict]:
@@ -1363,14 +1943,15 @@ class MarkdownParserCore:
 
         Phase 7.6.1: Delegated to extractors/sections.py
         """
-        return sections.extract_headings(
-            self.tree,
-            self.tokens,
-            self.process_tree,
-            self._heading_level,
-            self._get_text,
-            self._span_from_lines
-        )
+        return sections.extract_headings(self._get_heading_index(), self._span_from_lines)
+
+    def _get_heading_index(self) -> list[sections.HeadingEntry]:
+        """Heading index shared by sections and headings (built once per parse)."""
+        if self._heading_index is None:
+            self._heading_index = sections.build_heading_index(
+                self.warehouse, self._heading_level, self._text_cache.token_text
+            )
+        return self._heading_index
 
     def _extract_links(self) -> list[dict]:
         """Extract links robustly using token parsing.
@@ -1378,7 +1959,7 @@ class MarkdownParserCore:
         Phase 7.6.6: Delegated to extractors/links.py
         """
         return links.extract_links(
-            self.tokens,
+            self.warehouse,
             self._process_inline_tokens
         )
 
@@ -1393,9 +1974,18 @@ class MarkdownParserCore:
             line_map,
             self._effective_allowed_schemes,
             security_validators,
-            media
+            media,
+            self._url_verdict,
         )
 
+    def _url_verdict(self, url: str) -> url_cache.UrlVerdict:
+        """Return the shared verdict (scheme, type, traversal, image kind) for a URL.
+
+        Backed by the process-wide url_cache; lookups are counted per parser
+        and reported in metadata["url_cache"].
+        """
+        return url_cache.get_verdict(url, self._allowed_schemes_key, self._url_stats)
+
     # Phase 7 Task 7.5.1: _generate_image_id() moved to extractors/media.py
     # Phase 7 Task 7.5.1: _determine_image_metadata() moved to extractors/media.py
 
@@ -1405,7 +1995,9 @@ class MarkdownParserCore:
         Returns unified image records with stable IDs that can be joined
         with image references in links.
         """
-        return media.extract_images(self.tokens, self._effective_allowed_schemes, self._cache)
+        return media.extract_images(
+            self.warehouse, self._effective_allowed_schemes, self._cache, self._url_verdict
+        )
 
     # Phase 7 Task 7.5.1: _process_inline_tokens_for_images() moved to extractors/media.py
 
@@ -1454,7 +2046,7 @@ class MarkdownParserCore:
         """
         return html.extract_html(
             self.tree,
-            self.tokens,
+            self.warehouse,
             self.config,
             self.process_tree,
             self._find_section_id,
@@ -1473,7 +2065,7 @@ class MarkdownParserCore:
         """
         print("Extracting math...")
         return math.extract_math(
-            self.tokens
+            self.warehouse
         )
 
     def _build_mappings(self) -> dict[str, Any]:
@@ -1481,30 +2073,16 @@ class MarkdownParserCore:
 
         Phase 6: Pure token-based classification using AST code blocks.
         No ContentContext - classification derived entirely from markdown-it tokens.
-        """
-        mappings = {
-            "line_to_type": {},
-            "line_to_section": {},
-            "prose_lines": [],
-            "code_lines": [],
-            "code_blocks": [],  # Expose code blocks with language
-        }
-
-        # Initialize all lines as prose (default assumption)
-        for i in range(len(self.lines)):
-            mappings["prose_lines"].append(i)
-            mappings["line_to_type"][str(i)] = "prose"
 
+        Lines are classified into a LineMappings (flat arrays); the legacy
+        dict shape is materialized once by LineMappings.to_dict().
+        """
         # Build section mappings directly to avoid circular dependency
         sections = self._sections or self._get_cached("sections", self._extract_sections)
-        for section in sections:
-            if section["start_line"] is not None and section["end_line"] is not None:
-                for line_num in range(section["start_line"], section["end_line"] + 1):
-                    if 0 <= line_num < len(self.lines):  # Bounds check
-                        mappings["line_to_section"][str(line_num)] = section["id"]
+        line_mappings = LineMappings(len(self.lines), sections)
 
         # Cache mappings for O(1) lookups in _find_section_id
-        self._mappings_cache = mappings
+        self._line_mappings = line_mappings
 
         # Pure token-based code block classification (Phase 6)
         # Extract code blocks from AST and mark those lines as code
@@ -1514,28 +2092,12 @@ class MarkdownParserCore:
                 s, e = b.get("start_line"), b.get("end_line")
                 if s is None or e is None:
                     continue
-
-                # Add to code_blocks list for mappings
                 # Note: structure uses exclusive end_line, but mappings uses inclusive for backward compat
-                mappings["code_blocks"].append({
-                    "start_line": s,
-                    "end_line": e - 1,  # Convert exclusive to inclusive
-                    "language": b.get("language"),
-                })
-
-                # Mark these lines as code (end_line from structure is exclusive)
-                for ln in range(s, e):
-                    mappings["line_to_type"][str(ln)] = "code"
-                    # Remove from prose_lines if present
-                    if ln in mappings["prose_lines"]:
-                        mappings["prose_lines"].remove(ln)
-                    # Add to code_lines if not present
-                    if ln not in mappings["code_lines"]:
-                        mappings["code_lines"].append(ln)
+                line_mappings.add_code_block(s, e, b.get("language"))
         except Exception:
             pass
 
-        return mappings
+        return line_mappings.to_dict()
 
     def _plain_text_in_range(self, start_line: int, end_line: int) -> str:
         """Extract plain text from a line range with proper paragraph boundaries.
@@ -1543,14 +2105,19 @@ class MarkdownParserCore:
         Behavior: Detects blank lines between segments and inserts '\n\n'
         for paragraph boundaries. Consecutive segments are joined with a space.
         This preserves paragraph structure in the plain text output.
+
+        Only segments overlapping the range are visited (bisect index), so
+        filling every section is linear in the total text produced.
         """
+        if self._text_segments is None:
+            self._collect_text_segments()
         parts: list[str] = []
         last_end = None
 
-        for s, e, txt in getattr(self, "_text_segments", []):
-            if e < start_line or s > end_line:
-                continue
-
+        segments = text_utils.segments_in_range(
+            self._text_segments, self._text_segment_index, start_line, end_line
+        )
+        for s, e, txt in segments:
             # Check for gaps between segments
             if last_end is not None:
                 if s > last_end + 1:
@@ -1568,12 +2135,18 @@ class MarkdownParserCore:
 
     def _collect_text_segments(self) -> None:
         """Collect text-ish segments with proper line ranges for better paragraph boundary detection."""
-        self._text_segments = text_utils.collect_text_segments(self.tokens)
+        self._text_segments = text_utils.collect_text_segments(
+            self.warehouse.tokens_of_type("inline")
+        )
+        self._text_segment_index = text_utils.index_text_segments(self._text_segments)
 
     # Utility methods
 
     def _heading_level(self, node) -> int:
-        """Robust heading level detection (ATX + Setext)."""
+        """Robust heading level detection (ATX + Setext).
+
+        Accepts a heading node or its heading_open token (same markup).
+        """
         tok = getattr(node, "token", None)
         tag = getattr(tok, "tag", "") if tok else ""
         if tag.startswith("h") and tag[1:].isdigit():
@@ -1584,163 +2157,176 @@ class MarkdownParserCore:
         return 1
 
     def _get_text(self, node) -> str:
-        """Get all text content from a node and its children, preserving breaks and alt text."""
-        text_parts = []
-
-        def text_collector(n, ctx, level):
-            t = getattr(n, "type", "")
-            if t == "text" and getattr(n, "content", "") or t == "code_inline" and getattr(n, "content", ""):
-                ctx.append(n.content)
-            elif t == "softbreak" or t == "hardbreak":
-                ctx.append("\n")
-            elif t == "image":
-                # Prefer token.content (canonical alt text), fall back to attrGet('alt')
-                alt = ""
-                tok = getattr(n, "token", None)
-                if tok:
-                    try:
-                        # Prefer token.content - this is where markdown-it puts the canonical alt text
-                        alt = getattr(tok, "content", "") or tok.attrGet("alt") or ""
-                    except Exception:
-                        alt = ""
-                if alt:
-                    ctx.append(alt)
-            return True
-
-        self.process_tree(node, text_collector, text_parts)
-        return "".join(text_parts)
+        """Get all text content from a node and its children, preserving breaks and alt text.
+
+        Memoized per parse: each subtree is textified once (see NodeTextCache).
+        """
+        return self._text_cache.text(node)
+
+    def _paragraph_features(self, node) -> tuple[str, int, bool, bool, bool]:
+        """Text, word count and link/emphasis/code flags of a paragraph in one walk.
+
+        The text is recorded in the node text cache for later _get_text calls.
+        """
+        features = text_utils.paragraph_features(node)
+        self._text_cache.seed(node, features[0])
+        return features
 
     def _check_path_traversal(self, url: str) -> bool:
         """
         Comprehensive path traversal detection.
 
+        Delegates to security_validators.check_path_traversal().
+
         Args:
             url: URL or path to check
 
         Returns:
             True if path traversal detected, False otherwise
         """
-        if not url:
-            return False
-
-        # URL decode first (handle multiple encoding levels)
-        decoded = url
-        for _ in range(3):  # Handle triple encoding
-            try:
-                prev = decoded
-                decoded = urllib.parse.unquote(decoded)
-                if prev == decoded:
-                    break
-            except:
-                return True  # Suspicious if can't decode
-
-        # Convert to lowercase for pattern matching
-        decoded_lower = decoded.lower()
-
-        # Check for file:// scheme first (always suspicious in web context)
-        if decoded_lower.startswith("file://"):
-            return True
-
-        # Check multiple path traversal patterns
-        patterns = [
-            "../",
-            "..\\",  # Direct traversal
-            "..%2f",
-            "..%5c",  # Mixed encoding
-            "%2e%2e/",
-            "%2e%2e\\",  # Fully encoded
-            "%2e%2e%2f",
-            "%2e%2e%5c",  # Fully encoded variations
-            "%252e%252e",  # Double encoded
-            "..;",
-            "..//",  # Variations
-            "//",
-            "\\\\",  # UNC paths
-            "%5c%5c",  # Encoded UNC paths
-            "file://",
-            "file:\\",  # File protocol
-        ]
-
-        # Check for Windows drive letters
-        if re.match(r"^[a-z]:[/\\]", decoded_lower):
-            return True
-
-        for pattern in patterns:
-            if pattern in decoded_lower:
-                return True
+        return security_validators.check_path_traversal(url)
 
-        # Normalize path and check
-        try:
-            # Use posixpath for consistent handling
-            normalized = posixpath.normpath(decoded)
-
-            # Check if path tries to escape
-            if normalized.startswith(".."):
-                return True
-            if "/../" in normalized or "/.." in normalized:
-                return True
-
-            # Check for absolute paths that might be suspicious
-            if normalized.startswith("/etc/") or normalized.startswith("/proc/"):
-                return True
-
-        except:
-            return True  # Suspicious if can't normalize
-
-        return False
-
-    def _check_unicode_spoofing(self, text: str) -> dict[str, bool]:
+    def _check_unicode_spoofing(
+        self, text: str, raw_hits: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """
-        Detect Unicode spoofing attempts including BiDi and confusables with size limits.
+        Detect Unicode spoofing attempts including BiDi and confusables.
 
         Phase 6 Task 6.1: Wrapper around security_validators.detect_unicode_issues()
         with additional BiDi controls check and legacy field names for backward compatibility.
+        The whole text is checked.
 
         Args:
             text: Text to check
+            raw_hits: Optional RAW_SCANNER.first_hits(text) result to reuse
 
         Returns:
-            Dictionary with spoofing indicators (legacy field names for backward compatibility)
+            Dictionary with spoofing indicators (legacy field names for backward
+            compatibility) and "offsets": indicator -> offset of the first
+            offending character
         """
-        # Skip very large texts
-        if not text or len(text) > 100000:
+        if not text:
             return {
                 "has_bidi": False,
                 "has_confusables": False,
                 "has_mixed_scripts": False,
                 "has_invisible_chars": False,
                 "has_zero_width": False,
+                "offsets": {},
             }
 
         # Use centralized security validator
-        unicode_issues = security_validators.detect_unicode_issues(text, max_scan_bytes=10240)
+        unicode_issues = security_validators.detect_unicode_issues(text)
+        found = unicode_issues["offsets"]
 
         # Check for BiDi control characters (legacy check, not in centralized validator)
-        has_bidi_controls = False
-        for char in self._BIDI_CONTROLS:
-            if char in text[:10000]:  # Check first 10KB only
-                has_bidi_controls = True
-                break
+        if raw_hits is None:
+            raw_hits = security_validators.RAW_SCANNER.first_hits(text, ["bidi_control"])
+        bidi_offsets = [found[k] for k in ("has_bidi_override",) if k in found]
+        if "bidi_control" in raw_hits:
+            bidi_offsets.append(raw_hits["bidi_control"].start)
+
+        offsets = {}
+        if bidi_offsets:
+            offsets["has_bidi"] = min(bidi_offsets)
+        for key, legacy in (
+            ("has_confusables", "has_confusables"),
+            ("has_mixed_scripts", "has_mixed_scripts"),
+            ("has_zero_width", "has_invisible_chars"),
+        ):
+            if key in found:
+                offsets[legacy] = found[key]
 
         # Map to legacy field names for backward compatibility
         return {
-            "has_bidi": unicode_issues["has_bidi_override"] or has_bidi_controls,
+            "has_bidi": bool(bidi_offsets),
             "has_confusables": unicode_issues["has_confusables"],
             "has_mixed_scripts": unicode_issues["has_mixed_scripts"],
             "has_invisible_chars": unicode_issues["has_zero_width"],
             "has_zero_width": unicode_issues["has_zero_width"],
+            "offsets": offsets,
         }
 
     # Phase 6 Task 6.1: _check_prompt_injection() moved to security_validators.check_prompt_injection()
 
     # Phase 6 Task 6.1: _validate_link_scheme() moved to security_validators.validate_link_scheme()
 
-    def _check_footnote_injection(self, footnotes: dict) -> bool:
+    def _scan_prompt_injection(
+        self,
+        raw_content: str,
+        images: list[dict],
+        links: list[dict],
+        code_blocks: list[dict],
+        tables: list[dict],
+        footnotes: dict,
+    ) -> list[dict[str, Any]]:
+        """Scan the document and its text-bearing structures for prompt injection.
+
+        All texts are scanned in one PROMPT_INJECTION_MATCHER call over their
+        concatenation; each hit is mapped back to the element it came from.
+
+        Args:
+            raw_content: Full document
+            images, links, code_blocks, tables: Extracted structures
+            footnotes: Extracted footnotes dict
+
+        Returns:
+            Hits in document-then-structure order, each a dict with source
+            ("content", "image", "link", "code", "table_header", "table_cell",
+            "footnote"), index (element index), line, pattern and match
+        """
+        # (source, element index, line, text)
+        segments: list[tuple[str, int, int | None, str]] = [("content", 0, None, raw_content)]
+        for i, img in enumerate(images):
+            segments.append(("image", i, img.get("line"), img.get("alt", "")))
+            segments.append(("image", i, img.get("line"), img.get("title", "")))
+        for i, link in enumerate(links):
+            segments.append(("link", i, link.get("line"), link.get("title", "")))
+            segments.append(("link", i, link.get("line"), link.get("text", "")))
+        for i, block in enumerate(code_blocks):
+            segments.append(("code", i, block.get("start_line"), block.get("content", "")))
+        for i, table in enumerate(tables):
+            line = table.get("start_line")
+            for header in table.get("headers", []):
+                segments.append(("table_header", i, line, header))
+            for row in table.get("rows", []):
+                for cell in row:
+                    segments.append(("table_cell", i, line, cell))
+        if footnotes and isinstance(footnotes, dict):
+            for i, footnote in enumerate(footnotes.get("definitions", [])):
+                segments.append(("footnote", i, footnote.get("start_line"), footnote.get("content", "")))
+
+        hits = security_validators.PROMPT_INJECTION_MATCHER.scan_segments([seg[3] for seg in segments])
+
+        results = []
+        line = 0
+        counted_to = 0
+        for hit in hits:
+            source, index, element_line, _ = segments[hit.segment]
+            if source == "content":
+                # Content hits are in offset order: count newlines incrementally
+                line += raw_content.count("\n", counted_to, hit.start)
+                counted_to = hit.start
+                element_line = line
+            results.append(
+                {
+                    "source": source,
+                    "index": index,
+                    "line": element_line,
+                    "pattern": hit.pattern,
+                    "match": hit.text[:100],
+                }
+            )
+        return results
+
+    def _check_footnote_injection(self, footnotes: dict, injected: set[int] | None = None) -> bool:
         """
         Check for prompt injection in footnote definitions.
 
         Args:
             footnotes: Dictionary containing footnote definitions
+            injected: Indices of definitions already known to contain prompt
+                injection (from _scan_prompt_injection); checked here if None
 
         Returns:
             True if injection detected in footnotes, False otherwise
@@ -1749,9 +2335,12 @@ class MarkdownParserCore:
             return False
 
         definitions = footnotes.get("definitions", [])
-        for footnote in definitions:
+        for i, footnote in enumerate(definitions):
             content = footnote.get("content", "")
-            if security_validators.check_prompt_injection(content):
+            if injected is None:
+                if security_validators.check_prompt_injection(content):
+                    return True
+            elif i in injected:
                 return True
 
             # Also check for oversized footnotes (potential payload hiding)
@@ -1775,30 +2364,35 @@ class MarkdownParserCore:
         """Find which section a line belongs to.
 
         Optimized to use line mappings when available (O(1) lookup),
-        falls back to section iteration for early/unmapped lookups.
+        falls back to the section interval index for early/unmapped lookups,
+        returning the first (outermost) section containing the line.
         """
         # Try to use cached line mappings first (O(1) lookup)
-        if hasattr(self, "_mappings_cache") and self._mappings_cache:
-            section_id = self._mappings_cache.get("line_to_section", {}).get(str(line_number))
+        if self._line_mappings is not None:
+            section_id = self._line_mappings.section_id_of(line_number)
             if section_id:
                 return section_id
 
-        # Fall back to section iteration (O(n) lookup)
-        # Ensure sections are extracted (uses cache if available)
-        sections = self._sections or self._get_cached("sections", self._extract_sections)
+        # Fall back to the section interval index (O(log n) lookup)
+        return self._get_section_index().outermost_id(line_number)
 
-        for section in sections:
-            if section["start_line"] is not None and section["end_line"] is not None:
-                if section["start_line"] <= line_number <= section["end_line"]:
-                    return section["id"]
-        return None
+    def _get_section_index(self) -> SectionIndex:
+        """Return the interval index for the current sections.
 
-    def _has_child_type(self, node, types) -> bool:
-        """Check if node has children of specified type(s)."""
-        return text_utils.has_child_type(node, types)
+        Ensures sections are extracted (uses cache if available) and rebuilds
+        the index only if the section list changed.
+        """
+        sections = self._sections or self._get_cached("sections", self._extract_sections)
+        index = self._section_index
+        if index is None or index.sections is not sections:
+            index = self._section_index = SectionIndex(sections)
+        return index
 
     def _build_line_offsets(self) -> None:
         """Build array of character offsets for each line start."""
+        if isinstance(self.lines, SourceLines):
+            self._line_start_offsets, self._total_chars_with_lf = self.lines.starts, len(self.content)
+            return
         self._line_start_offsets, self._total_chars_with_lf = line_utils.build_line_offsets(self.lines)
 
     def _span_from_lines(
@@ -1855,16 +2449,14 @@ class MarkdownParserCore:
         """
         import hashlib
 
-        # Parse if not already done
-        if not hasattr(self, '_parsed') or not self._parsed:
-            self.parse()
+        # Parse if not already done (memoized)
+        result = self.parse()
 
         # Compute content hash
         normalized_content = self.content.encode('utf-8', errors='replace')
         content_hash = hashlib.sha256(normalized_content).hexdigest()
 
         # Extract security metadata
-        result = self.parse()
         security_meta = result['metadata']['security']
 
         # Build document tree from sections
@@ -1922,14 +2514,8 @@ class MarkdownParserCore:
         link_graph = {}
 
         links = self._get_cached("links", self._extract_links)
-        sections = self._get_cached("sections", self._extract_sections)
-
-        # Map line numbers to section IDs
-        line_to_section = {}
-        for section in sections:
-            if section.get('start_line') is not None and section.get('end_line') is not None:
-                for line in range(section['start_line'], section['end_line'] + 1):
-                    line_to_section[line] = section['id']
+        self._get_cached("sections", self._extract_sections)
+        index = self._get_section_index()
 
         # Build adjacency list for internal links
         for link in links:
@@ -1937,23 +2523,20 @@ class MarkdownParserCore:
             if line is None:
                 continue
 
-            source_section = line_to_section.get(line)
+            # Innermost section containing the link
+            source_section = index.innermost_id(line)
             if not source_section:
                 continue
 
             # Check if it's an anchor link (internal reference)
             url = link.get('url', '')
             if url.startswith('#'):
-                # Extract target slug from anchor
-                target_slug = url.lstrip('#')
-                # Find target section by slug
-                for section in sections:
-                    if section.get('slug') == target_slug:
-                        target_id = section['id']
-                        if source_section not in link_graph:
-                            link_graph[source_section] = []
-                        if target_id not in link_graph[source_section]:
-                            link_graph[source_section].append(target_id)
-                        break
+                # Extract target slug from anchor, find target section by slug
+                target_id = index.id_for_slug(url.lstrip('#'))
+                if target_id is not None:
+                    if source_section not in link_graph:
+                        link_graph[source_section] = []
+                    if target_id not in link_graph[source_section]:
+                        link_graph[source_section].append(target_id)
 
         return link_graph
@@ -0,0 +1,127 @@
+"""Tests for markdown/aio.py (ParseService, aparse)."""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from doxstrux.markdown import aio
+from doxstrux.markdown.aio import ParseQueueFull, ParseService, aparse
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.ir import DocumentIR
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = "# Title\n\nParagraph with [link](https://example.com).\n"
+TOO_BIG = "x" * (200 * 1024)  # Exceeds the strict profile content limit
+FORK = multiprocessing.get_context("fork")
+
+
+def _slow_parse(content, *args):
+    time.sleep(float(content))
+    return {"slept": content}
+
+
+def _crash(*args):
+    os._exit(1)
+
+
+class TestParseService:
+    """Tests for ParseService."""
+
+    def test_results_match_local_parse(self):
+        async def run():
+            async with ParseService(workers=2, profile="strict") as service:
+                result = await service.parse(DOC)
+                links = await service.parse(DOC, include={"links"})
+                ir = await service.parse(DOC, output="ir", source_id="doc.md")
+                return result, links, ir
+
+        result, links, ir = asyncio.run(run())
+        parser = MarkdownParserCore(DOC, security_profile="strict")
+        assert result == parser.parse()
+        assert list(links["structure"]) == ["links"]
+        assert isinstance(ir, DocumentIR)
+        assert ir.to_dict() == parser.to_ir(source_id="doc.md").to_dict()
+
+    def test_security_errors_are_raised(self):
+        async def run():
+            async with ParseService(workers=1, profile="strict") as service:
+                await service.parse(TOO_BIG)
+
+        with pytest.raises(MarkdownSizeError) as exc_info:
+            asyncio.run(run())
+        assert exc_info.value.security_profile == "strict"
+
+    def test_queue_full_and_slots_held_until_done(self, monkeypatch):
+        monkeypatch.setattr(aio, "_parse_in_worker", _slow_parse)
+
+        async def run():
+            async with ParseService(workers=1, max_pending=1, mp_context=FORK) as service:
+                first = asyncio.create_task(service.parse("0.5"))
+                await asyncio.sleep(0.1)
+                with pytest.raises(ParseQueueFull):
+                    await service.parse("0", wait=False)
+                with pytest.raises(TimeoutError):
+                    await service.parse("0", timeout=0.05)
+                assert service.pending == 1
+                assert await first == {"slept": "0.5"}
+                await asyncio.sleep(0.05)
+                assert service.pending == 0
+
+        asyncio.run(run())
+
+    def test_timeout_keeps_slot_until_worker_finishes(self, monkeypatch):
+        monkeypatch.setattr(aio, "_parse_in_worker", _slow_parse)
+
+        async def run():
+            async with ParseService(workers=1, mp_context=FORK) as service:
+                with pytest.raises(TimeoutError):
+                    await service.parse("0.3", timeout=0.1)
+                assert service.pending == 1
+                await asyncio.sleep(0.5)
+                assert service.pending == 0
+
+        asyncio.run(run())
+
+    def test_crashed_worker_replaces_pool(self, monkeypatch):
+        async def run():
+            async with ParseService(workers=1, mp_context=FORK) as service:
+                monkeypatch.setattr(aio, "_parse_in_worker", _crash)
+                with pytest.raises(BrokenProcessPool):
+                    await service.parse(DOC)
+                monkeypatch.undo()
+                result = await service.parse(DOC)
+                assert result["structure"]["headings"][0]["text"] == "Title"
+
+        asyncio.run(run())
+
+    def test_closed_service_and_invalid_args(self):
+        async def run():
+            service = ParseService(workers=1)
+            with pytest.raises(ValueError):
+                await service.parse(DOC, output="xml")
+            await service.close()
+            with pytest.raises(RuntimeError):
+                await service.parse(DOC)
+
+        asyncio.run(run())
+        with pytest.raises(ValueError):
+            ParseService(workers=1, max_pending=-1)
+
+
+class TestAparse:
+    """Tests for aparse() and the default service."""
+
+    def test_default_service_per_loop(self):
+        async def run():
+            result = await aparse(DOC, profile="strict", timeout=30)
+            return result, aio.default_service()
+
+        result, service = asyncio.run(run())
+        assert result == MarkdownParserCore(DOC, security_profile="strict").parse()
+        second, other = asyncio.run(run())
+        assert second == result and other is not service
+        asyncio.run(other.close())
@@ -0,0 +1,88 @@
+"""Tests for markdown/batch.py (parse_many)."""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from doxstrux.markdown.batch import BatchResult, parse_many
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+DOCS = [f"# Doc {i}\n\nParagraph {i} with [link](https://example.com/{i}).\n" for i in range(10)]
+TOO_BIG = "x" * (200 * 1024)  # Exceeds the strict profile content limit
+
+_real_parse = MarkdownParserCore.parse
+
+
+def _crashing_parse(self, *args, **kwargs):
+    if self.content == "CRASH":
+        os._exit(1)
+    return _real_parse(self, *args, **kwargs)
+
+
+class TestParseMany:
+    """Tests for parse_many()."""
+
+    def test_serial_matches_single_parse(self):
+        results = list(parse_many(DOCS, profile="strict", workers=1))
+        assert [r.index for r in results] == list(range(10))
+        assert all(r.ok and r.source is None for r in results)
+        expected = MarkdownParserCore(DOCS[3], security_profile="strict").parse()
+        assert results[3].result == expected
+
+    def test_failures_are_isolated(self):
+        results = list(parse_many([DOCS[0], TOO_BIG, DOCS[1]], profile="strict", workers=1))
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error["type"] == "MarkdownSizeError"
+        assert results[1].error["security_profile"] == "strict"
+        assert results[1].result is None
+
+    def test_paths_are_read_by_worker(self, tmp_path: Path):
+        good = tmp_path / "good.md"
+        good.write_text("# Hello\n", encoding="utf-8")
+        missing = tmp_path / "missing.md"
+        results = list(parse_many([good, missing], workers=1))
+        assert results[0].ok and results[0].source == str(good)
+        assert results[0].result["structure"]["headings"][0]["text"] == "Hello"
+        assert not results[1].ok and results[1].error["type"] == "FileNotFoundError"
+
+    def test_process_pool_ordered(self):
+        inputs = DOCS + [TOO_BIG]
+        results = list(parse_many(inputs, profile="strict", workers=2, chunk_size=3))
+        assert [r.index for r in results] == list(range(len(inputs)))
+        assert results[-1].error["type"] == "MarkdownSizeError"
+        serial = list(parse_many(inputs, profile="strict", workers=1))
+        assert [r.result for r in results] == [r.result for r in serial]
+
+    def test_process_pool_completion_order(self):
+        results = list(parse_many(DOCS, workers=2, chunk_size=2, ordered=False, include={"links"}))
+        assert sorted(r.index for r in results) == list(range(10))
+        assert all(list(r.result["structure"]) == ["links"] for r in results)
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_worker_death_fails_only_its_document(self, monkeypatch, ordered):
+        # Workers are forked after the patch, so they inherit it
+        monkeypatch.setattr(MarkdownParserCore, "parse", _crashing_parse)
+        inputs = DOCS[:5] + ["CRASH"] + DOCS[5:]
+        results = list(parse_many(
+            inputs, workers=2, chunk_size=2, ordered=ordered,
+            mp_context=multiprocessing.get_context("fork"),
+        ))
+        by_index = {r.index: r for r in results}
+        assert sorted(by_index) == list(range(len(inputs)))
+        assert by_index[5].error["type"] == "BrokenProcessPool"
+        assert all(r.ok for i, r in by_index.items() if i != 5)
+        if ordered:
+            assert [r.index for r in results] == list(range(len(inputs)))
+
+    def test_invalid_input(self):
+        with pytest.raises(TypeError):
+            list(parse_many([b"bytes"], workers=1))
+        with pytest.raises(ValueError):
+            list(parse_many(DOCS, chunk_size=0))
+
+    def test_batch_result_ok(self):
+        assert BatchResult(0, None, result={}).ok
+        assert not BatchResult(0, None, error={"type": "X"}).ok
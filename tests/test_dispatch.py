@@ -0,0 +1,140 @@
+"""Unit tests for utils/dispatch.py.
+
+Tests for the single-pass node dispatcher that lets all tree-based extractors
+share one SyntaxTreeNode walk.
+"""
+
+from markdown_it import MarkdownIt
+from markdown_it.tree import SyntaxTreeNode
+
+from doxstrux.markdown.utils.dispatch import NodeCollector, NodeDispatcher
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+SAMPLE = """# Title
+
+Intro paragraph with [a link](#usage) and `code`.
+
+## Usage
+
+- item one
+- item two
+  - nested
+
+- [ ] open task
+- [x] done task
+
+> quoted text
+> - quoted list
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```python
+print("hi")
+```
+
+    indented code
+
+<div>html block</div>
+
+Footnote ref[^1].
+
+[^1]: The footnote.
+"""
+
+
+def _tree(text: str) -> SyntaxTreeNode:
+    md = MarkdownIt("commonmark").enable("table")
+    return SyntaxTreeNode(md.parse(text))
+
+
+class TestNodeDispatcher:
+    """Tests for NodeDispatcher routing and pruning."""
+
+    def test_routes_only_registered_types(self):
+        """Collectors should only see nodes of the types they registered."""
+        seen = []
+        collector = NodeCollector(
+            "seen", {"paragraph"}, lambda n, ctx, lvl: ctx.append(n.type) or True, seen
+        )
+        dispatcher = NodeDispatcher(max_depth=100)
+        dispatcher.register(collector)
+        dispatcher.run(_tree("# H\n\npara one\n\npara two\n"))
+        assert seen == ["paragraph", "paragraph"]
+
+    def test_wildcard_matches_walk_order(self):
+        """types=None should visit every node in pre-order, like tree.walk()."""
+        tree = _tree("# H\n\n- a\n- b\n\ntext\n")
+        seen = []
+        dispatcher = NodeDispatcher(max_depth=100)
+        dispatcher.register(
+            NodeCollector("all", None, lambda n, ctx, lvl: ctx.append(n.type) or True, seen)
+        )
+        dispatcher.run(tree)
+        assert seen == [n.type for n in tree.walk()]
+
+    def test_pruning_is_per_collector(self):
+        """Returning False prunes the subtree for that collector only."""
+        tree = _tree("- outer\n  - inner\n")
+        pruned, full = [], []
+        dispatcher = NodeDispatcher(max_depth=100)
+        dispatcher.register(NodeCollector(
+            "pruned", {"bullet_list"}, lambda n, ctx, lvl: ctx.append(lvl) and False, pruned
+        ))
+        dispatcher.register(NodeCollector(
+            "full", {"bullet_list"}, lambda n, ctx, lvl: ctx.append(lvl) or True, full
+        ))
+        dispatcher.run(tree)
+        assert len(pruned) == 1
+        assert len(full) == 2
+
+    def test_depth_limit_skips_deep_nodes(self):
+        """Nodes deeper than max_depth are skipped with their subtrees."""
+        tree = _tree("> > > deep\n")
+        levels = []
+        dispatcher = NodeDispatcher(max_depth=2)
+        dispatcher.register(
+            NodeCollector("bq", {"blockquote"}, lambda n, ctx, lvl: ctx.append(lvl) or True, levels)
+        )
+        dispatcher.run(tree)
+        assert levels == [1, 2]
+
+    def test_finalize_result_keyed_by_name(self):
+        """run() should return finalized results keyed by collector name."""
+        dispatcher = NodeDispatcher(max_depth=100)
+        dispatcher.register(NodeCollector(
+            "count", {"paragraph"}, lambda n, ctx, lvl: ctx.append(1) or True, [], finalize=len
+        ))
+        assert dispatcher.run(_tree("a\n\nb\n\nc\n")) == {"count": 3}
+
+
+class TestParserDispatch:
+    """The dispatched walk must match the per-extractor walks exactly."""
+
+    def test_dispatch_matches_individual_extractors(self):
+        """_dispatch_tree_extractors() output equals the standalone extractors."""
+        dispatched = MarkdownParserCore(SAMPLE)
+        dispatched._extract_sections()
+        results = dispatched._dispatch_tree_extractors()
+
+        single = MarkdownParserCore(SAMPLE)
+        single._extract_sections()
+        assert results["paragraphs"] == single._extract_paragraphs()
+        assert results["lists"] == single._extract_lists()
+        assert results["tasklists"] == single._extract_tasklists()
+        assert results["tables"] == single._extract_tables()
+        assert results["code_blocks"] == single._extract_code_blocks()
+        assert results["headings"] == single._extract_headings()
+        assert results["blockquotes"] == single._extract_blockquotes()
+        assert results["footnotes"] == single._extract_footnotes()
+        assert results["html"] == single._extract_html()
+
+    def test_parse_uses_cached_code_blocks(self):
+        """A second parse() should reuse cached code blocks."""
+        parser = MarkdownParserCore(SAMPLE)
+        first = parser.parse()["structure"]["code_blocks"]
+        second = parser.parse()["structure"]["code_blocks"]
+        assert first == second
+        assert first is parser._cache["code_blocks"]
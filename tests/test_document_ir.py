@@ -166,6 +166,36 @@ Content 2.
             assert "slug" in section_node.meta
 
 
+class TestParseMemoization:
+    """parse() memoizes its result; to_ir() reuses it."""
+
+    CONTENT = "# Title\n\nText with [link](#title).\n"
+
+    def test_to_ir_parses_once(self, monkeypatch):
+        """to_ir() runs the extraction pipeline a single time."""
+        parser = MarkdownParserCore(self.CONTENT)
+        calls = []
+        original = parser._dispatch_tree_extractors
+        monkeypatch.setattr(parser, "_dispatch_tree_extractors", lambda: calls.append(1) or original())
+
+        parser.to_ir()
+        parser.to_ir()
+        assert calls == [1]
+
+    def test_parse_returns_memoized_result(self):
+        parser = MarkdownParserCore(self.CONTENT)
+        first = parser.parse()
+        assert parser.parse() is first
+
+    def test_invalidate_forces_fresh_parse(self):
+        parser = MarkdownParserCore(self.CONTENT)
+        first = parser.parse()
+        parser.invalidate()
+        second = parser.parse()
+        assert second is not first
+        assert second["structure"]["sections"] == first["structure"]["sections"]
+
+
 class TestChunkPolicy:
     """Test ChunkPolicy dataclass."""
 
@@ -0,0 +1,71 @@
+"""Unit tests for markdown/engines.py.
+
+Tests for the process-wide cache of configured MarkdownIt engines.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from doxstrux.markdown import engines
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+DOC = """---
+title: T
+---
+
+# Heading
+
+- [x] done
+- [ ] todo
+
+Text[^1] ~~struck~~.
+
+[^1]: Note.
+"""
+
+
+class TestEngineCache:
+    """Tests for engine caching and warm-up."""
+
+    def setup_method(self):
+        engines.clear_engine_cache()
+
+    def test_same_config_shares_engine(self):
+        a = engines.get_engine("commonmark", ["table"], ["front_matter"])
+        b = engines.get_engine("commonmark", ["table"], ["front_matter"])
+        assert a is b
+        assert engines.engine_cache_info() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_different_config_builds_new_engine(self):
+        a = engines.get_engine("commonmark", ["table"], [])
+        b = engines.get_engine("commonmark", ["table", "strikethrough"], [])
+        assert a is not b
+
+    def test_warm_engines_covers_profiles(self):
+        engines.warm_engines()
+        size = engines.engine_cache_info()["size"]
+        assert size >= 1
+        for profile in ("strict", "moderate", "permissive"):
+            MarkdownParserCore("x", security_profile=profile)
+        assert engines.engine_cache_info()["size"] == size
+
+    def test_parsers_share_engine_not_env(self):
+        p1 = MarkdownParserCore(DOC)
+        p2 = MarkdownParserCore("plain")
+        assert p1.md is p2.md
+        assert p1.env is not p2.env
+
+    def test_cached_engine_output_matches_fresh_engine(self):
+        """Parsing with a reused engine gives the same result as a fresh one."""
+        first = MarkdownParserCore(DOC, security_profile="permissive").parse()
+        engines.clear_engine_cache()
+        fresh = MarkdownParserCore(DOC, security_profile="permissive").parse()
+        again = MarkdownParserCore(DOC, security_profile="permissive").parse()
+        assert first == fresh == again
+
+    def test_concurrent_parses(self):
+        """Threads sharing an engine produce identical results."""
+        expected = MarkdownParserCore(DOC).parse()["structure"]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: MarkdownParserCore(DOC).parse()["structure"], range(32)))
+        assert all(r == expected for r in results)
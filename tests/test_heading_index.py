@@ -0,0 +1,71 @@
+"""Unit tests for the shared heading index in extractors/sections.py.
+
+Tests for build_heading_index and the sections/headings built from it.
+"""
+
+from doxstrux.markdown.extractors import sections
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = """# Intro
+
+## Usage
+
+> ## Usage
+
+- item
+
+  ## Usage
+
+## Usage *again*
+
+Setext
+------
+"""
+
+
+class TestHeadingIndex:
+    """Tests for build_heading_index."""
+
+    def test_entries(self):
+        parser = MarkdownParserCore(DOC)
+        index = parser._get_heading_index()
+        assert [(e.line, e.text) for e in index] == [
+            (0, "Intro"),
+            (2, "Usage"),
+            (4, "Usage"),
+            (8, "Usage"),
+            (10, "Usage again"),
+            (12, "Setext"),
+        ]
+        # Sections count every heading, headings only document-level ones
+        assert [e.section_slug for e in index] == [
+            "intro", "usage", "usage-2", "usage-3", "usage-again", "setext"
+        ]
+        assert [e.heading_slug for e in index] == [
+            "intro", "usage", None, None, "usage-again", "setext"
+        ]
+        assert parser._get_heading_index() is index
+
+    def test_sections_and_headings_use_index(self):
+        parser = MarkdownParserCore(DOC)
+        result = parser.parse()
+        assert [s["id"] for s in result["structure"]["sections"]] == [
+            "section_intro", "section_usage", "section_usage-2", "section_usage-3",
+            "section_usage-again", "section_setext",
+        ]
+        headings = result["structure"]["headings"]
+        assert [h["id"] for h in headings] == [
+            "heading_intro", "heading_usage", "heading_usage-again", "heading_setext"
+        ]
+        assert headings[1]["parent_heading_id"] == "heading_intro"
+
+    def test_many_duplicate_headings(self):
+        """Thousands of headings are indexed in linear time with stable slugs."""
+        doc = "\n".join(f"## Item\n\ntext {i}\n" for i in range(3000))
+        headings = MarkdownParserCore(doc, security_profile="permissive")._extract_headings()
+        assert len(headings) == 3000
+        assert headings[-1]["slug"] == "item-3000"
+
+    def test_slugify_base(self):
+        assert sections.slugify_base("Hello / World: v2!") == "hello-world-v2"
+        assert sections.slugify_base("***") == "untitled"
@@ -0,0 +1,159 @@
+"""Unit tests for incremental.py and MarkdownParserCore.update().
+
+update() must give the same tokens and parse() result as a fresh parser.
+"""
+
+import pytest
+
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.utils.incremental import (
+    changed_line_range,
+    common_prefix_length,
+    common_suffix_length,
+    reparse_window,
+    splice_line_starts,
+    top_level_blocks,
+)
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = """# Guide
+
+Intro with a [link](https://example.com).
+
+## Install
+
+```bash
+pip install doxstrux
+
+doxstrux --help
+```
+
+- one
+- two
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+## Usage
+
+> Quote text.
+
+Last paragraph.
+"""
+
+
+def _token_summary(parser):
+    return [(t.type, t.map, t.level, t.content) for t in parser.tokens]
+
+
+def _assert_matches_fresh(parser, content, **kwargs):
+    fresh = MarkdownParserCore(content, **kwargs)
+    assert _token_summary(parser) == _token_summary(fresh)
+    assert parser.parse() == fresh.parse()
+
+
+class TestLineDiff:
+    """Tests for the string and line diff helpers."""
+
+    def test_common_prefix_and_suffix(self):
+        assert common_prefix_length("abcdef", "abcxef") == 3
+        assert common_suffix_length("abcdef", "abcxef") == 2
+        assert common_suffix_length("aaaa", "aaaa", limit=1) == 1
+        assert common_prefix_length("", "abc") == 0
+
+    @pytest.mark.parametrize(
+        ("old", "new", "expected"),
+        [
+            ("a\nb\nc", "a\nB\nc", (1, 2, 2)),
+            ("a\nb\nc", "a\nb\nx\nc", (2, 3, 4)),
+            ("a\nb\nc", "a\nc", (1, 3, 2)),
+            ("a", "b", (0, 1, 1)),
+        ],
+    )
+    def test_changed_line_range(self, old, new, expected):
+        assert changed_line_range(old, new) == expected
+
+    def test_splice_line_starts(self):
+        old = "a\nb\nc\nd"
+        new = "a\nB\nx\nc\nd"
+        starts = splice_line_starts([0, 2, 4, 6], new, 1, 2, 3, len(new) - len(old))
+        assert starts == [0, 2, 4, 6, 8]
+
+    def test_top_level_blocks(self):
+        parser = MarkdownParserCore(DOC)
+        indices, lines = top_level_blocks(parser.tokens)
+        assert len(indices) == len(parser.tree.children)
+        assert lines[0] == 0 and lines == sorted(lines)
+
+    def test_window_not_cut_inside_fence(self):
+        parser = MarkdownParserCore(DOC)
+        _, block_lines = top_level_blocks(parser.tokens)
+        new = DOC.replace("pip install doxstrux", "pip install -U doxstrux")
+        start, old_end, new_end = reparse_window(
+            parser.lines, new.split("\n"), block_lines, *changed_line_range(DOC, new)
+        )
+        assert start <= 6 and old_end >= 11
+
+
+class TestUpdate:
+    """Tests for MarkdownParserCore.update()."""
+
+    @pytest.mark.parametrize(
+        "new",
+        [
+            DOC.replace("Intro with", "Introduction with"),
+            DOC.replace("- two\n", "- two\n- three\n"),
+            DOC.replace("## Usage\n", "## Usage\n\nNew paragraph.\n\n### Sub\n"),
+            DOC.replace("Last paragraph.\n", ""),
+            DOC.replace("| 1 | 2 |", "| 1 | 2 |\n| 3 | 4 |"),
+            DOC.replace("doxstrux --help\n```", "doxstrux --help"),  # Unclosed fence
+            DOC.replace("# Guide", "Guide\n====="),
+            "---\ntitle: x\n---\n" + DOC,
+            DOC + "\n[ref]: https://example.com\n",
+            "",
+        ],
+    )
+    @pytest.mark.parametrize("content_mode", ["copy", "spans"])
+    def test_matches_fresh_parse(self, new, content_mode):
+        config = {"content_mode": content_mode}
+        parser = MarkdownParserCore(DOC, config=config)
+        parser.parse()
+        parser.update(new)
+        _assert_matches_fresh(parser, new, config=config)
+
+    def test_local_edit_is_partial(self):
+        parser = MarkdownParserCore(DOC)
+        reparsed = parser.update(DOC.replace("Quote text.", "Quoted text."))
+        assert not reparsed.full
+        assert reparsed.start_line > 0 and reparsed.old_end_line < len(DOC.split("\n"))
+
+    def test_successive_edits(self):
+        parser = MarkdownParserCore(DOC)
+        content = DOC
+        for old, new in [("one", "uno"), ("## Usage", "## Use"), ("Last", "Final"), ("uno", "1")]:
+            content = content.replace(old, new)
+            parser.update(content)
+            _assert_matches_fresh(parser, content)
+
+    def test_footnotes_reparse_whole_document(self):
+        doc = DOC + "\nSee[^1].\n\n[^1]: Note.\n"
+        parser = MarkdownParserCore(doc)
+        new = doc.replace("Intro with", "Intro, with")
+        assert parser.update(new).full
+        _assert_matches_fresh(parser, new)
+
+    def test_unchanged_content(self):
+        parser = MarkdownParserCore(DOC)
+        result = parser.parse()
+        assert parser.update(DOC) == (0, 0, 0, False)
+        assert parser.parse() is result
+
+    def test_invalid_content_leaves_parser_unchanged(self):
+        parser = MarkdownParserCore(DOC, security_profile="strict")
+        result = parser.parse()
+        limit = MarkdownParserCore.SECURITY_LIMITS["strict"]["max_line_count"]
+        with pytest.raises(MarkdownSizeError):
+            parser.update("x\n" * (limit + 1))
+        assert parser.content == DOC
+        assert parser.parse() is result
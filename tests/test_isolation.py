@@ -0,0 +1,127 @@
+"""Tests for markdown/isolation.py (IsolatedParsePool, parse_isolated)."""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from doxstrux.markdown.exceptions import MarkdownSecurityError, MarkdownSizeError
+from doxstrux.markdown.ir import DocumentIR
+from doxstrux.markdown.isolation import IsolatedParsePool
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = "# Title\n\nParagraph with [link](https://example.com).\n"
+TOO_BIG = "x" * (200 * 1024)  # Exceeds the strict profile content limit
+FORK = multiprocessing.get_context("fork")
+
+_real_parse = MarkdownParserCore.parse
+
+
+def _adversarial_parse(self, *args, **kwargs):
+    """Stand-in for pathological inputs, selected by the first line."""
+    command = self.content.split("\n", 1)[0]
+    if command == "SLEEP":
+        time.sleep(30)
+    elif command.startswith("ALLOCATE"):
+        megabytes = int(command[len("ALLOCATE"):] or 2048)
+        return {"blob": len(bytearray(megabytes * 1024 * 1024))}
+    elif command == "CRASH":
+        os._exit(3)
+    return _real_parse(self, *args, **kwargs)
+
+
+@pytest.fixture
+def adversarial_pool(monkeypatch):
+    # Workers are forked after the patch, so they inherit it
+    monkeypatch.setattr(MarkdownParserCore, "parse", _adversarial_parse)
+    with IsolatedParsePool(workers=1, timeout=0.5, max_memory_mb=256, mp_context=FORK) as pool:
+        yield pool
+
+
+class TestIsolatedParsePool:
+    """Tests for IsolatedParsePool."""
+
+    def test_results_match_local_parse(self):
+        with IsolatedParsePool(workers=2, profile="strict", mp_context=FORK) as pool:
+            result = pool.parse(DOC)
+            ir = pool.parse(DOC, output="ir", source_id="doc.md")
+            links = pool.parse(DOC, include={"links"})
+        parser = MarkdownParserCore(DOC, security_profile="strict")
+        assert result == parser.parse()
+        assert isinstance(ir, DocumentIR)
+        assert ir.to_dict() == parser.to_ir(source_id="doc.md").to_dict()
+        assert list(links["structure"]) == ["links"]
+
+    def test_validation_errors_keep_worker(self):
+        with IsolatedParsePool(workers=1, profile="strict", mp_context=FORK) as pool:
+            pid = next(iter(pool._all)).process.pid
+            with pytest.raises(MarkdownSizeError) as exc_info:
+                pool.parse(TOO_BIG)
+            assert exc_info.value.security_profile == "strict"
+            assert pool.parse(DOC)["structure"]["headings"][0]["text"] == "Title"
+            assert next(iter(pool._all)).process.pid == pid
+
+    @pytest.mark.parametrize(
+        ("command", "reason"),
+        [
+            ("SLEEP", "timeout"),
+            pytest.param(
+                "ALLOCATE", "memory_limit",
+                marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS cap needs /proc"),
+            ),
+            ("CRASH", "worker_crashed"),
+        ],
+    )
+    def test_budget_violations_recycle_worker(self, adversarial_pool, command, reason):
+        started = time.monotonic()
+        with pytest.raises(MarkdownSecurityError) as exc_info:
+            adversarial_pool.parse(command + "\n\ntext")
+        assert time.monotonic() - started < 10
+        info = exc_info.value.content_info
+        assert info["isolation"] == reason
+        assert info["content_length"] == len(command) + 6
+        if reason == "worker_crashed":
+            assert info["exit_code"] == 3
+        assert adversarial_pool.stats[reason] == 1
+        # A fresh worker serves the next request
+        assert adversarial_pool.parse(DOC)["structure"]["headings"][0]["text"] == "Title"
+
+    def test_concurrent_threads(self):
+        with IsolatedParsePool(workers=2, mp_context=FORK) as pool:
+            with ThreadPoolExecutor(4) as threads:
+                results = list(threads.map(pool.parse, [DOC] * 8))
+        assert all(r == results[0] for r in results)
+        assert pool.stats["parses"] == 8
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            IsolatedParsePool(workers=1, profile="unknown")
+        pool = IsolatedParsePool(workers=1, mp_context=FORK)
+        with pytest.raises(ValueError):
+            pool.parse(DOC, output="xml")
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.parse(DOC)
+
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RLIMIT_AS cap needs /proc")
+    def test_memory_budget_follows_profile(self, monkeypatch):
+        monkeypatch.setattr(MarkdownParserCore, "parse", _adversarial_parse)
+        with IsolatedParsePool(workers=1, mp_context=FORK) as pool:
+            assert pool.parse("ALLOCATE512")["blob"] == 512 * 1024 * 1024  # moderate: 1024 MB
+            with pytest.raises(MarkdownSecurityError) as exc_info:
+                pool.parse("ALLOCATE512", "strict")
+            assert exc_info.value.content_info["isolation"] == "memory_limit"
+            assert exc_info.value.content_info["max_memory_mb"] == 256
+            assert pool.parse("ALLOCATE200", "strict")["blob"] == 200 * 1024 * 1024
+
+
+class TestParseIsolated:
+    """Tests for MarkdownParserCore.parse_isolated()."""
+
+    def test_matches_parse(self):
+        result = MarkdownParserCore.parse_isolated(DOC, security_profile="strict")
+        assert result == MarkdownParserCore(DOC, security_profile="strict").parse()
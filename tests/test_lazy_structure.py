@@ -0,0 +1,102 @@
+"""Tests for the lazy structure view and parse(include=...) subset mode."""
+
+import pytest
+
+from doxstrux.markdown.structure import LazyStructure
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+DOC = """# Title
+
+See [docs](https://example.com) and [bad](ftp://example.com/x).
+
+![img](https://example.com/a.png)
+
+<div>raw html</div>
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+Note[^1].
+
+[^1]: Footnote text.
+"""
+
+
+class TestLazyStructure:
+    """Tests for parser.structure."""
+
+    def test_fields_extracted_on_access(self, monkeypatch):
+        """Accessing one field only runs that extractor, once."""
+        parser = MarkdownParserCore(DOC)
+        calls = []
+        original = parser._extract_links
+        monkeypatch.setattr(parser, "_extract_links", lambda: calls.append(1) or original())
+
+        links = parser.structure.links
+        assert parser.structure.links is links
+        assert calls == [1]
+        assert parser._cache["paragraphs"] is None
+        assert parser._cache["tables"] is None
+
+    def test_values_match_full_parse(self):
+        """Fields without policy filtering equal the full parse() output."""
+        full = MarkdownParserCore(DOC).parse()["structure"]
+        lazy = MarkdownParserCore(DOC).structure
+        for name in ("sections", "headings", "tables", "paragraphs", "footnotes"):
+            assert lazy[name] == full[name]
+
+    def test_parse_seeds_lazy_view(self):
+        parser = MarkdownParserCore(DOC)
+        result = parser.parse()
+        assert parser.structure.tables is result["structure"]["tables"]
+
+    def test_fields_follow_enabled_plugins(self):
+        assert "footnotes" in MarkdownParserCore(DOC, security_profile="moderate").structure
+        assert "footnotes" not in MarkdownParserCore(DOC, security_profile="strict").structure
+
+    def test_unknown_field(self):
+        view = MarkdownParserCore(DOC).structure
+        with pytest.raises(AttributeError):
+            view.nope
+        with pytest.raises(KeyError):
+            view["nope"]
+
+    def test_standalone_view(self):
+        view = LazyStructure(["a", "b"], lambda name: name.upper())
+        assert view.a == "A"
+        assert list(view) == ["a", "b"]
+        assert view.to_dict(["b"]) == {"b": "B"}
+
+
+class TestParseSubset:
+    """Tests for parse(include=...)."""
+
+    def test_links_only(self):
+        parser = MarkdownParserCore(DOC)
+        result = parser.parse(include={"links"})
+        assert list(result["structure"]) == ["links"]
+        assert "mappings" not in result
+        assert parser._cache["paragraphs"] is None
+
+    def test_subset_applies_policy(self):
+        """Unsafe links are dropped and HTML stripped, as in a full parse."""
+        full = MarkdownParserCore(DOC).parse()
+        subset = MarkdownParserCore(DOC).parse(include=["links", "html_blocks"])
+        assert subset["structure"]["links"] == full["structure"]["links"]
+        assert subset["structure"]["html_blocks"] == []
+        assert "dropped_1_unsafe_links" in subset["metadata"]["security_policies_applied"]
+        assert subset["metadata"]["security"]["profile_used"] == "moderate"
+
+    def test_subset_with_metadata_and_mappings(self):
+        full = MarkdownParserCore(DOC).parse()
+        subset = MarkdownParserCore(DOC).parse(include={"links", "metadata", "mappings"})
+        # HTML was not requested, so it is not stripped from this subset
+        full["metadata"]["security_policies_applied"].remove("stripped_1_html_blocks")
+        assert subset["metadata"] == full["metadata"]
+        assert subset["mappings"] == full["mappings"]
+
+    def test_unknown_include(self):
+        with pytest.raises(ValueError, match="Unknown parse"):
+            MarkdownParserCore(DOC).parse(include={"linkz"})
@@ -0,0 +1,63 @@
+"""Unit tests for utils/line_mappings.py.
+
+Tests for the array-backed line kind / section maps and their legacy dict view.
+"""
+
+from doxstrux.markdown.utils.line_mappings import LINE_CODE, LINE_PROSE, LineMappings
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+SECTIONS = [
+    {"id": "section_a", "start_line": 0, "end_line": 7},
+    {"id": "section_b", "start_line": 3, "end_line": 7},
+]
+
+
+class TestLineMappings:
+    """Tests for LineMappings."""
+
+    def test_innermost_section_wins(self):
+        """Nested sections map their lines to the inner section."""
+        lm = LineMappings(9, SECTIONS)
+        assert lm.section_id_of(1) == "section_a"
+        assert lm.section_id_of(5) == "section_b"
+        assert lm.section_id_of(8) is None
+        assert lm.section_id_of(99) is None
+
+    def test_code_blocks_mark_kinds_and_ranges(self):
+        """Code lines are flagged and prose ranges are the gaps between them."""
+        lm = LineMappings(9, SECTIONS)
+        lm.add_code_block(2, 4, "python")
+        lm.add_code_block(6, 8, None)
+        assert lm.kinds[2] == LINE_CODE and lm.kinds[4] == LINE_PROSE
+        assert lm.kind_of(3) == "code"
+        assert lm.kind_of(-1) is None
+        assert lm.prose_ranges() == [(0, 2), (4, 6), (8, 9)]
+
+    def test_to_dict_legacy_shape(self):
+        """to_dict() returns the historical string-keyed shape."""
+        lm = LineMappings(5, [{"id": "s", "start_line": 1, "end_line": 4}])
+        lm.add_code_block(2, 4, "sh")
+        lm.add_code_block(3, 4, None)  # Overlap: code_lines stays de-duplicated
+        d = lm.to_dict()
+        assert d["line_to_type"] == {"0": "prose", "1": "prose", "2": "code", "3": "code", "4": "prose"}
+        assert d["line_to_section"] == {"1": "s", "2": "s", "3": "s", "4": "s"}
+        assert d["prose_lines"] == [0, 1, 4]
+        assert d["code_lines"] == [2, 3]
+        assert d["code_blocks"][0] == {"start_line": 2, "end_line": 3, "language": "sh"}
+        assert lm.to_dict() is d
+        # Both dicts share one key str per line
+        type_keys = {k: k for k in d["line_to_type"]}
+        assert all(type_keys[k] is k for k in d["line_to_section"])
+
+
+class TestParserMappings:
+    """parse() output keeps the legacy mappings shape."""
+
+    def test_parse_mappings(self):
+        parser = MarkdownParserCore("# T\n\n```py\nx\n```\n\ntext\n")
+        mappings = parser.parse()["mappings"]
+        assert mappings["code_lines"] == [2, 3, 4]
+        assert mappings["prose_lines"] == [0, 1, 5, 6, 7]
+        assert mappings["line_to_type"]["3"] == "code"
+        assert parser._find_section_id(6) == mappings["line_to_section"]["6"]
@@ -0,0 +1,144 @@
+"""Tests for markdown/parse_cache.py."""
+
+import pickle
+import sqlite3
+import zlib
+
+import pytest
+
+from doxstrux.markdown.batch import parse_many
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.parse_cache import ParseCache
+from doxstrux.markdown.utils.source_view import SourceLines, TextSpan
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+DOC = "---\ntitle: T\n---\n# Title\n\nSome [link](https://example.com).\n\n```py\nx = 1\n```\n"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ParseCache(tmp_path / "parse.sqlite")
+    yield c
+    c.close()
+
+
+class TestParseCache:
+    """Tests for ParseCache."""
+
+    def test_hit_returns_identical_result(self, cache, monkeypatch):
+        expected = MarkdownParserCore(DOC).parse()
+        assert cache.parse(DOC) == expected
+
+        # A hit must not construct a parser at all
+        monkeypatch.setattr(
+            "doxstrux.markdown.parse_cache.MarkdownParserCore",
+            lambda *a, **k: pytest.fail("parser constructed on cache hit"),
+        )
+        assert cache.parse(DOC) == expected
+        assert cache.stats()["hits"] == 1
+
+    def test_key_covers_profile_config_and_subset(self, cache):
+        keys = {
+            cache.key(DOC),
+            cache.key(DOC, profile="strict"),
+            cache.key(DOC, config={"allows_html": True}),
+            cache.key(DOC, include={"links"}),
+            cache.key(DOC + " "),
+        }
+        assert len(keys) == 5
+        assert cache.key(DOC, profile=None) == cache.key(DOC, profile="moderate")
+
+    def test_subset_results_cached_separately(self, cache):
+        links = cache.parse(DOC, include={"links"})
+        full = cache.parse(DOC)
+        assert list(links["structure"]) == ["links"]
+        assert "sections" in full["structure"]
+
+    def test_content_not_stored(self, cache):
+        cache.parse(DOC)
+        row = cache._connect().execute("SELECT value FROM entries").fetchone()
+        assert DOC.encode() not in row[0]
+
+    def test_spans_mode_content_not_stored(self, cache):
+        config = {"content_mode": "spans"}
+        doc = DOC + "\nSee [the **marker**](https://example.com/marker).\n"
+        expected = MarkdownParserCore(doc, config=config).parse()
+        cache.parse(doc, config=config)
+        row = cache._connect().execute("SELECT value FROM entries").fetchone()
+        blob = zlib.decompress(row[0])
+        # Markdown syntax only survives in raw content
+        assert b"[the **marker**]" not in blob and doc.encode() not in blob
+
+        content = "".join(doc)  # Equal string, different object
+        hit = cache.parse(content, config=config)
+        assert hit == expected and cache.stats()["hits"] == 1
+        assert isinstance(hit["content"]["lines"], SourceLines)
+        assert hit["content"]["lines"].source is content
+        span = hit["structure"]["sections"][0]["raw_content"]
+        assert isinstance(span, TextSpan) and span.source is content
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ParseCache(tmp_path / "small.sqlite", max_bytes=1)
+        cache.parse("# a\n")
+        cache.parse("# b\n")
+        assert cache.stats()["entries"] <= 1
+        assert cache.get("# a\n") is None
+        cache.close()
+
+    def test_eviction_trims_to_low_water_mark(self, tmp_path):
+        docs = [f"# Doc {i}\n\nText {i}.\n" for i in range(20)]
+        cache = ParseCache(tmp_path / "lru.sqlite")
+        for doc in docs[:10]:
+            cache.parse(doc)
+        cache.max_bytes = cache.stats()["bytes"]  # At capacity
+
+        cache.parse(docs[10])
+        stats = cache.stats()
+        assert stats["bytes"] <= cache.max_bytes * 0.9
+        assert stats["entries"] < 10
+        assert cache._approx_bytes == stats["bytes"]
+        cache.parse(docs[11])  # Headroom left: no eviction
+        assert cache.stats()["entries"] == stats["entries"] + 1
+        assert cache.get(docs[0]) is None and cache.get(docs[10]) is not None
+        cache.close()
+
+    def test_replaced_entries_counted_once(self, cache):
+        result = MarkdownParserCore(DOC).parse()
+        for _ in range(3):
+            cache.put(DOC, result)
+        assert cache.stats()["entries"] == 1
+        assert cache._approx_bytes == cache.stats()["bytes"]
+
+    def test_old_format_table_dropped(self, tmp_path):
+        path = tmp_path / "old.sqlite"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE entries (key TEXT PRIMARY KEY, content_hash TEXT NOT NULL,"
+            " value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO entries VALUES ('k', 'h', x'00', 1, 0)")
+        conn.commit()
+        conn.close()
+        cache = ParseCache(path)
+        assert cache.stats()["entries"] == 0
+        assert cache.parse(DOC) == MarkdownParserCore(DOC).parse()
+        cache.close()
+
+    def test_failures_not_cached(self, cache):
+        with pytest.raises(MarkdownSizeError):
+            cache.parse("x" * (200 * 1024), profile="strict")
+        assert cache.stats()["entries"] == 0
+
+    def test_pickles_by_path(self, cache):
+        cache.parse(DOC)
+        clone = pickle.loads(pickle.dumps(cache))
+        assert clone.get(DOC) is not None
+        clone.close()
+
+    def test_parse_many_uses_cache(self, cache):
+        docs = [DOC, "# Other\n"]
+        first = [r.result for r in parse_many(docs, workers=1, cache=cache)]
+        second = [r.result for r in parse_many(docs, workers=1, cache=cache)]
+        assert first == second
+        assert cache.stats()["hits"] == 2
@@ -0,0 +1,142 @@
+"""Unit tests for security/raw_scanner.py.
+
+Tests for the multi-pattern raw-content scanner and the shared RAW_SCANNER
+registrations used by the parser's security checks.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from doxstrux.markdown import config
+from doxstrux.markdown.exceptions import MarkdownSecurityError
+from doxstrux.markdown.security import validators
+from doxstrux.markdown.security.raw_scanner import RawHit, RawScanner
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+
+def _scanner() -> RawScanner:
+    scanner = RawScanner()
+    scanner.add_literal("js", "javascript:")
+    scanner.add_pattern("frame", r"<(iframe|object|embed)[^>]*>")
+    scanner.add_chars("zw", "\u200b\u200c")
+    return scanner
+
+
+class TestRawScanner:
+    """Tests for RawScanner."""
+
+    def test_reports_every_hit_with_offsets(self):
+        """All hits of all kinds come back sorted by offset."""
+        content = "a\u200bJavaScript:x <IFRAME src=y> javascript:z\u200c"
+        hits = _scanner().scan(content)
+        assert [(h.name, h.start, h.text) for h in hits] == [
+            ("zw", 1, "\u200b"),
+            ("js", 2, "JavaScript:"),
+            ("frame", 15, "<IFRAME src=y>"),
+            ("js", 30, "javascript:"),
+            ("zw", 42, "\u200c"),
+        ]
+        for hit in hits:
+            assert content[hit.start:hit.end] == hit.text
+
+    def test_first_hits(self):
+        """first_hits keeps only the first hit per pattern."""
+        hits = _scanner().first_hits("javascript: <embed> javascript:")
+        assert hits == {
+            "js": RawHit("js", 0, 11, "javascript:"),
+            "frame": RawHit("frame", 12, 19, "<embed>"),
+        }
+
+    def test_names_and_endpos(self):
+        """Scans can be restricted to some patterns and to a prefix."""
+        scanner = _scanner()
+        content = "<object> javascript:"
+        assert list(scanner.first_hits(content, ["js"])) == ["js"]
+        assert list(scanner.first_hits(content, endpos=15)) == ["frame"]
+        # A hit must end before endpos, as if scanning content[:endpos]
+        assert scanner.first_hits(content, endpos=19) == {"frame": RawHit("frame", 0, 8, "<object>")}
+
+    def test_literal_offsets_when_lowercase_changes_length(self):
+        """Offsets stay correct when lower() would change the content length."""
+        content = "İİ JAVASCRIPT:"
+        assert len(content.lower()) != len(content)
+        hit = _scanner().first_hits(content)["js"]
+        assert content[hit.start:hit.end] == "JAVASCRIPT:"
+
+    def test_registration_errors(self):
+        """Duplicate names, unknown names and bad char sets are rejected."""
+        scanner = _scanner()
+        with pytest.raises(ValueError):
+            scanner.add_literal("js", "vbscript:")
+        with pytest.raises(ValueError):
+            scanner.add_chars("bad", ["ab"])
+        with pytest.raises(ValueError):
+            scanner.scan("x", ["missing"])
+
+
+class TestSharedRawScanner:
+    """Tests for the RAW_SCANNER registrations."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "plain text",
+            "see FILE:///etc/passwd and then javascript:alert(1)",
+            "x" * 20 + "Data:Text/HTML,<b>",
+            "vbscript:msgbox",
+        ],
+    )
+    def test_disallowed_schemes_match_regex(self, content):
+        """scan_raw_for_disallowed_schemes agrees with the original regex."""
+        match = validators._DISALLOWED_SCHEMES_RAW_RE.search(content)
+        assert validators.scan_raw_for_disallowed_schemes(content) == {
+            "found": match is not None,
+            "match": match.group(0) if match else None,
+        }
+
+    def test_config_patterns_registered(self):
+        """config.py patterns are found by the shared scanner."""
+        content = '<meta http-equiv="refresh" content="0"> <iframe src=x> \u202e <p style="x:expression(1)">'
+        hits = validators.RAW_SCANNER.first_hits(content)
+        assert {"meta_refresh", "frame_like", "bidi_control", "style_js"} <= set(hits)
+        assert hits["frame_like"].text == config._FRAMELIKE_PAT.search(content).group(0)
+
+    def test_config_patterns_registered_without_importing_config(self):
+        """Registration does not depend on import order, and reloading config adds nothing."""
+        code = (
+            "import importlib\n"
+            "from doxstrux.markdown.security import validators\n"
+            "names = validators.RAW_SCANNER.names\n"
+            "assert {'meta_refresh', 'frame_like', 'bidi_control', 'style_js'} <= set(names)\n"
+            "from doxstrux.markdown import config\n"
+            "importlib.reload(config)\n"
+            "assert validators.RAW_SCANNER.names == names\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": SRC})
+
+    def test_strict_validation_reports_first_listed_pattern(self):
+        """Strict mode raises for the first malicious pattern in list order."""
+        content = "click vbscript:x then <script>alert(1)</script>"
+        with pytest.raises(MarkdownSecurityError) as exc:
+            MarkdownParserCore(content, security_profile="strict")
+        assert exc.value.content_info == {"pattern": r"<script[^>]*>"}
+
+    def test_strict_validation_only_scans_first_10kb(self):
+        """Malicious patterns beyond the first 10KB do not fail construction."""
+        content = "a" * 10000 + " <script>x</script>"
+        MarkdownParserCore(content, security_profile="strict")
+
+    def test_validate_content_issues(self):
+        """validate_content reports each malicious pattern once, in list order."""
+        result = MarkdownParserCore.validate_content("onload = x <SCRIPT> javascript:y")
+        assert result["issues"] == [
+            "Suspicious pattern detected: script tag",
+            "Suspicious pattern detected: javascript protocol",
+            "Suspicious pattern detected: event handler",
+        ]
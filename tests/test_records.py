@@ -0,0 +1,107 @@
+"""Unit tests for extractors/records.py.
+
+Tests for the slotted record result format (config result_format="records").
+"""
+
+import pickle
+
+import pytest
+
+from doxstrux.markdown.extractors import records
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = """---
+title: Records
+---
+
+# Intro
+
+Text with a [link](https://example.com) and `code` and *emphasis*.
+
+![Pixel](data:image/gif;base64,R0lGODlhAQABAAAAACw=) [![Logo](logo.png)](https://example.com)
+
+## Lists
+
+- one
+  - nested
+- two
+
+- [x] done
+- [ ] todo
+  - plain child
+
+> Quote
+>
+> - item
+
+| a | b |
+|---|---|
+| 1 | 2 | 3 |
+
+```python
+print("hi")
+```
+"""
+
+
+def _parse(**config):
+    return MarkdownParserCore(DOC, config=config, security_profile="permissive").parse()
+
+
+class TestRecords:
+    """Tests for record conversion."""
+
+    def test_round_trip_matches_dict_format(self):
+        """to_dicts() of the records result equals the default dict result."""
+        as_dicts = _parse()["structure"]
+        as_records = _parse(result_format="records")["structure"]
+        assert records.to_dicts(as_records) == as_dicts
+
+    def test_record_types(self):
+        structure = _parse(result_format="records")["structure"]
+        assert isinstance(structure["sections"][0], records.SectionRecord)
+        assert isinstance(structure["paragraphs"][0], records.ParagraphRecord)
+        assert {type(link) for link in structure["links"]} == {
+            records.LinkRecord,
+            records.ImageRefRecord,
+        }
+        assert isinstance(structure["tasklists"][0], records.TaskListRecord)
+        items = [item for lst in structure["lists"] + structure["tasklists"] for item in lst.items]
+        assert all(isinstance(item, records.ListItemRecord) for item in items)
+        assert any(isinstance(child, records.ListItemRecord) for item in items for child in item.children)
+        assert isinstance(structure["blockquotes"][0].children_blocks[0], records.BlockRecord)
+        assert structure["frontmatter"] == {"title": "Records"}  # No record type
+
+    def test_optional_keys_are_omitted(self):
+        """ABSENT fields are left out of to_dict()."""
+        local_image = _parse(result_format="records")["structure"]["images"][0]
+        assert local_image.media_type is records.ABSENT
+        assert "media_type" not in local_image.to_dict()
+
+        data_image = {**local_image.to_dict(), "media_type": "image/gif", "encoding": "base64", "bytes_approx": 10}
+        assert records.ImageRecord.from_dict(data_image).to_dict() == data_image
+
+    def test_records_are_slotted(self):
+        heading = _parse(result_format="records")["structure"]["headings"][0]
+        assert not hasattr(heading, "__dict__")
+        with pytest.raises(AttributeError):
+            heading.extra = 1
+
+    def test_pickle(self):
+        """Records survive pickling (ParseCache, parse_many workers)."""
+        structure = _parse(result_format="records")["structure"]
+        restored = pickle.loads(pickle.dumps(structure))
+        assert restored == structure
+        assert restored["images"][0].media_type is records.ABSENT
+
+    def test_unknown_key_rejected(self):
+        with pytest.raises(TypeError):
+            records.CodeBlockRecord.from_dict({"id": "c1", "bogus": 1})
+
+    def test_subset_parse(self):
+        result = MarkdownParserCore(DOC, config={"result_format": "records"}).parse(include={"links"})
+        assert all(isinstance(link, records.Record) for link in result["structure"]["links"])
+
+    def test_unknown_result_format(self):
+        with pytest.raises(ValueError):
+            MarkdownParserCore(DOC, config={"result_format": "tuples"})
@@ -0,0 +1,64 @@
+"""Unit tests for utils/section_index.py.
+
+Tests for binary-search line -> section lookups over nested sections.
+"""
+
+from doxstrux.markdown.utils.section_index import SectionIndex
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+SECTIONS = [
+    {"id": "section_a", "slug": "a", "start_line": 0, "end_line": 9},
+    {"id": "section_b", "slug": "b", "start_line": 2, "end_line": 5},
+    {"id": "section_c", "slug": "c", "start_line": 3, "end_line": 4},
+    {"id": "section_d", "slug": "d", "start_line": 6, "end_line": 9},
+    {"id": "section_e", "slug": "b", "start_line": 12, "end_line": 14},
+]
+
+
+def _linear(sections, line, innermost):
+    """Reference linear scan (first match, or last match for innermost)."""
+    found = None
+    for s in sections:
+        if s["start_line"] <= line <= s["end_line"]:
+            found = s["id"]
+            if not innermost:
+                break
+    return found
+
+
+class TestSectionIndex:
+    """Tests for SectionIndex lookups."""
+
+    def test_matches_linear_scan(self):
+        """Binary search agrees with a linear scan for every line."""
+        index = SectionIndex(SECTIONS)
+        for line in range(-1, 17):
+            assert index.innermost_id(line) == _linear(SECTIONS, line, True)
+            assert index.outermost_id(line) == _linear(SECTIONS, line, False)
+
+    def test_walks_up_after_nested_section_ends(self):
+        """A line after a closed subsection resolves to its parent."""
+        index = SectionIndex(SECTIONS)
+        assert index.innermost_id(5) == "section_b"
+        assert index.innermost_id(10) is None
+
+    def test_slug_lookup_first_wins(self):
+        index = SectionIndex(SECTIONS)
+        assert index.id_for_slug("b") == "section_b"
+        assert index.id_for_slug("missing") is None
+
+    def test_empty(self):
+        index = SectionIndex([])
+        assert index.innermost_id(0) is None
+        assert index.outermost_id(0) is None
+
+
+class TestParserSectionIndex:
+    """The parser builds the index with sections."""
+
+    def test_index_built_with_sections(self):
+        parser = MarkdownParserCore("# A\n\n## B\n\ntext\n")
+        sections = parser._extract_sections()
+        assert parser._section_index.sections is sections
+        assert parser._find_section_id(4) == "section_a"
@@ -0,0 +1,181 @@
+"""Unit tests for utils/source_view.py.
+
+Tests for zero-copy line and span views and the parser's content_mode="spans".
+"""
+
+import json
+import mmap
+import pickle
+
+import pytest
+
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.utils import line_utils
+from doxstrux.markdown.utils.source_view import SourceLines, TextSpan, line_starts, materialize
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+SOURCES = ["", "a", "a\n", "\n\n", "one\ntwo\n\nfour", "x\ny\nz\n"]
+
+DOC = """# Title
+
+Intro paragraph.
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+<div>block</div>
+
+## Child
+
+Text.
+"""
+
+
+class TestSourceLines:
+    """Tests for SourceLines."""
+
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_behaves_like_split(self, source):
+        lines = SourceLines(source)
+        expected = source.split("\n")
+        assert len(lines) == len(expected)
+        assert list(lines) == expected
+        assert lines == expected
+        assert [lines[i] for i in range(-len(expected), len(expected))] == expected * 2
+        for start in range(-1, len(expected) + 2):
+            for stop in range(-1, len(expected) + 2):
+                assert lines[start:stop] == expected[start:stop]
+        assert lines[::2] == expected[::2]
+
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_offsets_match_build_line_offsets(self, source):
+        offsets, _ = line_utils.build_line_offsets(source.split("\n"))
+        assert list(SourceLines(source).starts) == offsets
+
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_span_matches_slice_lines_raw(self, source):
+        lines = SourceLines(source)
+        expected = source.split("\n")
+        for start in [None, -1, *range(len(expected) + 2)]:
+            for end in [None, *range(len(expected) + 3)]:
+                assert lines.span(start, end) == line_utils.slice_lines_raw(expected, start, end)
+
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_line_starts_on_bytes_and_mmap(self, source, tmp_path):
+        expected = list(SourceLines(source).starts)
+        assert list(line_starts(source.encode())) == expected
+        if source:
+            path = tmp_path / "doc.md"
+            path.write_bytes(source.encode())
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                assert list(line_starts(mm)) == expected
+        assert SourceLines(source, line_starts(source)) == source.split("\n")
+
+    def test_index_error(self):
+        with pytest.raises(IndexError):
+            SourceLines("a\nb")[2]
+
+
+class TestTextSpan:
+    """Tests for TextSpan."""
+
+    def test_str_protocol(self):
+        span = TextSpan("hello world", 6, 11)
+        assert str(span) == "world"
+        assert span == "world" and span != "worl" and span != "worlds"
+        assert len(span) == 5
+        assert span[1:3] == "or"
+        assert "orl" in span and "hello" not in span and "world!" not in span
+        assert hash(span) == hash("world")
+
+    def test_pickle_shares_source(self):
+        source = "x" * 10_000
+        spans = [TextSpan(source, i, i + 10) for i in range(100)]
+        data = pickle.dumps(spans)
+        assert len(data) < 2 * len(source)
+        assert pickle.loads(data) == spans
+
+    def test_materialize(self):
+        value = {"a": [TextSpan("abc", 1, 3)], "b": SourceLines("x\ny"), "c": (1, "s")}
+        assert materialize(value) == {"a": ["bc"], "b": ["x", "y"], "c": (1, "s")}
+        assert type(materialize(value)["a"][0]) is str
+
+
+class TestSpansMode:
+    """Tests for content_mode="spans"."""
+
+    def test_result_matches_copy_mode(self):
+        copy = MarkdownParserCore(DOC, security_profile="permissive").parse()
+        spans = MarkdownParserCore(
+            DOC, security_profile="permissive", config={"content_mode": "spans"}
+        ).parse()
+        assert materialize(spans) == copy
+
+    def test_raw_content_is_view_of_source(self):
+        parser = MarkdownParserCore(DOC, config={"content_mode": "spans"})
+        result = parser.parse()
+        assert isinstance(result["content"]["lines"], SourceLines)
+        section = result["structure"]["sections"][0]
+        table = result["structure"]["tables"][0]
+        for raw in (section["raw_content"], table["raw_content"]):
+            assert isinstance(raw, TextSpan)
+            assert raw.source is DOC
+        assert DOC[section["start_char"] : section["end_char"]].startswith(str(section["raw_content"]))
+
+    def test_unknown_content_mode(self):
+        with pytest.raises(ValueError):
+            MarkdownParserCore(DOC, config={"content_mode": "mmap"})
+
+
+class TestFromPath:
+    """Tests for MarkdownParserCore.from_path()."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [DOC, "", "Unicode — ünïcode\n\n# Überschrift\n\ntext\n", "# Title\r\n\r\nWindows\r\nlines\r\n"],
+    )
+    def test_matches_read_text(self, text, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_bytes(text.encode("utf-8"))
+        expected = MarkdownParserCore(path.read_text(encoding="utf-8")).parse()
+
+        assert MarkdownParserCore.from_path(path).parse() == expected
+        parser = MarkdownParserCore.from_path(path, {"content_mode": "spans"})
+        assert isinstance(parser.lines, SourceLines)
+        assert materialize(parser.parse()) == expected
+
+    def test_result_is_json_serializable(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text(DOC, encoding="utf-8")
+        parser = MarkdownParserCore.from_path(path)
+        assert isinstance(parser.lines, list)
+        result = parser.parse()
+        assert json.loads(json.dumps(result)) == json.loads(json.dumps(MarkdownParserCore(DOC).parse()))
+
+    def test_ascii_reuses_mapped_line_index(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text(DOC, encoding="utf-8")
+        parser = MarkdownParserCore.from_path(path)
+        assert list(parser._line_start_offsets) == list(SourceLines(DOC).starts)
+        assert not isinstance(parser._line_start_offsets, list)  # The mapped index, not rebuilt
+        spans = MarkdownParserCore.from_path(path, {"content_mode": "spans"})
+        assert spans._line_start_offsets is spans.lines.starts
+
+    def test_size_limits_checked_before_reading(self, tmp_path):
+        path = tmp_path / "big.md"
+        path.write_bytes(b"x" * (200 * 1024))
+        with pytest.raises(MarkdownSizeError) as exc:
+            MarkdownParserCore.from_path(path, security_profile="strict")
+        assert exc.value.content_info["size"] == 200 * 1024
+
+        path.write_bytes(b"\n" * 3000)
+        with pytest.raises(MarkdownSizeError) as exc:
+            MarkdownParserCore.from_path(path, security_profile="strict")
+        assert exc.value.content_info["lines"] == 3001
+
+    def test_unknown_profile(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text(DOC, encoding="utf-8")
+        with pytest.raises(ValueError):
+            MarkdownParserCore.from_path(path, security_profile="lenient")
@@ -0,0 +1,174 @@
+"""Unit tests for streaming.py.
+
+Tests for window cutting and cross-window stitching in iter_sections().
+"""
+
+import pytest
+
+from doxstrux.markdown.exceptions import MarkdownSizeError
+from doxstrux.markdown.streaming import _iter_windows, iter_sections
+from doxstrux.markdown.utils.block_boundaries import BoundaryScanner
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = """Preamble text.
+
+# Guide
+
+Intro with a [link](https://example.com).
+
+## Install
+
+```bash
+pip install doxstrux
+
+doxstrux --help
+```
+
+<!--
+comment
+
+still comment
+-->
+
+- one
+
+- two
+
+## Install
+
+Text.
+
+# Appendix
+
+Last paragraph.
+"""
+
+SECTION_KEYS = (
+    "id", "level", "title", "slug", "parent_id",
+    "start_line", "end_line", "start_char", "end_char", "raw_content", "text_content",
+)
+
+
+def _stream(source, window_lines, **kwargs):
+    return list(iter_sections(source, "permissive", window_lines=window_lines, **kwargs))
+
+
+def _summary(streamed):
+    return [
+        (
+            {k: item.section[k] for k in SECTION_KEYS} if item.section else None,
+            {name: [(i.get("start_line", i.get("line")), i.get("section_id")) for i in items]
+             for name, items in item.structure.items() if name != "frontmatter"},
+        )
+        for item in streamed
+    ]
+
+
+class TestIterSections:
+    """Tests for iter_sections."""
+
+    def test_single_window_matches_parse(self):
+        streamed = _stream(DOC, 10_000)
+        full = MarkdownParserCore(DOC, security_profile="permissive").parse()["structure"]
+        assert streamed[0].section is None  # Preamble
+        sections = [item.section for item in streamed[1:]]
+        assert [(s["id"], s["parent_id"], s["start_line"], s["start_char"]) for s in sections] == [
+            (s["id"], s["parent_id"], s["start_line"], s["start_char"]) for s in full["sections"]
+        ]
+        # Own content ends before the next heading of any level
+        assert [s["end_line"] for s in sections[:-1]] == [s["start_line"] - 1 for s in sections[1:]]
+        assert sum(len(item.structure["paragraphs"]) for item in streamed) == len(full["paragraphs"])
+        assert streamed[2].structure["code_blocks"][0]["section_id"] == "section_install"
+
+    def test_small_windows_match_single_window(self):
+        one = _stream(DOC, 10_000)
+        many = _stream(DOC, 1)
+        assert max(item.window for item in many) > 3
+        assert _summary(many) == _summary(one)
+        assert "".join(
+            item.section["raw_content"] + "\n" for item in many if item.section
+        ) in DOC + "\n"
+
+    @pytest.mark.parametrize("doc", [DOC, DOC.rstrip("\n"), "# A\n\nx\n\n# B\n\ny"])
+    @pytest.mark.parametrize("window_lines", [1, 5, 10_000])
+    def test_offsets_match_parse(self, doc, window_lines):
+        full = MarkdownParserCore(doc, security_profile="permissive").parse()["structure"]["sections"]
+        streamed = [item.section for item in _stream(doc, window_lines) if item.section]
+        assert [(s["start_line"], s["start_char"]) for s in streamed] == [
+            (s["start_line"], s["start_char"]) for s in full
+        ]
+        for i, (own, expected) in enumerate(zip(streamed, full)):
+            # parse() ends a section at the next heading of the same or a higher level
+            if i + 1 == len(full) or full[i + 1]["level"] <= expected["level"]:
+                assert (own["end_line"], own["end_char"]) == (expected["end_line"], expected["end_char"])
+        assert streamed[-1]["end_char"] == len(doc)
+
+    def test_fence_and_html_are_not_split(self):
+        windows = list(_iter_windows(iter(DOC.split("\n")), 1, 100, "permissive"))
+        assert "\n".join("\n".join(w) for w in windows) == DOC
+        joined = ["\n".join(w) for w in windows]
+        assert any("pip install doxstrux\n\ndoxstrux --help\n```" in w for w in joined)
+        assert any("comment\n\nstill comment\n-->" in w for w in joined)
+        assert "- one\n\n- two" in "".join(joined)  # Loose list kept together
+
+    def test_document_over_profile_limit(self):
+        """A document above the strict line limit streams window by window."""
+        doc = "".join(f"## Entry {i}\n\nChange {i}.\n\n" for i in range(1500))
+        with pytest.raises(MarkdownSizeError):
+            MarkdownParserCore(doc, security_profile="strict")
+        streamed = list(iter_sections(doc.splitlines(keepends=True), "strict", window_lines=500))
+        assert len(streamed) == 1500
+        assert streamed[-1].section["id"] == "section_entry-1499"
+        assert streamed[-1].section["start_line"] == 4 * 1499
+        assert streamed[-1].structure["paragraphs"][0]["text"] == "Change 1499."
+
+    def test_no_safe_boundary(self):
+        doc = "```\n" + "\n\n".join(["code"] * 30) + "\n```\n"
+        with pytest.raises(MarkdownSizeError):
+            _stream(doc, 5, max_window_lines=20)
+
+    def test_path_and_file_input(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text(DOC, encoding="utf-8")
+        expected = _summary(_stream(DOC, 3))
+        assert _summary(_stream(path, 3)) == expected
+        with open(path, encoding="utf-8") as f:
+            assert _summary(_stream(f, 3)) == expected
+
+    def test_frontmatter_in_preamble(self):
+        doc = "---\ntitle: T\n---\n\n# A\n\ntext\n"
+        streamed = _stream(doc, 1)
+        assert streamed[0].section is None
+        assert streamed[0].structure["frontmatter"] == {"title": "T"}
+        assert streamed[1].section["id"] == "section_a"
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            _stream(DOC, 0)
+        with pytest.raises(ValueError):
+            _stream(DOC, 10, max_window_lines=5)
+
+
+class TestBoundaryScanner:
+    """Tests for BoundaryScanner block tracking."""
+
+    @pytest.mark.parametrize(
+        "lines",
+        [
+            ["~~~~", "", "~~~", ""],
+            ["<script>", "", "x"],
+            ["$$", "", "x"],
+            ["---", "a: b", "---", ""],
+        ],
+    )
+    def test_in_block(self, lines):
+        scanner = BoundaryScanner()
+        for i, line in enumerate(lines):
+            scanner.feed(line, i)
+        assert scanner.in_block
+
+    def test_closed_blocks(self):
+        scanner = BoundaryScanner()
+        for i, line in enumerate(["```", "x", "```", "<!-- one line -->", "$$ x $$", "<pre>", "</pre>"]):
+            scanner.feed(line, i)
+        assert not scanner.in_block
@@ -0,0 +1,93 @@
+"""Unit tests for utils/text_cache.py.
+
+Tests for the per-parse node text memo shared by the tree extractors.
+"""
+
+from markdown_it import MarkdownIt
+from markdown_it.tree import SyntaxTreeNode
+
+from doxstrux.markdown.utils.text_cache import NodeTextCache
+from doxstrux.markdown.utils.text_utils import node_text
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = """# Title *one*
+
+Some *text* and ![alt](a.png) [![logo](l.png)](u)
+next `code`  
+end
+
+> quote
+>
+> - item **bold**
+>   - nested
+
+1. first
+2. second
+"""
+
+
+def _tree(text):
+    return SyntaxTreeNode(MarkdownIt("commonmark").parse(text))
+
+
+class TestNodeTextCache:
+    """Tests for NodeTextCache."""
+
+    def test_matches_node_text_for_every_node(self):
+        tree = _tree(DOC)
+        cache = NodeTextCache()
+        for node in tree.walk():
+            assert cache.text(node) == node_text(node)
+
+    def test_root_first_fills_inline_nodes(self):
+        """Textifying the root caches every inline node on the way."""
+        tree = _tree(DOC)
+        cache = NodeTextCache()
+        assert cache.text(tree) == node_text(tree)
+        inlines = [n for n in tree.walk() if n.type == "inline"]
+        assert len(cache) == len(inlines) + 1
+        for node in inlines:
+            assert cache.text(node) == node_text(node)
+        assert cache.hits == len(inlines)
+
+    def test_blocks_reuse_cached_text(self):
+        tree = _tree(DOC)
+        cache = NodeTextCache()
+        blockquote = next(n for n in tree.walk() if n.type == "blockquote")
+        assert cache.text(blockquote) == node_text(blockquote)
+        cache.texts[id(blockquote)] = "<cached>"
+        assert "<cached>" in cache.text(tree)  # Joined as a whole, not re-walked
+        assert cache.text(blockquote) == "<cached>"
+        assert cache.hits == 2
+
+    def test_seed(self):
+        tree = _tree("para")
+        cache = NodeTextCache()
+        paragraph = tree.children[0]
+        cache.seed(paragraph, "para")
+        assert cache.text(tree) == "para"
+        assert cache.hits == 1 and len(cache) == 2
+
+    def test_empty_and_inline_level(self):
+        cache = NodeTextCache()
+        assert cache.text(_tree("")) == ""
+        tree = _tree("a *word*")
+        em = next(n for n in tree.walk() if n.type == "em")
+        assert cache.text(em) == "word"
+        assert cache.text(em.children[0]) == "word"
+        assert len(cache) == 1  # Inline-level nodes are not cached
+
+
+class TestParserTextCache:
+    """Extractors share the parser's node text cache."""
+
+    def test_heading_text_shared_with_nodes(self):
+        """Heading text from the token-based heading index is reused for nodes."""
+        parser = MarkdownParserCore(DOC)
+        result = parser.parse()
+        assert result["structure"]["sections"][0]["title"] == "Title one"
+        assert result["structure"]["headings"][0]["text"] == "Title one"
+        heading = next(n for n in parser.tree.walk() if n.type == "heading")
+        hits = parser._text_cache.hits
+        assert parser._get_text(heading) == "Title one"
+        assert parser._text_cache.hits == hits + 1
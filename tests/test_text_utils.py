@@ -64,6 +64,31 @@ class TestCollectTextSegments:
         assert segments == []
 
 
+class TestSegmentsInRange:
+    """Tests for index_text_segments() / segments_in_range()."""
+
+    SEGMENTS = [(0, 0, "a"), (2, 6, "b"), (4, 4, "c"), (8, 9, "d"), (1, 1, "late")]
+
+    def _scan(self, start, end):
+        return [s for s in self.SEGMENTS if not (s[1] < start or s[0] > end)]
+
+    def test_matches_linear_scan(self):
+        """Indexed lookup returns the same segments, in original order."""
+        index = text_utils.index_text_segments(self.SEGMENTS)
+        for start in range(0, 11):
+            for end in range(start, 11):
+                assert text_utils.segments_in_range(self.SEGMENTS, index, start, end) == self._scan(start, end)
+
+    def test_straddling_segment(self):
+        """A segment starting before the range but reaching into it is included."""
+        index = text_utils.index_text_segments(self.SEGMENTS)
+        assert text_utils.segments_in_range(self.SEGMENTS, index, 5, 7) == [(2, 6, "b")]
+
+    def test_empty(self):
+        index = text_utils.index_text_segments([])
+        assert text_utils.segments_in_range([], index, 0, 5) == []
+
+
 class TestExtractTextFromInline:
     """Tests for extract_text_from_inline() function."""
 
@@ -152,3 +177,30 @@ class TestHasChildType:
 
         # Should find inline token (present in headings)
         assert text_utils.has_child_type(root, "inline")
+
+
+class TestParagraphFeatures:
+    """Tests for paragraph_features() function."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Plain words here",
+            "See [docs](a.md) and *now*\nnext `x`  \nend",
+            "**bold** ![alt](p.png) [![logo](l.png)](u)",
+            "",
+        ],
+    )
+    def test_matches_separate_helpers(self, md, text):
+        """Should agree with node_text and has_child_type."""
+        from markdown_it.tree import SyntaxTreeNode
+        root = SyntaxTreeNode(md.parse(text))
+
+        expected_text = text_utils.node_text(root)
+        assert text_utils.paragraph_features(root) == (
+            expected_text,
+            len(expected_text.split()),
+            text_utils.has_child_type(root, "link"),
+            text_utils.has_child_type(root, ["em", "strong"]),
+            text_utils.has_child_type(root, "code_inline"),
+        )
@@ -0,0 +1,93 @@
+"""Unit tests for utils/token_warehouse.py.
+
+Tests for the token index built once per parse (by type, pairs, parents,
+sections, fences).
+"""
+
+from markdown_it import MarkdownIt
+
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+
+DOC = """# Title
+
+intro
+
+## Part A
+
+- one
+- two
+
+```python
+x = 1
+```
+
+## Part B
+
+### Deep
+
+text
+
+# Second
+"""
+
+
+def _warehouse(text: str) -> TokenWarehouse:
+    tokens = MarkdownIt("commonmark").parse(text)
+    return TokenWarehouse(tokens, len(text.split("\n")))
+
+
+class TestTokenWarehouse:
+    """Tests for TokenWarehouse indices."""
+
+    def test_by_type_matches_scan(self):
+        """by_type indices equal a full scan of the token list."""
+        wh = _warehouse(DOC)
+        for ttype in {t.type for t in wh.tokens}:
+            expected = [i for i, t in enumerate(wh.tokens) if t.type == ttype]
+            assert wh.iter_by_type(ttype) == expected
+        assert wh.iter_by_type("missing") == []
+        assert wh.first_of_type("missing") is None
+
+    def test_pairs_and_parents(self):
+        """Open tokens map to their closers; list items nest under the list."""
+        wh = _warehouse(DOC)
+        list_open = wh.iter_by_type("bullet_list_open")[0]
+        list_close = wh.range_for(list_open)
+        assert wh.tokens[list_close].type == "bullet_list_close"
+        assert wh.pairs_rev[list_close] == list_open
+        for item in wh.iter_by_type("list_item_open"):
+            assert wh.parent(item) == list_open
+        assert wh.parent(0) is None
+
+    def test_tokens_of_types_document_order(self):
+        """Merged lookups preserve document order."""
+        wh = _warehouse(DOC)
+        merged = wh.tokens_of_types("fence", "heading_open")
+        expected = [t for t in wh.tokens if t.type in ("fence", "heading_open")]
+        assert merged == expected
+
+    def test_fences(self):
+        """Fenced code blocks are recorded with line range and info string."""
+        wh = _warehouse(DOC)
+        assert wh.fences == [(9, 12, "python")]
+
+    def test_sections_and_section_of(self):
+        """Sections close at the next heading of equal or higher level."""
+        wh = _warehouse(DOC)
+        ranges = [(s[0], s[1], s[3]) for s in wh.sections]
+        assert ranges == [(0, 18, 1), (4, 12, 2), (13, 18, 2), (15, 18, 3), (19, 20, 1)]
+        assert wh.section_of(17)[0] == 15
+        assert wh.section_of(10)[0] == 4
+        assert wh.section_of(20)[0] == 19
+        assert _warehouse("text\n\n# H\n").section_of(0) is None
+
+
+class TestParserWarehouse:
+    """The parser builds one warehouse per instance."""
+
+    def test_parser_exposes_warehouse(self):
+        parser = MarkdownParserCore(DOC)
+        assert parser.warehouse.tokens is parser.tokens
+        assert len(parser.warehouse.iter_by_type("heading_open")) == 5
@@ -0,0 +1,100 @@
+"""Unit tests for utils/tree_walk.py.
+
+Tests for the iterative syntax tree walker behind process_tree.
+"""
+
+from markdown_it import MarkdownIt
+from markdown_it.tree import SyntaxTreeNode
+
+from doxstrux.markdown.utils.text_utils import node_text
+from doxstrux.markdown.utils.tree_walk import DESCEND, SKIP_CHILDREN, iter_tree, walk_tree
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+DOC = "# Title\n\nSome *text* and ![alt](a.png)\nnext\n\n> - item `code`\n"
+
+
+def _tree(text):
+    return SyntaxTreeNode(MarkdownIt("commonmark").parse(text))
+
+
+class _Node:
+    """Minimal stand-in with the attributes the walker uses."""
+
+    def __init__(self, type_, children=()):
+        self.type = type_
+        self.children = list(children)
+
+
+class TestWalkTree:
+    """Tests for walk_tree / iter_tree."""
+
+    def test_pre_order_matches_tree_walk(self):
+        tree = _tree(DOC)
+        visited = walk_tree(tree, lambda n, ctx, lvl: ctx.append(n) or DESCEND, [])
+        assert visited == list(tree.walk())
+        assert [n for n, _ in iter_tree(tree)] == visited
+
+    def test_levels(self):
+        tree = _tree("> quote\n")
+        levels = walk_tree(tree, lambda n, ctx, lvl: ctx.append((n.type, lvl)) or DESCEND, [])
+        assert levels == [("root", 0), ("blockquote", 1), ("paragraph", 2), ("inline", 3), ("text", 4)]
+
+    def test_skip_children(self):
+        tree = _tree(DOC)
+        types = walk_tree(
+            tree,
+            lambda n, ctx, lvl: ctx.append(n.type) or (SKIP_CHILDREN if n.type == "blockquote" else DESCEND),
+            [],
+        )
+        assert "blockquote" in types and "bullet_list" not in types
+
+    def test_post_hook_runs_after_subtree(self):
+        tree = _tree("> a\n\nb\n")
+        events = []
+        walk_tree(
+            tree,
+            lambda n, ctx, lvl: ctx.append(("pre", n.type)) or n.type != "paragraph",
+            events,
+            post=lambda n, ctx, lvl: ctx.append(("post", n.type)),
+        )
+        assert events == [
+            ("pre", "root"),
+            ("pre", "blockquote"),
+            ("pre", "paragraph"),
+            ("post", "paragraph"),
+            ("post", "blockquote"),
+            ("pre", "paragraph"),
+            ("post", "paragraph"),
+            ("post", "root"),
+        ]
+
+    def test_no_depth_limit(self):
+        """Trees far deeper than the recursion limit are walked in full."""
+        node = _Node("leaf")
+        for _ in range(20_000):
+            node = _Node("wrap", [node])
+        types = walk_tree(node, lambda n, ctx, lvl: ctx.append(n.type) or DESCEND, [])
+        assert len(types) == 20_001 and types[-1] == "leaf"
+
+
+class TestNodeText:
+    """Tests for text_utils.node_text."""
+
+    def test_text_breaks_and_code(self):
+        tree = _tree("Some *text*\nwith `code`  \nend\n")
+        assert node_text(tree) == "Some text\nwith code\nend"
+
+    def test_image_alt(self):
+        image = [n for n in _tree("![alt](a.png)").walk() if n.type == "image"][0]
+        assert node_text(image).startswith("alt")
+
+
+class TestParserDepth:
+    """process_tree no longer truncates deep documents."""
+
+    def test_deep_blockquote_text_is_kept(self):
+        """Content nested deeper than the former strict depth limit (50) is extracted."""
+        doc = "> " * 60 + "deep text\n"
+        parser = MarkdownParserCore(doc, config={"preset": "default"}, security_profile="strict")
+        blockquote = parser.parse()["structure"]["blockquotes"][0]
+        assert blockquote["content"] == "deep text"
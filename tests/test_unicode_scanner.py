@@ -0,0 +1,136 @@
+"""Unit tests for security/unicode_scanner.py.
+
+Tests for whole-document Unicode risk classification and its use in the
+parser's security metadata.
+"""
+
+import random
+import unicodedata
+
+import pytest
+
+from doxstrux.markdown.security import validators
+from doxstrux.markdown.security.unicode_scanner import UnicodeRiskScanner
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+_NEUTRAL = ("COMMON", "INHERITED", "NO-BREAK", "SPACE", "HYPHEN", "DASH", "FULLWIDTH", "HALFWIDTH")
+
+
+def _reference(text):
+    """Per-character reference implementation (the pre-scanner algorithm, uncapped)."""
+    issues = {
+        "has_bidi_override": "\u202e" in text or "\u202d" in text,
+        "has_confusables": False,
+        "has_mixed_scripts": False,
+        "has_rtl": False,
+        "has_zero_width": any(c in text for c in "\u200b\u200c\u200d"),
+    }
+    scripts_seen = set()
+    has_latin = False
+    for char in text:
+        if ord(char) < 128:
+            has_latin = True
+            continue
+        if char in validators.CONFUSABLES_EXTENDED:
+            issues["has_confusables"] = True
+        try:
+            script = unicodedata.name(char, "").split()[0]
+            if "LATIN" in script:
+                has_latin = True
+            elif script and script not in _NEUTRAL:
+                scripts_seen.add(script)
+            if unicodedata.bidirectional(char) in ("R", "AL"):
+                issues["has_rtl"] = True
+        except (ValueError, IndexError):
+            pass
+    issues["has_mixed_scripts"] = has_latin and bool(scripts_seen)
+    return issues
+
+
+class TestUnicodeRiskScanner:
+    """Tests for UnicodeRiskScanner."""
+
+    def test_ascii_fast_path(self):
+        """Pure-ASCII text has no risks and no offsets."""
+        result = UnicodeRiskScanner({}).scan("plain ascii text\n" * 100)
+        assert not any(v for k, v in result.items() if k != "offsets")
+        assert result["offsets"] == {}
+
+    def test_matches_reference_on_random_text(self):
+        """Flags agree with the per-character reference implementation."""
+        rng = random.Random(1234)
+        alphabet = (
+            "abc XYZ 123\n"
+            "éüñ"  # Latin
+            "аеорсΑΒ"  # Cyrillic/Greek confusables
+            "漢字かな"  # Other scripts
+            "שלוםمرحبا"  # RTL
+            "\u202e\u202d\u200b\u200c\u200d\xa0–—’\ufeff\U0001f600"
+        )
+        scanner = UnicodeRiskScanner(validators.CONFUSABLES_EXTENDED)
+        for _ in range(300):
+            pool = rng.sample(alphabet, rng.randint(1, 6))
+            text = "".join(rng.choice(pool) for _ in range(rng.randint(1, 40)))
+            result = scanner.scan(text)
+            del result["offsets"]
+            assert result == _reference(text), repr(text)
+
+    def test_offsets_of_first_offending_characters(self):
+        """Offsets point at the first character of each risk class."""
+        text = "paypal.com pаypal ש \u200b \u202e"
+        result = UnicodeRiskScanner(validators.CONFUSABLES_EXTENDED).scan(text)
+        assert result["offsets"] == {
+            "has_bidi_override": text.index("\u202e"),
+            "has_confusables": text.index("а"),
+            "has_mixed_scripts": text.index("а"),
+            "has_rtl": text.index("ש"),
+            "has_zero_width": text.index("\u200b"),
+        }
+
+    def test_other_scripts_without_latin_are_not_mixed(self):
+        """Text with no ASCII or Latin characters is not mixed-script."""
+        result = UnicodeRiskScanner({}).scan("漢字かな")
+        assert result["has_mixed_scripts"] is False
+        assert "has_mixed_scripts" not in result["offsets"]
+
+    def test_lone_surrogates(self):
+        """Unpaired surrogates do not break the scan."""
+        result = UnicodeRiskScanner({}).scan("abc\ud800def")
+        assert result["has_bidi_override"] is False
+
+    def test_class_table_is_bounded(self):
+        """Texts of many distinct code points do not grow the class table past max_cached."""
+        text = "latin " + "".join(chr(cp) for cp in range(0x4E00, 0x4E00 + 20_000)) + " \u202e"
+        scanner = UnicodeRiskScanner(validators.CONFUSABLES_EXTENDED, max_cached=1000)
+        result = scanner.scan(text)
+        assert len(scanner._classes) <= 1000
+        assert result["has_mixed_scripts"] is True
+        assert result["offsets"]["has_bidi_override"] == len(text) - 1
+
+        uncached = UnicodeRiskScanner(validators.CONFUSABLES_EXTENDED, max_cached=0)
+        assert uncached.scan(text) == result
+        assert not uncached._classes
+
+    def test_scans_whole_document(self):
+        """Risks after the first 10KB are detected."""
+        text = "x" * 200_000 + "\u202e"
+        assert validators.detect_unicode_issues(text)["has_bidi_override"] is True
+        assert validators.detect_unicode_issues(text, max_scan_bytes=10240)["has_bidi_override"] is False
+
+
+class TestParserUnicodeWarnings:
+    """Tests for Unicode warnings in security metadata."""
+
+    @pytest.mark.parametrize("size", [100, 150_000])
+    def test_warnings_carry_line_and_offset(self, size):
+        """Warnings report the line/offset of the first offending character, at any size."""
+        content = "# Title\n\n" + "word " * (size // 5) + "\n\nLogin at pаypal.com \u2067here\n"
+        parser = MarkdownParserCore(content, security_profile="permissive")
+        security = parser.parse()["metadata"]["security"]
+        warnings = {w["type"]: w for w in security["warnings"]}
+
+        confusable = warnings["confusable_characters"]
+        assert confusable["offset"] == content.index("а")
+        assert confusable["line"] == 4
+        assert warnings["bidi_controls"]["offset"] == content.index("\u2067")
+        assert security["statistics"]["unicode_risk_score"] == 3
@@ -0,0 +1,135 @@
+"""Unit tests for markdown/url_cache.py.
+
+Tests for the process-wide LRU cache of URL security verdicts.
+"""
+
+import pytest
+
+from doxstrux.markdown import url_cache
+from doxstrux.markdown.extractors import links, media
+from doxstrux.markdown.security import validators
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+SCHEMES = frozenset(validators.ALLOWED_LINK_SCHEMES_MODERATE)
+
+DOC = """# Links
+
+[Home](https://example.com/) and [again](https://example.com/).
+[Up](../secret.txt) [bad](javascript:alert(1)) [top](#links)
+
+![Logo](images/logo.PNG) ![Logo](images/logo.PNG)
+![Pixel](data:image/gif;base64,R0lGODlhAQABAAAAACw=)
+"""
+
+
+class TestUrlCache:
+    """Tests for verdict caching."""
+
+    def setup_method(self):
+        url_cache.clear_url_cache()
+        url_cache.set_url_cache_size(url_cache.DEFAULT_MAXSIZE)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://example.com/a.png",
+            "../etc/passwd",
+            "%2e%2e%2fsecret",
+            "C:\\Windows",
+            "javascript:alert(1)",
+            "data:image/png;base64,iVBORw0KGgo=",
+            "#anchor",
+            "",
+        ],
+    )
+    def test_verdict_matches_individual_checks(self, url):
+        """The verdict is exactly what the individual validators return."""
+        verdict = url_cache.get_verdict(url, SCHEMES)
+        scheme, allowed = validators.validate_link_scheme(url, SCHEMES)
+        image = media._determine_image_metadata(url)
+        assert verdict == (
+            scheme,
+            allowed,
+            validators.classify_link_type(url),
+            validators.check_path_traversal(url),
+            image["image_kind"],
+            image["format"],
+        )
+
+    def test_hits_and_per_caller_stats(self):
+        """Repeated lookups hit; the caller's stats dict is updated too."""
+        stats = {"hits": 0, "misses": 0}
+        first = url_cache.get_verdict("https://example.com", SCHEMES, stats)
+        second = url_cache.get_verdict("https://example.com", SCHEMES, stats)
+        assert first is second
+        assert stats == {"hits": 1, "misses": 1}
+        assert url_cache.url_cache_info() == {"size": 1, "maxsize": 4096, "hits": 1, "misses": 1}
+
+    def test_allowed_schemes_are_part_of_key(self):
+        """The same URL gets separate verdicts per scheme set."""
+        strict = url_cache.get_verdict("mailto:a@b.c", frozenset({"https"}))
+        moderate = url_cache.get_verdict("mailto:a@b.c", frozenset({"https", "mailto"}))
+        assert strict.allowed is False
+        assert moderate.allowed is True
+
+    def test_lru_bound(self):
+        """The least recently used verdict is dropped at the bound."""
+        url_cache.set_url_cache_size(2)
+        url_cache.get_verdict("a", SCHEMES)
+        url_cache.get_verdict("b", SCHEMES)
+        url_cache.get_verdict("a", SCHEMES)
+        url_cache.get_verdict("c", SCHEMES)
+        stats = {"hits": 0, "misses": 0}
+        url_cache.get_verdict("a", SCHEMES, stats)
+        url_cache.get_verdict("b", SCHEMES, stats)
+        assert stats == {"hits": 1, "misses": 1}
+        assert url_cache.url_cache_info()["size"] == 2
+
+    def test_long_urls_are_not_cached(self):
+        """URLs above MAX_CACHED_URL_LENGTH are analyzed but not stored."""
+        url = "data:image/png;base64," + "A" * url_cache.MAX_CACHED_URL_LENGTH
+        assert url_cache.get_verdict(url, SCHEMES).image_kind == "data"
+        assert url_cache.url_cache_info()["size"] == 0
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            url_cache.set_url_cache_size(-1)
+
+
+class TestParserUrlCache:
+    """Tests for the parser's use of the URL cache."""
+
+    def setup_method(self):
+        url_cache.clear_url_cache()
+
+    def test_output_matches_uncached_extractors(self):
+        """Cached verdicts give the same links and images as uncached analysis."""
+        parser = MarkdownParserCore(DOC)
+
+        expected_links: list[dict] = []
+        for token in parser.warehouse.tokens_of_type("inline"):
+            links.process_inline_tokens(
+                token.children, expected_links, token.map,
+                parser._effective_allowed_schemes, validators, media,
+            )
+        assert parser._extract_links() == expected_links
+        assert parser._extract_images() == media.extract_images(
+            parser.warehouse, parser._effective_allowed_schemes
+        )
+
+    def test_hit_rate_in_metadata(self):
+        """With url_cache_stats enabled, metadata reports this parse's lookups."""
+        metadata = MarkdownParserCore(DOC, config={"url_cache_stats": True}).parse()["metadata"]
+        stats = metadata["url_cache"]
+        assert stats["lookups"] > stats["hits"] > 0
+        assert stats["hit_rate"] == round(stats["hits"] / stats["lookups"], 4)
+
+        again = MarkdownParserCore(DOC, config={"url_cache_stats": True}).parse()["metadata"]
+        assert again["url_cache"]["hit_rate"] == 1.0
+
+    def test_metadata_is_opt_in(self):
+        assert "url_cache" not in MarkdownParserCore(DOC).parse()["metadata"]
+
+    def test_path_traversal_warning(self):
+        security = MarkdownParserCore(DOC).parse()["metadata"]["security"]
+        assert security["statistics"]["path_traversal_pattern"] is True
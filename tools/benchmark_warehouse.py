@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the warehouse-backed extractors against the token-scanning ones.
+
+The extractors that used to take the flat ``tokens`` list (headings, links,
+images, html, math) now query a TokenWarehouse. This script loads the
+pre-warehouse versions of those extractor modules from a git revision
+(``--baseline``, default: the parent of the commit that added
+``utils/token_warehouse.py``, found with ``git log``) and runs
+both versions on the same parsed documents of the tools/test_mds corpus:
+
+- baseline: the old extractor functions, each scanning ``parser.tokens``
+- warehouse: building the TokenWarehouse once per document, then the
+  current extractor functions querying it
+- parse: full ``MarkdownParserCore.parse()`` time for reference (the
+  memoized result is invalidated before each timed call)
+
+Both sides receive the same parser callbacks (text, section lookup, link
+processing), so the difference is the token access. Outputs are compared
+per document and mismatches are reported.
+
+Usage:
+    python tools/benchmark_warehouse.py
+    python tools/benchmark_warehouse.py --repeat 5 --profile strict
+"""
+
+import argparse
+import contextlib
+import io
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+# Add src to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from doxstrux.markdown.exceptions import MarkdownSecurityError
+from doxstrux.markdown.extractors import html, links, math, media, sections
+from doxstrux.markdown.utils.token_warehouse import TokenWarehouse
+from doxstrux.markdown_parser_core import MarkdownParserCore
+
+WAREHOUSE_MODULE = "src/doxstrux/markdown/utils/token_warehouse.py"
+EXTRACTORS = ("headings", "links", "images", "html", "math")
+
+
+def default_baseline() -> str:
+    """Return the revision just before the warehouse was added."""
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", WAREHOUSE_MODULE],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout.split()
+    if not added:
+        raise SystemExit(
+            f"Cannot find the commit that added {WAREHOUSE_MODULE} (shallow clone?); pass --baseline"
+        )
+    return f"{added[-1]}^"
+
+
+def load_baseline(rev: str) -> dict[str, types.ModuleType]:
+    """Load the extractor modules of a git revision without touching the tree."""
+    modules = {}
+    for name in ("html", "links", "math", "media", "sections"):
+        path = f"src/doxstrux/markdown/extractors/{name}.py"
+        source = subprocess.run(
+            ["git", "show", f"{rev}:{path}"], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        module = types.ModuleType(f"baseline_{name}")
+        exec(compile(source, f"{rev}:{path}", "exec"), module.__dict__)
+        modules[name] = module
+    return modules
+
+
+def run_baseline(base: dict[str, types.ModuleType], p: MarkdownParserCore) -> dict:
+    """Run the token-scanning extractors (one pass over p.tokens each)."""
+    tokens = p.tokens
+    return {
+        "headings": base["sections"].extract_headings(
+            p.tree, tokens, p.process_tree, p._heading_level, p._get_text, p._span_from_lines
+        ),
+        "links": base["links"].extract_links(tokens, p._process_inline_tokens),
+        "images": base["media"].extract_images(tokens, p._effective_allowed_schemes, {}),
+        "html": base["html"].extract_html(
+            p.tree, tokens, p.config, p.process_tree, p._find_section_id, p._slice_lines_raw
+        ),
+        "math": base["math"].extract_math(tokens),
+    }
+
+
+def run_warehouse(p: MarkdownParserCore) -> dict:
+    """Build the warehouse and run the current extractors against it."""
+    wh = TokenWarehouse(p.tokens, len(p.lines))
+    heading_index = sections.build_heading_index(wh, p._heading_level, p._text_cache.token_text)
+    return {
+        "headings": sections.extract_headings(heading_index, p._span_from_lines),
+        "links": links.extract_links(wh, p._process_inline_tokens),
+        "images": media.extract_images(wh, p._effective_allowed_schemes, {}),
+        "html": html.extract_html(
+            p.tree, wh, p.config, p.process_tree, p._find_section_id, p._slice_lines_raw
+        ),
+        "math": math.extract_math(wh),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus", type=Path, default=Path(__file__).parent / "test_mds")
+    ap.add_argument("--baseline", help="git revision of the old extractors (default: before the warehouse)")
+    ap.add_argument("--profile", default="moderate")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.baseline is None:
+        args.baseline = default_baseline()
+    base = load_baseline(args.baseline)
+    docs = []
+    rejected = 0
+    for md_file in sorted(args.corpus.rglob("*.md")):
+        try:
+            docs.append(MarkdownParserCore(md_file.read_text(encoding="utf-8"), security_profile=args.profile))
+        except MarkdownSecurityError:
+            rejected += 1  # Fails validation under this profile
+
+    mismatches = {name: 0 for name in EXTRACTORS}
+    base_s = wh_s = parse_s = 0.0
+    for round_no in range(args.repeat):
+        for parser in docs:
+            # parse() first, so both extractor runs see the same warm text cache
+            parser.invalidate()  # parse() is memoized; time a real parse every round
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                parser.parse()
+            t1 = time.perf_counter()
+            old = run_baseline(base, parser)
+            t2 = time.perf_counter()
+            new = run_warehouse(parser)
+            t3 = time.perf_counter()
+            parse_s += t1 - t0
+            base_s += t2 - t1
+            wh_s += t3 - t2
+            if round_no == 0:
+                for name in EXTRACTORS:
+                    mismatches[name] += old[name] != new[name]
+
+    n = args.repeat
+    print(f"Documents:            {len(docs)} (x{n}), {rejected} rejected, baseline {args.baseline}")
+    print(f"baseline extractors:  {base_s / n * 1000:8.1f} ms (token scans)")
+    print(f"warehouse extractors: {wh_s / n * 1000:8.1f} ms (build + lookups)")
+    print(f"parse() total:        {parse_s / n * 1000:8.1f} ms")
+    for name in EXTRACTORS:
+        if mismatches[name]:
+            print(f"output mismatch:      {name} in {mismatches[name]} documents")
+    return 1 if any(mismatches.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())